@@ -1,73 +1,199 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from services.enhanced_mock_service import EnhancedMockService
-from services.enrichment_service import EnrichmentService
-import traceback
-import random
-from datetime import datetime
+from services.lead_export import LeadExport
+from services.registry import ServiceRegistry
+from services.search_cache import SearchCache
+from config import Config
+from utils.log import configure_logging
+from utils.metrics import REGISTRY, REQUEST_SECONDS, begin_request, end_request, span
+from utils.process_stats import current_rss_mb
+from utils.profiling import RequestProfiler
+from utils.serialization import dumps, json_response
+import logging
+import time
+import os
+import msgspec
+
+configure_logging(Config.LOG_LEVEL)
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag', 'X-Cache'])  # Readable by the frontend for If-None-Match
+
+
+def start_background_workers():
+    """Warm-up, job queue and retrain threads for this process; gunicorn starts them in each worker after fork"""
+    REGISTRY.ensure_started()
+    if services.ready:  # Warmed up before the fork
+        _start_service_threads()
+    else:
+        services.warm_up_in_background(then=_start_service_threads)
+
+
+def _start_service_threads():
+    services.job_queue.ensure_started()
+    services.model_retrainer.ensure_started()
+
+
+def stop_background_workers():
+    """Let in-flight job chunks finish before a worker exits (unfinished ones are re-leased anyway)"""
+    job_queue, model_retrainer, enrichment_service = (
+        services.built(name) for name in ('job_queue', 'model_retrainer', 'enrichment_service'))
+    if job_queue is not None:
+        job_queue.stop(timeout=Config.SERVER_GRACEFUL_TIMEOUT)
+    if model_retrainer is not None:
+        model_retrainer.stop()
+    if enrichment_service is not None:
+        enrichment_service.close()
+    REGISTRY.retire()
+
 
-try:
-    mock_service = EnhancedMockService()
-    enrichment_service = EnrichmentService()
-    print("✅ Services initialized successfully")
-except Exception as e:
-    print(f"❌ Service initialization failed: {e}")
-    traceback.print_exc()
+services = ServiceRegistry()
+if Config.WARM_UP == 'eager':
+    services.warm_up()  # Before serving; under gunicorn, once in the master and shared by the workers
+if Config.BACKGROUND_WORKERS_ON_IMPORT and (
+        __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+    start_background_workers()  # Not in the debug reloader's file-watcher process
+logger.info("App loaded (pid %d, RSS %.1f MB); services %s", os.getpid(), current_rss_mb(),
+            'ready' if services.ready else 'warming up')
+
+@app.before_request
+def start_request_timing():
+    begin_request()
+    g.request_started = time.perf_counter()
+    g.profiler = None
+    if Config.PROFILE_REQUESTS and request.args.get('profile') == '1':
+        g.profiler = RequestProfiler.start()
+
+@app.after_request
+def record_request_timing(response):
+    """Request latency histogram plus a Server-Timing header with the spans this request ran.
+    
+    For streamed responses this measures the time to the first byte, not the whole stream.
+    """
+    elapsed = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    REQUEST_SECONDS.observe(elapsed, request.method, route, str(response.status_code))
+    timings = end_request()
+    timings['total'] = elapsed
+    response.headers['Server-Timing'] = ', '.join(
+        f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()
+    )
+    profiler, g.profiler = g.profiler, None
+    if profiler is not None:
+        return Response(profiler.stop(), mimetype='text/plain', headers={
+            'Server-Timing': response.headers['Server-Timing'],
+            'X-Profiler': profiler.engine,
+            'X-Profiled-Status': str(response.status_code),
+        })
+    return response
+
+@app.teardown_request
+def release_profiler(error):
+    # Requests that failed before after_request still hold the profiler
+    if g.get('profiler') is not None:
+        g.profiler.stop()
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({
+    """Counters of every service built so far; never builds one, so it answers during warm-up too"""
+    built = services.built
+    payload = {
         'status': 'healthy',
-        'services': {
-            'mock_service': 'available',
-            'enrichment_service': 'available'
-        }
-    })
+        'ready': services.ready,
+        'services': {name: 'available' if built(name) is not None else 'pending' for name in services.SERVICES}
+    }
+    mock_service = built('mock_service')
+    if mock_service is not None:
+        payload['tagging'] = mock_service.semantic_tagger.get_stats()
+        payload['tag_cache'] = mock_service.semantic_tagger.tag_cache.get_stats()
+        payload['identity'] = mock_service.identity_index.get_stats()
+    for key, name in (('enrichment', 'enrichment_service'), ('jobs', 'job_queue'), ('lead_store', 'lead_store'),
+                      ('search_cache', 'search_cache'), ('model', 'model_retrainer')):
+        service = built(name)
+        if service is not None:
+            payload[key] = service.get_stats()
+    return json_response(payload)
+
+@app.route('/api/health/live', methods=['GET'])
+def liveness():
+    """The process is up and serving requests; says nothing about its services"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness():
+    """200 once every service is built and the scoring model loaded, 503 while warming up"""
+    state = services.readiness()
+    return jsonify(state), 200 if state['ready'] else 503
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Span and request latency histograms across all server workers, in Prometheus text format"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def _search_text(data, field):
+    """A free-text filter with whitespace collapsed; numbers are taken as text, objects and lists rejected"""
+    value = data.get(field)
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"{field} must be a string")
+    return ' '.join(str(value if value is not None else '').split())
+
+def _search_params(data, max_limit=None):
+    """Search filters and page size (capped at ``max_limit``, else the store's) from a request body; raises if bad"""
+    tags = data.get('tags') or []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    if not isinstance(tags, list):
+        raise ValueError("tags must be a list or a comma-separated string")
+    min_score, max_score = data.get('min_score'), data.get('max_score')
+    return {
+        'query': _search_text(data, 'query'),
+        'location': _search_text(data, 'location'),
+        'min_score': float(min_score) if min_score is not None else None,
+        'max_score': float(max_score) if max_score is not None else None,
+        'tags': [str(tag).strip() for tag in tags if str(tag).strip()],
+        'limit': max(1, min(int(data.get('limit', 20)), max_limit or services.lead_store.max_limit)),
+        'cursor': data.get('cursor')
+    }
 
 @app.route('/api/leads/search', methods=['POST'])
 def search_leads():
     try:
-        data = request.get_json() or {}
-        query = data.get('query', '')
-        limit = data.get('limit', 20)
-        location = data.get('location', '')
-        
-        print(f"🔍 Searching for: {query} (limit: {limit})")
+        params = _search_params(request.get_json() or {})
+        query = params['query']
         
-        # Generate leads using enhanced mock service
-        leads = mock_service.generate_leads(limit)
+        def run_search():
+            logger.debug("Searching for: %s (limit: %s)", query, params['limit'])
+            # Indexed query over stored leads; each lead comes back as its stored JSON
+            leads, next_cursor = services.lead_store.search(**params)
+            logger.debug("Returned %d leads", len(leads))
+            with span('serialization'):
+                return dumps({
+                    'success': True,
+                    'leads': leads,
+                    'count': len(leads),
+                    'query': query,
+                    'next_cursor': next_cursor,
+                    'mode': 'store'
+                })
         
-        # Convert to response format
-        leads_data = []
-        for lead in leads:
-            lead_dict = {
-                'company': lead.company,
-                'industry': lead.industry,
-                'address': lead.address,
-                'phone': lead.phone,
-                'website': lead.website,
-                'source': 'mock',
-                'created_at': lead.created_at
-            }
-            leads_data.append(lead_dict)
-        
-        response = {
-            'success': True,
-            'leads': leads_data,
-            'count': len(leads_data),
-            'query': query,
-            'mode': 'mock'
-        }
-        
-        print(f"✅ Returned {len(leads_data)} leads")
-        return jsonify(response)
+        # Identical searches share one computation and its encoded response until the store changes
+        body, etag, outcome = services.search_cache.get_or_compute(
+            SearchCache.key_for(**params), run_search, version=services.lead_store.last_write())
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache', 'X-Cache': outcome}
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+        return Response(body, mimetype='application/json', headers=headers)
         
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'leads': [],
+            'count': 0
+        }), 400
     except Exception as e:
-        print(f"❌ Search error: {e}")
-        traceback.print_exc()
+        logger.exception("Search error")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -75,44 +201,91 @@ def search_leads():
             'count': 0
         }), 500
 
+@app.route('/api/leads/search/stream', methods=['POST'])
+def search_leads_stream():
+    """Stream a search's stored leads as NDJSON (or SSE with Accept: text/event-stream), best fit first"""
+    try:
+        # Not bound by the page cap: leads are read and sent a chunk at a time, so memory stays flat
+        params = _search_params(request.get_json() or {}, max_limit=Config.STREAM_MAX_LIMIT)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e), 'leads': [], 'count': 0}), 400
+    params.pop('cursor')
+    limit = params.pop('limit')
+    query = params['query']
+    use_sse = 'text/event-stream' in request.headers.get('Accept', '')
+    
+    logger.debug("Streaming search for: %s (limit: %s)", query, limit)
+    
+    def events():
+        count = 0
+        try:
+            # Same filters and order as /api/leads/search, read a chunk at a time so the first leads go out early
+            for chunk in services.lead_store.scan(chunk_size=min(limit, Config.STREAM_CHUNK_SIZE), **params):
+                for data in chunk[:limit - count]:
+                    count += 1
+                    yield _format_event({'type': 'lead', 'lead': msgspec.Raw(data)}, use_sse)
+                if count >= limit:
+                    break
+            yield _format_event({'type': 'done', 'count': count, 'query': query, 'mode': 'store'}, use_sse)
+            logger.debug("Streamed %d leads", count)
+        except Exception as e:
+            logger.exception("Streaming search error")
+            yield _format_event({'type': 'error', 'error': str(e), 'count': count}, use_sse)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _format_event(payload, use_sse):
+    """Encode one stream event as an SSE frame or an NDJSON line"""
+    if use_sse:
+        return b"event: " + payload['type'].encode() + b"\ndata: " + dumps(payload) + b"\n\n"
+    return dumps(payload) + b"\n"
+
+@app.route('/api/leads/export', methods=['GET'])
+def export_leads():
+    """Download stored leads matching the search filters (the best ?limit= of them) as NDJSON, CSV or Parquet"""
+    try:
+        args = request.args
+        limit = args.get('limit')
+        filters = {
+            'query': args.get('query', ''),
+            'location': args.get('location', ''),
+            'min_score': args.get('min_score', type=float),
+            'max_score': args.get('max_score', type=float),
+            'tags': [tag.strip() for tag in args.get('tags', '').split(',') if tag.strip()],
+        }
+        export = LeadExport(services.lead_store, args.get('format', 'ndjson'), args.get('compression', 'none'),
+                            filters=filters, limit=int(limit) if limit is not None else None)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def chunks():
+        try:
+            yield from export
+            logger.info("Exported %d leads as %s", export.rows, export.filename)
+        except Exception:
+            # Headers are gone by now; cutting the body short is the only way left to signal failure
+            logger.exception("Export error after %d leads", export.rows)
+            raise
+    
+    return Response(
+        stream_with_context(chunks()),
+        content_type=export.content_type,
+        headers={'Content-Disposition': f'attachment; filename="{export.filename}"', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/leads/enrich', methods=['POST'])
 def enrich_leads():
     try:
         data = request.get_json() or {}
         leads_data = data.get('leads', [])
         
-        print(f"🔄 Enriching {len(leads_data)} leads")
-        
-        enriched_results = []
+        logger.debug("Enriching %d leads", len(leads_data))
         
-        for lead_data in leads_data:
-            # Create enriched lead with additional data
-            enriched = {
-                'company': lead_data['company'],
-                'industry': lead_data.get('industry', 'Unknown'),
-                'address': lead_data.get('address', ''),
-                'phone': lead_data.get('phone'),
-                'website': lead_data.get('website', ''),
-                'source': lead_data.get('source', 'mock'),
-                'created_at': lead_data.get('created_at'),
-                
-                # Enhanced fields
-                'employees': random.randint(10, 500),
-                'revenue': random.choice(['$1M-$5M', '$5M-$25M', '$25M+']),
-                'founded_year': random.randint(2010, 2020),
-                'company_linkedin': f"https://linkedin.com/company/{lead_data['company'].lower().replace(' ', '-')}",
-                'activity_score': round(random.uniform(6, 10), 1),
-                'fit_score': round(random.uniform(7, 9.5), 1),
-                'tags': ['enriched', 'high-priority', 'b2b'],
-                'enriched_at': datetime.now().isoformat(),
-                'owner_info': {
-                    'name': f"Contact at {lead_data['company']}",
-                    'email': f"contact@{lead_data['company'].lower().replace(' ', '')}.com",
-                    'title': 'Business Development Manager',
-                    'linkedin_url': f"https://linkedin.com/in/contact-{lead_data['company'].lower().replace(' ', '-')}"
-                }
-            }
-            enriched_results.append(enriched)
+        enriched_results = services.enrichment_service.enrich_leads(leads_data)
         
         response = {
             'success': True,
@@ -120,12 +293,19 @@ def enrich_leads():
             'count': len(enriched_results)
         }
         
-        print(f"✅ Enriched {len(enriched_results)} leads")
-        return jsonify(response)
+        logger.debug("Enriched %d leads in %s ms", len(enriched_results),
+                     services.enrichment_service.last_run.get('elapsed_ms'))
+        return json_response(response)
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'enriched_leads': [],
+            'count': 0
+        }), 400
     except Exception as e:
-        print(f"❌ Enrichment error: {e}")
-        traceback.print_exc()
+        logger.exception("Enrichment error")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -133,11 +313,75 @@ def enrich_leads():
             'count': 0
         }), 500
 
+@app.route('/api/leads/enrich/jobs', methods=['POST'])
+def submit_enrich_job():
+    try:
+        data = request.get_json() or {}
+        services.job_queue.ensure_started()
+        job = services.job_queue.submit(data.get('leads', []))
+        
+        logger.info("Queued enrichment job %s (%d leads in %d chunks)", job['id'], job['total'], job['chunks'])
+        return json_response({
+            'success': True,
+            'job': job,
+            'status_url': f"/api/leads/enrich/jobs/{job['id']}"
+        }, status=202)
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.exception("Enrichment job submission error")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/leads/enrich/jobs/<job_id>', methods=['GET'])
+def get_enrich_job(job_id):
+    """Job progress plus enriched leads finished so far (page with ?offset=&limit=)"""
+    try:
+        services.job_queue.ensure_started()
+        job = services.job_queue.get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'job not found'}), 404
+        
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = request.args.get('limit', type=int)
+        results = services.job_queue.get_results(job_id, offset, limit)
+        return json_response({
+            'success': True,
+            'job': job,
+            'offset': offset,
+            'enriched_leads': results,
+            'count': len(results)
+        })
+        
+    except Exception as e:
+        logger.exception("Enrichment job lookup error")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/model', methods=['GET'])
+def get_model():
+    """Live scoring model version and the state of background retraining"""
+    return json_response({'success': True, **services.model_retrainer.get_stats()})
+
+@app.route('/api/model/retrain', methods=['POST'])
+def retrain_model():
+    try:
+        data = request.get_json(silent=True) or {}
+        services.model_retrainer.ensure_started()
+        if not services.model_retrainer.trigger(data.get('mode', 'auto')):
+            return jsonify({'success': False, 'error': 'a retrain is already running'}), 409
+        return jsonify({'success': True, 'status_url': '/api/model'}), 202
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.exception("Retrain error")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 if __name__ == '__main__':
-    print("🚀 Starting SaaSquatch Backend...")
-    print("📡 API Endpoints:")
-    print("   GET  /api/health")
-    print("   POST /api/leads/search") 
-    print("   POST /api/leads/enrich")
-    print("🌐 CORS enabled for frontend")
+    logger.info("Starting SaaSquatch Backend; API endpoints:\n%s", '\n'.join(
+        f"   {' '.join(sorted(rule.methods - {'HEAD', 'OPTIONS'})):<5} {rule.rule}"
+        for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+    ))
+    logger.warning("Development server; in production run: gunicorn -c gunicorn.conf.py app:app")
+    REGISTRY.reset_directory()
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
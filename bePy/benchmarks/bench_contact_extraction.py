@@ -0,0 +1,81 @@
+"""Contact extraction speed: streaming byte scanner vs BeautifulSoup get_text.
+
+Reads every *.html file in --corpus (drop saved real pages there). If the
+directory is empty, a deterministic synthetic corpus is written first.
+
+    python -m benchmarks.bench_contact_extraction --corpus benchmarks/html_corpus
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import time
+from services.contact_extractor import extract_owner_info
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'html_corpus')
+LEGACY_EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+
+def legacy_extract(content: bytes):
+    """The original path: full DOM build, get_text(), inline regex"""
+    from bs4 import BeautifulSoup
+    text = BeautifulSoup(content, 'html.parser').get_text()
+    return re.findall(LEGACY_EMAIL_PATTERN, text)
+
+
+def write_synthetic_corpus(directory: str, pages: int = 40, seed: int = 7):
+    """Deterministic company pages from ~5 KB to ~400 KB with contacts scattered through them"""
+    rng = random.Random(seed)
+    words = ("cloud platform data analytics growth customers enterprise secure scalable "
+             "integration workflow automation team pricing support partners").split()
+    os.makedirs(directory, exist_ok=True)
+    for i in range(pages):
+        blocks = []
+        for _ in range(rng.randint(10, 800)):
+            sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(8, 30)))
+            tag = rng.choice(['p', 'li', 'span', 'div class="feature"'])
+            blocks.append(f"<{tag}>{sentence.capitalize()}.</{tag.split()[0]}>")
+        contacts = [
+            f'<a href="mailto:hello@company{i}.com">Email us</a>',
+            f"<p>Sales: sales@company{i}.com</p>",
+            f"<p>Call ({rng.randint(200, 999)}) 555-{rng.randint(1000, 9999)}</p>",
+            f'<a href="https://www.linkedin.com/company/company-{i}">LinkedIn</a>',
+            f"<div class=\"team\"><h3>Alex Morgan</h3><span>CEO</span></div>",
+            f'<img src="/static/logo@2x.png">',
+        ]
+        for contact in contacts:
+            blocks.insert(rng.randint(0, len(blocks)), contact)
+        html = f"<!doctype html><html><head><title>Company {i}</title></head><body>{''.join(blocks)}</body></html>"
+        with open(os.path.join(directory, f"company_{i:03d}.html"), 'w') as f:
+            f.write(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not glob.glob(os.path.join(args.corpus, '*.html')):
+        write_synthetic_corpus(args.corpus)
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.corpus, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    total_mb = sum(len(page) for page in pages) / (1024 * 1024)
+    print(f"{len(pages)} pages, {total_mb:.1f} MB")
+
+    timings = {}
+    for name, extract in (('beautifulsoup', legacy_extract), ('streaming', extract_owner_info)):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            found = sum(1 for page in pages if extract(page))
+        elapsed = (time.perf_counter() - started) / args.repeat
+        timings[name] = elapsed
+        print(f"  {name:<14} {elapsed * 1000:8.1f} ms/corpus  {total_mb / elapsed:7.1f} MB/s  pages with contacts: {found}")
+    print(f"  speedup: {timings['beautifulsoup'] / timings['streaming']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Bulk website enrichment throughput against local fixture sites.
+
+    python -m benchmarks.bench_crawler --sites 20 --pages-per-site 5
+"""
+import argparse
+import time
+from models import BaseLead
+from services.free_scraper import FreeLeadScraper
+from services.website_crawler import WebsiteCrawler
+from .site_fixture_server import start_sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sites', type=int, default=20)
+    parser.add_argument('--pages-per-site', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--page-kb', type=int, default=40)
+    parser.add_argument('--per-host-rate', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    base_urls, apps, stop = start_sites(args.sites, args.latency, args.page_kb)
+    leads = [
+        BaseLead(company=f"Company {i}-{j}", website=f"{base_url}/?page={j}")
+        for i, base_url in enumerate(base_urls) for j in range(args.pages_per_site)
+    ]
+    # Exercise robots.txt and the size cap alongside the normal pages
+    leads += [BaseLead(company=f"Private {i}", website=f"{url}/private") for i, url in enumerate(base_urls)]
+    leads.append(BaseLead(company="Huge", website=f"{base_urls[0]}/huge"))
+
+    try:
+        crawler = WebsiteCrawler(concurrency=args.concurrency, per_host_rate=args.per_host_rate)
+        scraper = FreeLeadScraper(crawler=crawler)
+        started = time.perf_counter()
+        enriched = scraper.enrich_with_website_data_bulk(leads)
+        elapsed = time.perf_counter() - started
+
+        with_email = sum(1 for lead in enriched if lead.owner_info and lead.owner_info.email)
+        print(f"{len(leads)} leads across {args.sites} hosts in {elapsed:.2f}s "
+              f"({len(leads) / elapsed:.1f} leads/s end to end, {with_email} emails found)")
+        print(f"  fetch: {crawler.last_batch}")
+        print(f"  totals: {crawler.stats}")
+        print(f"  robots.txt fetches: {sum(app['stats']['robots'] for app in apps)}, "
+              f"disallowed hits served: {sum(app['stats']['private'] for app in apps)}")
+    finally:
+        stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Feature pipeline vs LabelEncoder/pandas encoding: parity, cold and memoized cost.
+
+Checks that the regex keyword count matches the per-keyword substring scan
+(including overlapping and non-ASCII names) and that FeaturePipeline rows
+match encoding through the fitted LabelEncoders and StandardScaler, then
+times per-lead encoding the old way, through the pipeline cold, and again
+with every lead already memoized, plus predict_score on a known lead.
+
+    python -m benchmarks.bench_feature_pipeline --leads 20000
+"""
+import argparse
+import random
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from services.feature_pipeline import CATEGORICAL_COLS, FEATURE_COLS, TECH_KEYWORDS, count_tech_keywords
+from services.mock_data_service import MockDataService
+from services.scoring import MLScoringService
+
+
+def legacy_keywords(name: str) -> int:
+    return sum(1 for keyword in TECH_KEYWORDS if keyword in name.lower())
+
+
+def legacy_encode(scorer: MLScoringService, leads) -> np.ndarray:
+    """Encoding as predict_score did it before the pipeline: a DataFrame through the fitted transformers"""
+    state = scorer.state
+    df = pd.DataFrame([scorer.extract_features(lead) for lead in leads])[FEATURE_COLS]
+    for col in CATEGORICAL_COLS:
+        le = state.label_encoders[col]
+        known = df[col].astype(str).isin(le.classes_)
+        df[col] = np.where(known, le.transform(df[col].astype(str).where(known, le.classes_[0])), 0)
+    numerical_cols = [col for col in FEATURE_COLS if col not in CATEGORICAL_COLS]
+    df[numerical_cols] = state.scaler.transform(df[numerical_cols].to_numpy())
+    return df.to_numpy(dtype=np.float64)
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    alphabet = 'aeiostdclgfwrmyDATAÉßİ '
+    names = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(50000)]
+    names += ['Dataid Cloudigital', 'TECHAI Systemsolutions', 'aidata', 'İTech']
+    mismatches = sum(count_tech_keywords(name) != legacy_keywords(name) for name in names)
+    print(f"keyword count parity on {len(names)} names: {mismatches} mismatches")
+    assert mismatches == 0, "regex keyword count diverged from the substring scan"
+
+    generator = MockDataService()
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer = MLScoringService(model_dir=tmp)
+        scorer.train_model(generator.generate_leads(1000))
+    leads = generator.generate_leads(args.leads)
+    pipeline = scorer.state.pipeline
+    pipeline.cache_size = 0  # Time the cold path first
+    diff = np.abs(pipeline.transform(leads) - legacy_encode(scorer, leads)).max()
+    print(f"encoding parity on {len(leads)} leads: max |diff| {diff:.2e}")
+    assert diff == 0, "pipeline encoding diverged from the fitted transformers"
+
+    legacy = timed(lambda: legacy_encode(scorer, leads), 3)[0]
+    cold = timed(lambda: pipeline.transform(leads), 3)[0]
+    pipeline.cache_size = len(pipeline._rows)
+    pipeline.transform(leads)
+    warm = timed(lambda: pipeline.transform(leads), 3)[0]
+    print(f"  {'encode ' + str(len(leads)) + ' leads':<28} {'ms':>8} {'us/lead':>8}")
+    for label, ms in (('LabelEncoder + pandas', legacy), ('pipeline, cold', cold), ('pipeline, memoized', warm)):
+        print(f"  {label:<28} {ms:8.1f} {ms * 1000 / len(leads):8.2f}")
+
+    lead = leads[0]
+    for label in ('unknown lead', 'known lead'):
+        if label == 'unknown lead':
+            sample = lambda: scorer.predict_score(generator.generate_leads(1)[0])
+        else:
+            sample = lambda: scorer.predict_score(lead)
+        p50, p99 = timed(sample, args.repeats)
+        print(f"  predict_score, {label:<13} p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+    print(f"  feature cache: {pipeline.get_stats()}")
+
+
+if __name__ == '__main__':
+    main()
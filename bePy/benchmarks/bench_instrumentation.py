@@ -0,0 +1,62 @@
+"""Cost of the instrumentation layer: spans, histogram rendering, and logging vs print.
+
+Times an empty span (histogram observe plus the request's Server-Timing
+entry), rendering /api/metrics with every span series populated, and one
+per-request log line written with print to stdout, as a suppressed debug
+record, and as an INFO record through the asynchronous handler.
+
+    python -m benchmarks.bench_instrumentation --iterations 200000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import time
+from utils.log import configure_logging
+from utils.metrics import REGISTRY, begin_request, end_request, span
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    def empty_span():
+        with span('bench'):
+            pass
+
+    begin_request()
+    print(f"  {'operation':<36} {'ns/call':>10}")
+    print(f"  {'span (in a request)':<36} {per_call_ns(empty_span, n):10.0f}")
+    end_request()
+    print(f"  {'span (outside a request)':<36} {per_call_ns(empty_span, n):10.0f}")
+    render_ns = per_call_ns(REGISTRY.render, max(1, n // 1000))
+    print(f"  {'render /api/metrics':<36} {render_ns:10.0f}")
+
+    logger = logging.getLogger('bench')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        print_ns = per_call_ns(lambda: print(f"🔍 Searching for: {'tech'} (limit: {20})"), n)
+    configure_logging('INFO')
+    debug_ns = per_call_ns(lambda: logger.debug("Searching for: %s (limit: %s)", 'tech', 20), n)
+    # Measure the enqueue only; the listener thread writes the records to stderr meanwhile
+    handler = logging.getLogger().handlers[-1]
+    stream, handler.stream_handler.stream = handler.stream_handler.stream, open(os.devnull, 'w')
+    info_ns = per_call_ns(lambda: logger.info("Searching for: %s (limit: %s)", 'tech', 20), n // 10)
+    handler.drain()
+    handler.stream_handler.stream.close()
+    handler.stream_handler.stream = stream
+    print(f"  {'print to stdout':<36} {print_ns:10.0f}")
+    print(f"  {'logger.debug (suppressed)':<36} {debug_ns:10.0f}")
+    print(f"  {'logger.info (queued)':<36} {info_ns:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Columnar LeadBatch vs per-lead objects for generation and feature extraction.
+
+Checks that extract_features_batch matches extract_features row for row,
+then times both paths and the memory each representation retains.
+
+    python -m benchmarks.bench_lead_batch --leads 100000
+"""
+import argparse
+import time
+import tracemalloc
+from lead_batch import LeadBatch
+from services.mock_data_service import MockDataService
+from services.scoring import CATEGORICAL_COLS, FEATURE_COLS, MLScoringService
+
+
+def best_of(fn, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def retained_bytes(fn) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+
+def check_parity(scorer: MLScoringService, batch: LeadBatch):
+    leads = batch.to_leads()
+    columns = scorer.extract_features_batch(batch)
+    for col in FEATURE_COLS:
+        expected = [scorer.extract_features(lead)[col] for lead in leads]
+        actual = columns[col].to_list() if col in CATEGORICAL_COLS else columns[col].tolist()
+        if actual != expected:
+            raise SystemExit(f"feature mismatch in {col}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    service = MockDataService()
+    scorer = MLScoringService()
+
+    check_parity(scorer, service.generate_batch(2000))
+    print(f"{args.leads} leads (features match per-lead extraction)")
+
+    objects_time, leads = best_of(lambda: service.generate_leads(args.leads), args.repeat)
+    batch_time, batch = best_of(lambda: service.generate_batch(args.leads), args.repeat)
+    objects_bytes = retained_bytes(lambda: service.generate_leads(args.leads))
+    batch_bytes = retained_bytes(lambda: service.generate_batch(args.leads))
+    print(f"  generate objects: {objects_time * 1000:8.1f} ms {objects_bytes / args.leads:6.0f} B/lead")
+    print(f"  generate batch:   {batch_time * 1000:8.1f} ms {batch_bytes / args.leads:6.0f} B/lead")
+
+    per_lead_time, _ = best_of(lambda: [scorer.extract_features(lead) for lead in leads], args.repeat)
+    columnar_time, _ = best_of(lambda: scorer.extract_features_batch(batch), args.repeat)
+    print(f"  features per-lead: {per_lead_time * 1000:7.1f} ms")
+    print(f"  features columnar: {columnar_time * 1000:7.1f} ms ({per_lead_time / columnar_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
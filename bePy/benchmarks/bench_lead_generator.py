@@ -0,0 +1,87 @@
+"""Synthetic lead generation: per-lead loop vs vectorized LeadGenerator vs sharded processes.
+
+Times the original one-BaseLead-per-iteration loop, LeadGenerator in both
+modes on one core, and generate_shards writing .npy shards with several
+processes. Checks that shards are identical whatever the process count,
+then shows how many distinct values each model feature takes per mode.
+
+    python -m benchmarks.bench_lead_generator --leads 1000000 --processes 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from lead_batch import LeadBatch
+from models import BaseLead
+from services.lead_generator import DEFAULT_COMPANIES, DEFAULT_INDUSTRIES, LeadGenerator, generate_shards, load_shards
+from services.scoring import CATEGORICAL_COLS, MLScoringService
+
+
+def legacy_leads(count: int):
+    """MockDataService.iter_leads before vectorization"""
+    for i in range(count):
+        company = random.choice(DEFAULT_COMPANIES)
+        yield BaseLead(
+            company=f"{company} {i+1}",
+            industry=random.choice(DEFAULT_INDUSTRIES),
+            website=f"https://{company.lower().replace(' ', '')}.com",
+            phone=f"+1-555-{random.randint(100,999)}-{random.randint(1000,9999)}",
+            address=f"{random.randint(100,9999)} Business St, City, ST 12345",
+            employees=random.choice([10, 25, 50, 100, 250, 500]),
+            revenue=random.choice(["$1M-$5M", "$5M-$25M", "$25M+", "Startup"]),
+            business_type=random.choice(["B2B", "B2C"])
+        )
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=1000000)
+    parser.add_argument('--legacy-leads', type=int, default=100000, help="the loop is timed on fewer leads")
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--shard-size', type=int, default=250000)
+    args = parser.parse_args()
+
+    rows = []
+    seconds, _ = timed(lambda: list(legacy_leads(args.legacy_leads)))
+    rows.append(('per-lead loop', args.legacy_leads, seconds))
+    for realistic in (False, True):
+        seconds, _ = timed(lambda: LeadGenerator(seed=1, realistic=realistic).generate(args.leads))
+        rows.append((f"LeadGenerator {'realistic' if realistic else 'uniform'}", args.leads, seconds))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = os.path.join(tmp, 'single')
+        sharded = os.path.join(tmp, 'sharded')
+        seconds, _ = timed(lambda: generate_shards(single, args.leads, seed=1, realistic=True,
+                                                   shard_size=args.shard_size, processes=1))
+        rows.append(('shards to .npy, 1 process', args.leads, seconds))
+        seconds, _ = timed(lambda: generate_shards(sharded, args.leads, seed=1, realistic=True,
+                                                   shard_size=args.shard_size, processes=args.processes))
+        rows.append((f"shards to .npy, {args.processes} processes", args.leads, seconds))
+        a, b = LeadBatch.concat(load_shards(single)), LeadBatch.concat(load_shards(sharded))
+        same = all(getattr(a, field).to_list() == getattr(b, field).to_list() for field in LeadBatch.FIELDS)
+        print(f"shards identical across process counts: {same}")
+        assert same, "sharded output depends on the process count"
+
+    print(f"  {'generator':<32} {'leads':>9} {'seconds':>8} {'leads/s':>11}")
+    for label, count, seconds in rows:
+        print(f"  {label:<32} {count:9} {seconds:8.2f} {count / seconds:11,.0f}")
+
+    scorer = MLScoringService(model_dir=tempfile.mkdtemp())
+    print(f"  {'distinct values':<24} {'uniform':>8} {'realistic':>10}")
+    features = [scorer.extract_features_batch(LeadGenerator(seed=2, realistic=realistic).generate(20000))
+                for realistic in (False, True)]
+    for col in CATEGORICAL_COLS + ['employees', 'company_name_keywords', 'has_phone', 'has_website']:
+        counts = [len(set(f[col].to_list())) if col in CATEGORICAL_COLS else len(np.unique(f[col])) for f in features]
+        print(f"  {col:<24} {counts[0]:8} {counts[1]:10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Lead store search latency against a bulk-seeded SQLite database.
+
+Seeds the store from the mock generator (scored and tagged, as the app
+stores them) if it holds fewer than --leads rows, then times a mix of
+searches and a deep keyset pagination walk, next to the cost of the old
+regenerate-and-rescore search.
+
+    python -m benchmarks.bench_lead_store --leads 1000000 --db cache/bench_leads.sqlite3
+"""
+import argparse
+import os
+import time
+import numpy as np
+from services.enhanced_mock_service import EnhancedMockService
+from services.identity_index import IdentityIndex
+from services.lead_store import LeadStore
+
+QUERIES = {
+    'no filter': {},
+    'broad text': {'query': 'tech'},
+    'company number': {'query': '424242'},
+    'text + location': {'query': 'cloudbridge', 'location': 'city st'},
+    'score range': {'min_score': 6.0, 'max_score': 7.5},
+    'tag': {'tags': ['enterprise']},
+    'text + tags + score': {'query': 'software', 'tags': ['b2b-focused', 'mid-market'], 'min_score': 5.0},
+}
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=1000000)
+    parser.add_argument('--db', default='cache/bench_leads.sqlite3')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    store = LeadStore(db_path=args.db)
+    service = EnhancedMockService()
+    stored = store.count()
+    if stored < args.leads:
+        # Keep benchmark identities out of the app's index
+        service.identity_index = IdentityIndex(db_path=':memory:', bloom_capacity=args.leads * 3)
+        started = time.perf_counter()
+        service.seed_store(store, args.leads - stored, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"seeded {args.leads - stored} leads in {elapsed:.1f}s ({(args.leads - stored) / elapsed:.0f} leads/s)")
+    size_mb = sum(os.path.getsize(path) for path in (args.db, f"{args.db}-wal") if os.path.exists(path)) / 2 ** 20
+    print(f"{store.count()} leads in store, {size_mb:.0f} MB on disk, page size {args.limit}")
+
+    print(f"  {'search':<22} {'p50 ms':>8} {'p99 ms':>8}  hits on page")
+    for label, filters in QUERIES.items():
+        leads, _ = store.search(limit=args.limit, **filters)
+        p50, p99 = timed(lambda: store.search(limit=args.limit, **filters), args.repeats)
+        print(f"  {label:<22} {p50:8.2f} {p99:8.2f}  {len(leads)}")
+
+    cursor, pages = None, 0
+    started = time.perf_counter()
+    while pages < 500:
+        _, cursor = store.search(query='tech', limit=args.limit, cursor=cursor)
+        pages += 1
+        if cursor is None:
+            break
+    print(f"  {'500 pages deep':<22} {(time.perf_counter() - started) * 1000 / pages:8.2f} ms/page")
+
+    p50, p99 = timed(lambda: service.generate_leads(args.limit), 5)
+    print(f"  {'old: regenerate':<22} {p50:8.2f} {p99:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Scoring latency while the model retrains in the background and is hot-swapped.
+
+Scores small batches back to back, first with the model idle and then while
+a warm-start and a full retrain run and publish, and reports latency
+percentiles, failed calls and the model versions the scorer served.
+
+    python -m benchmarks.bench_retrain --leads 20000
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+from services.enhanced_mock_service import EnhancedMockService
+from services.identity_index import IdentityIndex
+from services.lead_store import LeadStore
+from services.model_retrainer import ModelRetrainer
+from services.scoring import MLScoringService
+
+
+def score_until(scorer: MLScoringService, batch, done) -> dict:
+    samples, errors, versions = [], 0, set()
+    while not done():
+        started = time.perf_counter()
+        try:
+            scorer.predict_scores(batch)
+        except Exception:
+            errors += 1
+        samples.append((time.perf_counter() - started) * 1000)
+        versions.add(scorer.version)
+    return {'calls': len(samples), 'p50': np.percentile(samples, 50), 'p99': np.percentile(samples, 99),
+            'errors': errors, 'versions': sorted(versions)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = EnhancedMockService()
+        service.identity_index = IdentityIndex(db_path=':memory:', bloom_capacity=args.leads * 3)
+        scorer = MLScoringService(model_dir=f"{tmp}/models")
+        scorer.reload_interval = 0.1
+        scorer.train_model(service.generate_batch(1000).to_leads())
+        # Leads stored after the live model was trained are what a warm start grows on
+        store = LeadStore(db_path=f"{tmp}/leads.sqlite3")
+        service.seed_store(store, args.leads)
+        retrainer = ModelRetrainer(scorer, store, interval=0)
+        batch = service.generate_batch(args.batch)
+
+        deadline = time.monotonic() + 3
+        idle = score_until(scorer, batch, lambda: time.monotonic() > deadline)
+        print(f"{args.leads} stored leads, batches of {args.batch}")
+        print(f"  {'phase':<22} {'calls':>6} {'p50 ms':>8} {'p99 ms':>8} errors  versions")
+        print(f"  {'idle':<22} {idle['calls']:6} {idle['p50']:8.2f} {idle['p99']:8.2f} {idle['errors']:6}  {idle['versions']}")
+        for mode in ('warm_start', 'full'):
+            retrainer.trigger(mode)
+            busy = score_until(scorer, batch, lambda: not retrainer.get_stats()['running'])
+            result = retrainer.last_result
+            print(f"  {'during ' + mode:<22} {busy['calls']:6} {busy['p50']:8.2f} {busy['p99']:8.2f} "
+                  f"{busy['errors']:6}  {busy['versions']}  ({result.get('status')} in {result.get('seconds')}s, "
+                  f"holdout MAE {result.get('holdout_mae')} vs {result.get('baseline_mae')})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Lead memory footprint and response serialization cost.
+
+Compares the original representation (plain dataclasses with an eager
+uuid4 and datetime string, hand-built dicts passed to jsonify) with the
+slotted msgspec Structs encoded directly.
+
+    python -m benchmarks.bench_serialization --leads 10000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from flask import Flask, jsonify
+from models import EnrichedLead
+from utils.serialization import dumps
+
+
+@dataclass
+class LegacyEnrichedLead:
+    """Copy of the pre-slots model, kept here only for comparison"""
+    company: str
+    industry: Optional[str] = None
+    website: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    employees: Optional[int] = None
+    revenue: Optional[str] = None
+    business_type: Optional[str] = None
+    fit_score: Optional[float] = None
+    tags: Optional[List[str]] = None
+    is_enriched: bool = False
+    owner_info: object = None
+    id: str = None
+    created_at: str = None
+
+    def __post_init__(self):
+        if self.id is None:
+            self.id = str(uuid.uuid4())
+        if self.created_at is None:
+            self.created_at = datetime.now().isoformat()
+        if self.tags is None:
+            self.tags = []
+
+
+def make_leads(cls, count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        cls(
+            company=f"Company {i}",
+            industry=rng.choice(["Technology", "Software", "SaaS", "Finance"]),
+            website=f"https://company{i}.com",
+            phone=f"+1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            address=f"{rng.randint(100, 9999)} Business St, City, ST 12345",
+            employees=rng.choice([10, 25, 50, 100, 250, 500]),
+            revenue=rng.choice(["$1M-$5M", "$5M-$25M", "$25M+"]),
+            business_type=rng.choice(["B2B", "B2C"]),
+            fit_score=round(rng.uniform(1, 10), 2),
+            tags=['mid-market', 'b2b-focused'],
+        )
+        for i in range(count)
+    ]
+
+
+def measure_build(cls, count: int):
+    """Time, bytes and allocations retained per lead while building ``count`` leads"""
+    started = time.perf_counter()
+    make_leads(cls, count)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    leads = make_leads(cls, count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return leads, size / count, blocks / count, elapsed
+
+
+def legacy_serialize(app: Flask, leads):
+    with app.app_context():
+        leads_data = []
+        for lead in leads:
+            leads_data.append({
+                'company': lead.company,
+                'industry': lead.industry,
+                'address': lead.address,
+                'phone': lead.phone,
+                'website': lead.website,
+                'source': 'mock',
+                'created_at': lead.created_at
+            })
+        return jsonify({'success': True, 'leads': leads_data, 'count': len(leads_data)}).get_data()
+
+
+def fast_serialize(leads):
+    return dumps({'success': True, 'leads': leads, 'count': len(leads)})
+
+
+def timed(fn, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    app = Flask(__name__)
+
+    legacy_leads, legacy_bytes, legacy_blocks, legacy_build = measure_build(LegacyEnrichedLead, args.leads)
+    leads, new_bytes, new_blocks, new_build = measure_build(EnrichedLead, args.leads)
+    print(f"{args.leads} leads")
+    print(f"  build  legacy: {legacy_bytes:7.0f} B/lead {legacy_blocks:5.1f} allocs/lead {legacy_build * 1000:7.1f} ms")
+    print(f"  build  struct: {new_bytes:7.0f} B/lead {new_blocks:5.1f} allocs/lead {new_build * 1000:7.1f} ms")
+
+    legacy_time, legacy_size = timed(lambda: legacy_serialize(app, legacy_leads), args.repeat)
+    new_time, new_size = timed(lambda: fast_serialize(leads), args.repeat)
+    print(f"  serialize legacy (dicts + jsonify): {legacy_time * 1000:7.1f} ms  {legacy_size / 1024:7.0f} KB")
+    print(f"  serialize struct (direct encode):   {new_time * 1000:7.1f} ms  {new_size / 1024:7.0f} KB (all fields)")
+
+
+if __name__ == '__main__':
+    main()
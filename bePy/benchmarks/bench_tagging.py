@@ -0,0 +1,47 @@
+"""Tagging throughput against the local LLM stub (no network needed).
+
+    python -m benchmarks.bench_tagging --leads 50 --latency 0.2 --batch-size 1 10 20
+"""
+import argparse
+import time
+from services.llm_backends import ChatCompletionsBackend
+from services.mock_data_service import MockDataService
+from services.semantic_tagging_service import SemanticTaggingService
+from .llm_stub_server import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.2, help='stub seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--drop-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    parser.add_argument('--batch-size', type=int, nargs='+', default=[1])
+    args = parser.parse_args()
+
+    base_url, app, stop = start_stub_server(latency=args.latency, error_rate=args.error_rate,
+                                            drop_rate=args.drop_rate)
+    leads = MockDataService().generate_leads(args.leads)
+    print(f"{args.leads} leads, stub latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+    try:
+        for batch_size in args.batch_size:
+            for concurrency in args.concurrency:
+                tagger = SemanticTaggingService(backend=ChatCompletionsBackend(base_url),
+                                                concurrency=concurrency, batch_size=batch_size)
+                prompt_chars_before = app['stats']['prompt_chars']
+                started = time.perf_counter()
+                tagger.generate_semantic_tags_batch(leads)
+                elapsed = time.perf_counter() - started
+                stats = tagger.get_stats()
+                prompt_chars = app['stats']['prompt_chars'] - prompt_chars_before
+                print(f"  batch={batch_size:<3} concurrency={concurrency:<3} {elapsed:6.2f}s  "
+                      f"{args.leads / elapsed:7.1f} leads/s  requests={stats['requests']}  "
+                      f"prompt_chars={prompt_chars}  parse_failure_rate={stats['batch_parse_failure_rate']}  "
+                      f"retagged={stats['batch_leads_retagged']}")
+    finally:
+        stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Compiled forest vs sklearn predict: parity and single-row/batch latency.
+
+Checks that CompiledForest reproduces RandomForestRegressor.predict on
+encoded mock leads and on random inputs, then times both engines at several
+batch sizes, plus end-to-end predict_score for one lead.
+
+    python -m benchmarks.bench_tree_inference --rows 100000
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+from services.mock_data_service import MockDataService
+from services.scoring import MLScoringService
+from utils.compiled_forest import CompiledForest
+
+
+def latency(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    generator = MockDataService()
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer = MLScoringService(model_dir=tmp)
+        scorer.train_model(generator.generate_leads(1000))
+    model = scorer.state.model
+    started = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(model)
+    print(f"{compiled.n_trees} trees, depth {compiled.depth}, {compiled.memory_bytes / 1024:.0f} KB, "
+          f"compiled in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    X = scorer.state.pipeline.encode(scorer.extract_features_batch(generator.generate_batch(args.rows)))
+    noise = np.random.default_rng(1).normal(scale=3.0, size=(args.rows // 10, X.shape[1]))
+    for label, data in (('mock leads', X), ('random inputs', noise)):
+        diff = np.abs(compiled.predict(data) - model.predict(data)).max()
+        print(f"  parity on {len(data)} {label}: max |diff| {diff:.2e}")
+        assert diff < 1e-9, "compiled forest diverged from sklearn"
+
+    print(f"  {'rows':>7} {'sklearn p50':>12} {'p99':>8} {'compiled p50':>13} {'p99':>8}")
+    for rows in (1, 10, 100, 1000, 10000, args.rows):
+        batch = X[:rows]
+        repeats = max(3, min(args.repeats, 20000 // rows))
+        sk50, sk99 = latency(lambda: model.predict(batch), repeats)
+        c50, c99 = latency(lambda: compiled.predict(batch), repeats)
+        print(f"  {rows:7} {sk50:9.3f} ms {sk99:8.3f} {c50:10.3f} ms {c99:8.3f}")
+
+    lead = generator.generate_leads(1)[0]
+    for engine in ('sklearn', 'compiled'):
+        scorer.compiled_max_rows = 0 if engine == 'sklearn' else 512
+        p50, p99 = latency(lambda: scorer.predict_score(lead), args.repeats)
+        print(f"  predict_score, {engine:<8} p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
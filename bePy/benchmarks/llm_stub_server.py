@@ -0,0 +1,96 @@
+"""Local OpenAI-compatible chat completions stub for offline tagging benchmarks.
+
+Run standalone:
+    python -m benchmarks.llm_stub_server --port 8089 --latency 0.2
+
+then point the backend at it with TAGGING_BASE_URL=http://127.0.0.1:8089/v1
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+from aiohttp import web
+
+STUB_TAGS = ["high-growth", "tech-forward", "b2b-focused", "mid-market", "cloud-native"]
+LEAD_ID_PATTERN = re.compile(r'"id": "([^"]+)"')
+
+
+def build_app(latency: float = 0.05, error_rate: float = 0.0, drop_rate: float = 0.0) -> web.Application:
+    """Build the stub app; each request sleeps ``latency`` seconds.
+
+    Batch prompts (several lead ids) get a JSON object keyed by id; each id
+    is omitted with probability ``drop_rate`` to exercise re-tagging.
+    """
+    stats = {'requests': 0, 'errors': 0, 'prompt_chars': 0}
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        stats['requests'] += 1
+        payload = await request.json()
+        prompt = payload['messages'][-1]['content']
+        stats['prompt_chars'] += sum(len(m['content']) for m in payload['messages'])
+        await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            stats['errors'] += 1
+            return web.json_response({'error': 'stub overloaded'}, status=503)
+        lead_ids = LEAD_ID_PATTERN.findall(prompt)
+        if lead_ids:
+            content = json.dumps({
+                lead_id: random.sample(STUB_TAGS, 3)
+                for lead_id in lead_ids if random.random() >= drop_rate
+            })
+        else:
+            content = json.dumps(random.sample(STUB_TAGS, 3))
+        return web.json_response({
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]
+        })
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app['stats'] = stats
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    app.router.add_get('/stats', get_stats)
+    return app
+
+
+def start_stub_server(port: int = 0, latency: float = 0.05, error_rate: float = 0.0,
+                      drop_rate: float = 0.0):
+    """Start the stub on a background thread; returns (base_url, app, stop)"""
+    app = build_app(latency, error_rate, drop_rate)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    started = threading.Event()
+    bound = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', port)
+        loop.run_until_complete(site.start())
+        bound['port'] = site._server.sockets[0].getsockname()[1]
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+    return f"http://127.0.0.1:{bound['port']}/v1", app, stop
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 503 responses')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='fraction of ids left out of batch responses')
+    args = parser.parse_args()
+    web.run_app(build_app(args.latency, args.error_rate, args.drop_rate), host='127.0.0.1', port=args.port)
@@ -0,0 +1,149 @@
+"""HTTP load test for /api/leads/search and /api/leads/enrich.
+
+Keeps --concurrency requests in flight for --duration seconds per endpoint
+and prints requests/sec and latency percentiles. Point it at a running
+server with --url, or let it start one with --spawn: 'gunicorn' serves
+through gunicorn.conf.py, 'flask' through the development server (which
+only listens on port 5000).
+
+    python -m benchmarks.load_test --spawn gunicorn --concurrency 32 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+import aiohttp
+import numpy as np
+
+SEARCH_QUERIES = ['', 'tech', 'data', 'cloud', 'software', 'solutions', 'systems', 'digital']
+INDUSTRIES = ['Technology', 'SaaS', 'Finance', 'Healthcare', 'Retail', 'Manufacturing']
+
+
+def search_payload(rng: random.Random) -> dict:
+    return {'query': rng.choice(SEARCH_QUERIES), 'limit': 20}
+
+
+def enrich_payload(rng: random.Random, leads: int) -> dict:
+    return {'leads': [
+        {'company': f"Load Test {rng.choice(['Data', 'Cloud', 'Retail', 'Labs'])} {rng.randrange(100000)}",
+         'industry': rng.choice(INDUSTRIES), 'address': f"{rng.randrange(1000)} Main St, City, ST"}
+        for _ in range(leads)
+    ]}
+
+
+def spawn_server(kind: str, url: str) -> subprocess.Popen:
+    port = urlsplit(url).port or 80
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, ENRICH_CRAWL_CONTACTS='false', SERVER_BIND=f"127.0.0.1:{port}")
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']
+    else:
+        command = [sys.executable, 'app.py']
+    # Own process group, so the dev server's reloader child goes down with it
+    return subprocess.Popen(command, cwd=root, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_healthy(session: aiohttp.ClientSession, url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{url}/api/health") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"server at {url} did not become healthy within {timeout:.0f}s")
+
+
+async def run_endpoint(session: aiohttp.ClientSession, url: str, path: str, make_payload,
+                       concurrency: int, duration: float) -> dict:
+    latencies, errors = [], Counter()
+    deadline = time.monotonic() + duration
+
+    async def user(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            payload = make_payload(rng)
+            started = time.perf_counter()
+            try:
+                async with session.post(f"{url}{path}", json=payload) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors[f"HTTP {response.status}"] += 1
+            except aiohttp.ClientError as e:
+                errors[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors.values()),
+        'error_kinds': dict(errors),
+        'rps': len(latencies) / elapsed,
+        'p50': np.percentile(latencies, 50),
+        'p90': np.percentile(latencies, 90),
+        'p99': np.percentile(latencies, 99),
+        'max': max(latencies),
+    }
+
+
+async def main_async(args):
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await wait_healthy(session, args.url, args.startup_timeout)
+        endpoints = {
+            'search': ('/api/leads/search', search_payload),
+            'enrich': ('/api/leads/enrich', lambda rng: enrich_payload(rng, args.enrich_leads)),
+        }
+        print(f"{args.url}: {args.concurrency} concurrent requests, {args.duration:.0f}s per endpoint")
+        print(f"  {'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>8} "
+              f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name in args.endpoints.split(','):
+            path, make_payload = endpoints[name]
+            # A short warm-up so first-request costs (connections, caches) don't skew the percentiles
+            await run_endpoint(session, args.url, path, make_payload, args.concurrency, min(2.0, args.duration))
+            result = await run_endpoint(session, args.url, path, make_payload, args.concurrency, args.duration)
+            print(f"  {name:<10} {result['requests']:9} {result['errors']:7} {result['rps']:8.1f} "
+                  f"{result['p50']:8.1f} {result['p90']:8.1f} {result['p99']:8.1f} {result['max']:8.1f}")
+            if result['errors']:
+                print(f"    errors: {result['error_kinds']}")
+            if name == 'search':
+                async with session.get(f"{args.url}/api/health") as response:
+                    cache = (await response.json()).get('search_cache', {})
+                print(f"    search cache (this worker): hit rate {cache.get('hit_rate')}, "
+                      f"{cache.get('coalesced')} coalesced, {cache.get('stale')} stale")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--spawn', choices=('none', 'gunicorn', 'flask'), default='none')
+    parser.add_argument('--endpoints', default='search,enrich')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--enrich-leads', type=int, default=5, help="leads per enrich request")
+    parser.add_argument('--startup-timeout', type=float, default=180)
+    args = parser.parse_args()
+
+    server = spawn_server(args.spawn, args.url) if args.spawn != 'none' else None
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+if __name__ == '__main__':
+    main()
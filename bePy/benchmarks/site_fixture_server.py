@@ -0,0 +1,100 @@
+"""Local multi-host website fixture for crawler tests and benchmarks.
+
+Each fake "company site" listens on its own port, so the crawler treats
+them as separate hosts. Every site serves:
+    /robots.txt   disallows /private
+    /             HTML page with a contact email, padded to --page-kb
+    /private      should never be fetched
+    /huge         ~5 MB page to exercise the response size cap
+"""
+import argparse
+import asyncio
+import threading
+from aiohttp import web
+
+
+def build_site(site_id: int, latency: float = 0.02, page_kb: int = 40) -> web.Application:
+    """One fake company website"""
+    stats = {'requests': 0, 'robots': 0, 'private': 0}
+    filler = ('<p>' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 8 + '</p>\n')
+    body = (
+        f"<html><head><title>Company {site_id}</title></head><body>"
+        f"<h1>Company {site_id}</h1>"
+        + filler * max(1, page_kb * 1024 // len(filler))
+        + f"<footer>Contact us: sales@company{site_id}.example</footer></body></html>"
+    )
+
+    async def index(request):
+        stats['requests'] += 1
+        await asyncio.sleep(latency)
+        return web.Response(text=body, content_type='text/html')
+
+    async def robots(request):
+        stats['robots'] += 1
+        return web.Response(text="User-agent: *\nDisallow: /private\n")
+
+    async def private(request):
+        stats['private'] += 1
+        return web.Response(text="secret", content_type='text/html')
+
+    async def huge(request):
+        stats['requests'] += 1
+        return web.Response(text=filler * 10000, content_type='text/html')
+
+    app = web.Application()
+    app['stats'] = stats
+    app.router.add_get('/', index)
+    app.router.add_get('/robots.txt', robots)
+    app.router.add_get('/private', private)
+    app.router.add_get('/huge', huge)
+    return app
+
+
+def start_sites(count: int = 10, latency: float = 0.02, page_kb: int = 40):
+    """Start ``count`` sites on a background thread; returns (base_urls, apps, stop)"""
+    loop = asyncio.new_event_loop()
+    apps = [build_site(i, latency, page_kb) for i in range(count)]
+    runners = [web.AppRunner(app) for app in apps]
+    base_urls = []
+    started = threading.Event()
+
+    async def setup():
+        for runner in runners:
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            base_urls.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(setup())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        async def cleanup():
+            for runner in runners:
+                await runner.cleanup()
+        asyncio.run_coroutine_threadsafe(cleanup(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+    return base_urls, apps, stop
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sites', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--page-kb', type=int, default=40)
+    args = parser.parse_args()
+    urls, _, stop = start_sites(args.sites, args.latency, args.page_kb)
+    print("\n".join(urls))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stop()
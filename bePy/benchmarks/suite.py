@@ -0,0 +1,345 @@
+"""Benchmark suite over the backend hot paths, saved as JSON and compared against a baseline.
+
+Each case builds seeded inputs in an untimed setup for every size it runs
+at, then times the call over several rounds (GC off and fast calls
+repeated within a round, as timeit does) until --min-time has passed.
+The startup cases time fresh interpreters and record the app's
+-X importtime profile next to their timings. Services run against throwaway stores and
+model directories, with LLM tagging and website crawling off so nothing
+leaves the machine. Results go to --output; --compare prints each case's
+fastest round against a saved run and exits 1 if any is slower by more
+than --threshold.
+
+    python -m benchmarks.suite --output cache/benchmarks/baseline.json
+    python -m benchmarks.suite --compare cache/benchmarks/baseline.json
+    python -m benchmarks.suite --filter api. --max-size 1000
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+SIZES = (10, 1000, 100000)
+CASES = []  # (name, sizes, setup); setup(size, env) -> (timed callable, items it processes)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'joblib', 'aiohttp', 'requests', 'bs4', 'openai')
+
+
+def case(name: str, sizes=SIZES):
+    def register(setup):
+        CASES.append((name, sizes, setup))
+        return setup
+    return register
+
+
+def isolate(workdir: str):
+    """Point every store, model and cache the services open at ``workdir``; before anything imports config"""
+    os.environ.update({
+        'LEAD_STORE_PATH': os.path.join(workdir, 'leads.sqlite3'),
+        'LEAD_STORE_SEED_COUNT': '10',
+        'JOB_DB_PATH': os.path.join(workdir, 'jobs.sqlite3'),
+        'IDENTITY_DB_PATH': os.path.join(workdir, 'identity.sqlite3'),
+        'IDENTITY_BLOOM_CAPACITY': '1000000',
+        'MODEL_DIR': os.path.join(workdir, 'models'),
+        'METRICS_DIR': '',
+        'TAG_CACHE_PATH': '',
+        'OPENAI_API_KEY': '',  # Rule-based tags: deterministic and offline
+        'TAGGING_BASE_URL': 'https://api.openai.com/v1',
+        'ENRICH_CRAWL_CONTACTS': 'false',
+        'SEARCH_CACHE_SIZE': '0',  # Time the search, not the response cache
+        'BACKGROUND_WORKERS_ON_IMPORT': 'false',
+        'RETRAIN_INTERVAL': '0',
+        'RETRAIN_SEARCH': 'false',
+        'MOCK_SEED': '0',
+        'LOG_LEVEL': 'WARNING',
+    })
+
+
+def seeded_leads(count: int, seed: int = 0):
+    from services.mock_data_service import MockDataService
+    return MockDataService(seed=seed).generate_leads(count)
+
+
+def trained_scorer(env: dict):
+    if 'scorer' not in env:
+        from services.mock_data_service import MockDataService
+        from services.scoring import MLScoringService
+        scorer = MLScoringService(model_dir=tempfile.mkdtemp(dir=env['workdir']))
+        scorer.train_model(MockDataService(seed=1).generate_batch(1000))
+        env['scorer'] = scorer
+    return env['scorer']
+
+
+def flask_client(env: dict):
+    if 'client' not in env:
+        import app
+        env['app'] = app
+        env['client'] = app.app.test_client()
+    return env['client']
+
+
+class Details(dict):
+    """What a case observed besides its timing, saved with its result; return one from the timed callable"""
+
+
+def importtime_report(stderr: str, module: str, top: int = 8) -> Details:
+    """Summary of a -X importtime log: the module's cumulative time, its slowest direct imports, heavy packages seen"""
+    rows = []  # (cumulative us, depth, name)
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), (len(name) - len(name.lstrip())) // 2, name.strip()))
+    total = next((us for us, depth, name in rows if name == module and depth == 0), None)
+    children = sorted((row for row in rows if row[1] == 1), reverse=True)[:top]
+    return Details({
+        'import_ms': total / 1000 if total is not None else None,
+        'slowest_imports_ms': {name: us / 1000 for us, _, name in children},
+        'heavy_modules_loaded': sorted({name.split('.')[0] for _, _, name in rows} & set(HEAVY_MODULES)),
+    })
+
+
+@case('startup.import_app', sizes=(1,))
+def bench_import_app(size, env):
+    """A fresh interpreter importing the app, as a cold start does; details come from -X importtime"""
+    def cold_import():
+        run = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=BACKEND_DIR,
+                             capture_output=True, text=True, check=True)
+        return importtime_report(run.stderr, 'app')
+    return cold_import, 1
+
+
+@case('startup.ready', sizes=(1,))
+def bench_ready(size, env):
+    """A fresh interpreter importing the app and building every service, loading the saved model"""
+    def cold_start():
+        subprocess.run([sys.executable, '-c', 'import app; assert app.services.warm_up()'], cwd=BACKEND_DIR,
+                       capture_output=True, check=True)
+    return cold_start, 1
+
+
+@case('mock.generate_leads')
+def bench_generate_leads(size, env):
+    from services.mock_data_service import MockDataService
+    service = MockDataService(seed=0)
+    return lambda: service.generate_leads(size), size
+
+
+@case('scoring.extract_features')
+def bench_extract_features(size, env):
+    scorer, leads = trained_scorer(env), seeded_leads(size)
+    return lambda: [scorer.extract_features(lead) for lead in leads], size
+
+
+@case('scoring.extract_features_batch')
+def bench_extract_features_batch(size, env):
+    from services.mock_data_service import MockDataService
+    scorer, batch = trained_scorer(env), MockDataService(seed=0).generate_batch(size)
+    return lambda: scorer.extract_features_batch(batch), size
+
+
+@case('scoring.predict_score', sizes=(10, 1000))
+def bench_predict_score(size, env):
+    scorer, leads = trained_scorer(env), seeded_leads(size)
+    return lambda: [scorer.predict_score(lead) for lead in leads], size
+
+
+@case('scoring.predict_scores')
+def bench_predict_scores(size, env):
+    scorer, leads = trained_scorer(env), seeded_leads(size)
+    return lambda: scorer.predict_scores(leads), size
+
+
+@case('scoring.train_model', sizes=(1000, 10000, 100000))
+def bench_train_model(size, env):
+    from services.mock_data_service import MockDataService
+    from services.scoring import MLScoringService
+    scorer = MLScoringService(model_dir=tempfile.mkdtemp(dir=env['workdir']))
+    batch = MockDataService(seed=0).generate_batch(size)
+    return lambda: scorer.train_model(batch), size
+
+
+@case('tagging.fallback_tags')
+def bench_fallback_tags(size, env):
+    from services.semantic_tagging_service import SemanticTaggingService
+    tagger, leads = SemanticTaggingService(backend=None), seeded_leads(size)
+    return lambda: [tagger._fallback_tags(lead) for lead in leads], size
+
+
+@case('scraper.extract_contact_info', sizes=(10, 100))
+def bench_extract_contact_info(size, env):
+    from services.free_scraper import FreeLeadScraper
+    from .bench_contact_extraction import write_synthetic_corpus
+    if not glob.glob(os.path.join(env['corpus'], '*.html')):
+        write_synthetic_corpus(env['corpus'])
+    pages = []
+    for path in sorted(glob.glob(os.path.join(env['corpus'], '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    pages = [pages[i % len(pages)] for i in range(size)]
+    scraper = FreeLeadScraper()
+    return lambda: [scraper._extract_contact_info(page) for page in pages], size
+
+
+@case('api.search')
+def bench_api_search(size, env):
+    """One search page against a store holding ``size`` leads"""
+    client = flask_client(env)
+    store = env['app'].services.lead_store
+    if store.count() < size:  # Sizes run in ascending order, so the store only ever grows
+        env['app'].services.mock_service.seed_store(store, size - store.count())
+
+    def search():
+        response = client.post('/api/leads/search', json={'query': 'tech', 'limit': 20})
+        assert response.status_code == 200, response.status_code
+    return search, 1
+
+
+@case('api.enrich')
+def bench_api_enrich(size, env):
+    client = flask_client(env)
+    payload = {'leads': [
+        {'id': lead.id, 'company': lead.company, 'industry': lead.industry, 'address': lead.address,
+         'phone': lead.phone, 'employees': lead.employees, 'business_type': lead.business_type}
+        for lead in seeded_leads(size, seed=2)
+    ]}
+
+    def enrich():
+        response = client.post('/api/leads/enrich', json=payload)
+        assert response.status_code == 200, response.status_code
+    return enrich, size
+
+
+def measure(fn, min_rounds: int, min_time: float, max_time: float, round_time: float = 0.02) -> tuple:
+    """(seconds per call, one sample per round; what the last call returned, which may be Details)
+
+    Fast calls are repeated within a round, as timeit's autorange does.
+    """
+    started = time.perf_counter()
+    fn()  # Warm-up, which also sizes the rounds
+    number = max(1, int(round_time / max(time.perf_counter() - started, 1e-9)))
+    samples, started = [], time.perf_counter()
+    while True:
+        gc.collect()
+        gc.disable()
+        try:
+            round_started = time.perf_counter()
+            for _ in range(number):
+                returned = fn()
+            samples.append((time.perf_counter() - round_started) / number)
+        finally:
+            gc.enable()
+        spent = time.perf_counter() - started
+        if (len(samples) >= min_rounds and spent >= min_time) or spent >= max_time:
+            return samples, returned
+
+
+def environment() -> dict:
+    import sklearn
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Print current vs baseline fastest rounds (the least noisy statistic); returns how many got slower"""
+    regressions = 0
+    print(f"  {'case':<40} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}")
+    for key, result in results.items():
+        before = baseline['results'].get(key)
+        if before is None:
+            print(f"  {key:<40} {'-':>12} {result['min_s'] * 1000:10.3f}    new")
+            continue
+        ratio = result['min_s'] / before['min_s']
+        verdict = 'SLOWER' if ratio > 1 + threshold else 'faster' if ratio < 1 - threshold else ''
+        regressions += verdict == 'SLOWER'
+        print(f"  {key:<40} {before['min_s'] * 1000:12.3f} {result['min_s'] * 1000:10.3f} "
+              f"{ratio:7.2f} {verdict}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', default='', help="only cases whose name contains this")
+    parser.add_argument('--max-size', type=int, default=None, help="skip sizes above this")
+    parser.add_argument('--min-rounds', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=1.0, help="seconds of rounds per case and size")
+    parser.add_argument('--max-time', type=float, default=30.0, help="stop adding rounds after this many seconds")
+    parser.add_argument('--corpus', default=os.path.join(os.path.dirname(__file__), 'html_corpus'))
+    parser.add_argument('--output', default='cache/benchmarks/latest.json')
+    parser.add_argument('--compare', default=None, help="a saved run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help="relative slowdown that counts as a regression (compare runs from the same machine)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        isolate(workdir)
+        env = {'workdir': workdir, 'corpus': args.corpus}
+        results = {}
+        print(f"  {'case':<40} {'rounds':>6} {'min ms':>10} {'median ms':>10} {'items/s':>12}")
+        for name, sizes, setup in CASES:
+            if args.filter not in name:
+                continue
+            for size in sizes:
+                if args.max_size is not None and size > args.max_size:
+                    continue
+                random.seed(0)
+                np.random.seed(0)  # Target noise and forest bootstraps draw from the global state
+                fn, items = setup(size, env)
+                samples, details = measure(fn, args.min_rounds, args.min_time, args.max_time)
+                median = statistics.median(samples)
+                key = f"{name}[{size}]"
+                results[key] = {
+                    'name': name,
+                    'size': size,
+                    'rounds': len(samples),
+                    'min_s': min(samples),
+                    'median_s': median,
+                    'mean_s': statistics.fmean(samples),
+                    'stddev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                    'items_per_s': items / median,
+                }
+                if isinstance(details, Details):  # Any other return value is just the work being timed
+                    results[key]['details'] = details
+                print(f"  {key:<40} {len(samples):6} {min(samples) * 1000:10.3f} {median * 1000:10.3f} "
+                      f"{items / median:12,.0f}", flush=True)
+                if isinstance(details, Details):
+                    print(f"    {json.dumps(details)}")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"saved {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"against {args.compare} (commit {baseline['environment'].get('commit')}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{regressions} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,4 +6,121 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-12345')
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
-    USE_MOCK_DATA = os.getenv('USE_MOCK_DATA', 'true').lower() == 'true'
\ No newline at end of file
+    USE_MOCK_DATA = os.getenv('USE_MOCK_DATA', 'true').lower() == 'true'
+    # Semantic tagging (any OpenAI-compatible endpoint, e.g. a local stub)
+    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+    TAGGING_BASE_URL = os.getenv('TAGGING_BASE_URL', 'https://api.openai.com/v1')
+    TAGGING_MODEL = os.getenv('TAGGING_MODEL', 'gpt-3.5-turbo')
+    TAGGING_CONCURRENCY = int(os.getenv('TAGGING_CONCURRENCY', '8'))
+    TAGGING_TIMEOUT = float(os.getenv('TAGGING_TIMEOUT', '10'))
+    TAGGING_MAX_RETRIES = int(os.getenv('TAGGING_MAX_RETRIES', '2'))
+    TAGGING_BATCH_SIZE = int(os.getenv('TAGGING_BATCH_SIZE', '10'))  # Leads per prompt; 1 disables batching
+
+    # Tag cache: in-process LRU plus an optional SQLite tier (e.g. cache/tags.sqlite3)
+    TAG_CACHE_SIZE = int(os.getenv('TAG_CACHE_SIZE', '10000'))
+    TAG_CACHE_TTL = float(os.getenv('TAG_CACHE_TTL', '86400'))
+    TAG_CACHE_PATH = os.getenv('TAG_CACHE_PATH', '')
+
+    # Stored leads read per step of /api/leads/search/stream, and the most one stream may send
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '50'))
+    STREAM_MAX_LIMIT = int(os.getenv('STREAM_MAX_LIMIT', '1000000'))
+
+    # Website crawler used for bulk contact enrichment
+    CRAWL_CONCURRENCY = int(os.getenv('CRAWL_CONCURRENCY', '32'))
+    CRAWL_PER_HOST_RATE = float(os.getenv('CRAWL_PER_HOST_RATE', '2'))  # Requests/sec per host
+    CRAWL_MAX_BYTES = int(os.getenv('CRAWL_MAX_BYTES', str(512 * 1024)))
+    CRAWL_TIMEOUT = float(os.getenv('CRAWL_TIMEOUT', '5'))
+    CRAWL_DEADLINE = float(os.getenv('CRAWL_DEADLINE', '30'))  # Seconds per batch
+    CRAWL_ROBOTS_TTL = float(os.getenv('CRAWL_ROBOTS_TTL', '3600'))
+    CRAWL_USER_AGENT = os.getenv('CRAWL_USER_AGENT', 'SaaSquatchBot/1.0')
+
+    # Enrichment pipeline behind /api/leads/enrich: normalize -> score -> tag -> crawl
+    ENRICH_CHUNK_SIZE = int(os.getenv('ENRICH_CHUNK_SIZE', '100'))  # Leads per chunk flowing between stages
+    ENRICH_QUEUE_SIZE = int(os.getenv('ENRICH_QUEUE_SIZE', '4'))  # Chunks buffered before a stage blocks
+    ENRICH_TAG_WORKERS = int(os.getenv('ENRICH_TAG_WORKERS', '2'))
+    # >0 scores chunks in that many worker processes; 0 scores in-thread (the forest already uses every core)
+    ENRICH_SCORE_PROCESSES = int(os.getenv('ENRICH_SCORE_PROCESSES', '0'))
+    # Fetch each lead's website for owner contacts; off by default since it puts live outbound HTTP
+    # (up to CRAWL_DEADLINE per chunk) inside the synchronous /api/leads/enrich request
+    ENRICH_CRAWL_CONTACTS = os.getenv('ENRICH_CRAWL_CONTACTS', 'false').lower() == 'true'
+
+    # Asynchronous enrichment jobs (/api/leads/enrich/jobs) on a local SQLite queue
+    JOB_DB_PATH = os.getenv('JOB_DB_PATH', 'cache/enrich_jobs.sqlite3')
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # Chunks processed concurrently per process
+    JOB_CHUNK_SIZE = int(os.getenv('JOB_CHUNK_SIZE', '500'))  # Leads per durable chunk (the resume unit)
+    JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', '600'))  # Before another worker may take a chunk over
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+    JOB_RETENTION = float(os.getenv('JOB_RETENTION', str(7 * 86400)))  # Finished jobs kept this long
+
+    # Lead identity index: stable ids and duplicate merging by domain, phone and name
+    IDENTITY_DB_PATH = os.getenv('IDENTITY_DB_PATH', 'cache/identity.sqlite3')
+    IDENTITY_BLOOM_CAPACITY = int(os.getenv('IDENTITY_BLOOM_CAPACITY', '10000000'))  # ~12 MB at 1%
+    IDENTITY_BLOOM_ERROR_RATE = float(os.getenv('IDENTITY_BLOOM_ERROR_RATE', '0.01'))
+    IDENTITY_FUZZY_THRESHOLD = float(os.getenv('IDENTITY_FUZZY_THRESHOLD', '0.8'))  # Trigram Dice on names
+
+    # Persistent lead store behind /api/leads/search (SQLite with an FTS5 index)
+    LEAD_STORE_PATH = os.getenv('LEAD_STORE_PATH', 'cache/leads.sqlite3')
+    LEAD_STORE_MAX_LIMIT = int(os.getenv('LEAD_STORE_MAX_LIMIT', '200'))  # Largest page a search may ask for
+    LEAD_STORE_SEED_COUNT = int(os.getenv('LEAD_STORE_SEED_COUNT', '1000'))  # Mock leads stored when empty
+    # Cache of encoded /api/leads/search responses; entries also drop when the store is written
+    SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '1000'))  # Responses kept; 0 only coalesces concurrent requests
+    SEARCH_CACHE_MAX_MB = float(os.getenv('SEARCH_CACHE_MAX_MB', '64'))
+    SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '30'))
+    SEARCH_CACHE_WAIT = float(os.getenv('SEARCH_CACHE_WAIT', '30'))  # Longest an identical request waits on another
+
+    # Bulk export behind /api/leads/export and `python -m services.lead_export`
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '10000'))  # Leads read, encoded and written per step
+    # gzip 1-9 (default 1: ~2x level 6's speed for ~30% more bytes), zstd 1-22 (default 3); Parquet uses its codec's
+    EXPORT_COMPRESSION_LEVEL = int(os.environ['EXPORT_COMPRESSION_LEVEL']) if os.getenv('EXPORT_COMPRESSION_LEVEL') else None
+
+    # Lead scoring model: versioned artifacts in MODEL_DIR, hot-reloaded when a new one is published
+    MODEL_DIR = os.getenv('MODEL_DIR', 'models')
+    MODEL_RELOAD_INTERVAL = float(os.getenv('MODEL_RELOAD_INTERVAL', '2'))  # Seconds between pointer checks
+    MODEL_KEEP_VERSIONS = int(os.getenv('MODEL_KEEP_VERSIONS', '3'))
+    SCORING_ENGINE = os.getenv('SCORING_ENGINE', 'compiled')  # 'compiled' (flattened NumPy forest) or 'sklearn'
+    SCORING_COMPILED_MAX_ROWS = int(os.getenv('SCORING_COMPILED_MAX_ROWS', '512'))  # Larger batches use sklearn
+    FEATURE_CACHE_SIZE = int(os.getenv('FEATURE_CACHE_SIZE', '50000'))  # Encoded leads memoized per model version
+    # Background retraining on stored leads, in a separate process
+    RETRAIN_INTERVAL = float(os.getenv('RETRAIN_INTERVAL', '3600'))  # Seconds between checks; 0 disables
+    RETRAIN_MIN_NEW_LEADS = int(os.getenv('RETRAIN_MIN_NEW_LEADS', '1000'))  # Stored since the live model
+    RETRAIN_MAX_ROWS = int(os.getenv('RETRAIN_MAX_ROWS', '200000'))  # Newest leads used for a full refit
+    RETRAIN_HOLDOUT = float(os.getenv('RETRAIN_HOLDOUT', '0.2'))
+    RETRAIN_TOLERANCE = float(os.getenv('RETRAIN_TOLERANCE', '0.02'))  # Allowed holdout MAE regression
+    RETRAIN_ADD_TREES = int(os.getenv('RETRAIN_ADD_TREES', '20'))  # Trees grown per warm-start round
+    RETRAIN_MAX_TREES = int(os.getenv('RETRAIN_MAX_TREES', '300'))  # Beyond this, refit from scratch
+    RETRAIN_SEARCH = os.getenv('RETRAIN_SEARCH', 'true').lower() == 'true'  # Full refits pick the model by CV search
+    # Model selection: cross-validated search over these, served model = fastest within tolerance of the best MAE
+    MODEL_SEARCH_TREES = [int(n) for n in os.getenv('MODEL_SEARCH_TREES', '25,50,100').split(',') if n]
+    MODEL_SEARCH_DEPTHS = [int(n) for n in os.getenv('MODEL_SEARCH_DEPTHS', '6,10,14').split(',') if n]
+    MODEL_SEARCH_GB_ITERATIONS = [int(n) for n in os.getenv('MODEL_SEARCH_GB_ITERATIONS', '50,150').split(',') if n]  # '' skips HistGradientBoosting
+    MODEL_SEARCH_FOLDS = int(os.getenv('MODEL_SEARCH_FOLDS', '3'))
+    MODEL_SEARCH_PROCESSES = int(os.getenv('MODEL_SEARCH_PROCESSES', str(os.cpu_count() or 1)))
+    MODEL_SEARCH_TOLERANCE = float(os.getenv('MODEL_SEARCH_TOLERANCE', '0.02'))  # Allowed CV MAE above the best
+    MODEL_SEARCH_TARGET_MAE = float(os.environ['MODEL_SEARCH_TARGET_MAE']) if os.getenv('MODEL_SEARCH_TARGET_MAE') else None  # Absolute target instead
+    MODEL_SEARCH_LATENCY_BATCH = int(os.getenv('MODEL_SEARCH_LATENCY_BATCH', '50'))  # Rows per scoring call when timing
+
+    # Production serving: gunicorn -c gunicorn.conf.py app:app (services are built once, before fork)
+    SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', str(2 * (os.cpu_count() or 1) + 1)))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', '4'))  # Request threads per worker
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', '10000'))  # Recycle a worker after this many; 0 never
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', '1000'))  # So workers don't recycle together
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', '120'))  # A silent worker is killed after this many seconds
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))  # Time to finish requests on recycle
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', '5'))
+    # False under a preloading server, whose master must not own threads; each worker starts them after fork
+    BACKGROUND_WORKERS_ON_IMPORT = os.getenv('BACKGROUND_WORKERS_ON_IMPORT', 'true').lower() == 'true'
+    # 'background': serve at once and build services (model included) in a thread, /api/health/ready says when done;
+    # 'eager': build them before serving. gunicorn.conf.py defaults to eager, so the master builds them once for all workers
+    WARM_UP = os.getenv('WARM_UP', 'background')
+
+    # Observability
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    METRICS_DIR = os.getenv('METRICS_DIR', 'cache/metrics')  # Per-worker snapshots merged by /api/metrics; '' disables
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))  # Seconds between snapshots
+    PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', 'false').lower() == 'true'  # Allow ?profile=1 on any route
+
+    # Synthetic data
+    MOCK_SEED = int(os.environ['MOCK_SEED']) if os.getenv('MOCK_SEED') else None  # Fixed seed for reproducible mock leads
+    MOCK_REALISTIC = os.getenv('MOCK_REALISTIC', 'false').lower() == 'true'  # Weighted states, domains, name keywords, sizes
+    MOCK_TRAINING_LEADS = int(os.getenv('MOCK_TRAINING_LEADS', '1000'))  # Synthetic leads the bootstrap model is trained on
@@ -0,0 +1,55 @@
+"""Production server settings: gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master (preload_app), which also builds
+its services (WARM_UP=eager, the default here): the scoring model,
+identity Bloom filter and lead store exist once and are shared
+copy-on-write by every worker, and the model is loaded or trained and
+the store seeded by one process rather than raced for by all of them.
+WARM_UP=background trades that for a fast start: workers serve right
+after the fork and each builds its own services in a thread, with
+/api/health/ready turning 200 when done (the identity Bloom filter is
+file-backed, so workers share it in either mode). Background threads are started
+per worker after the fork, and workers are recycled after a jittered
+number of requests, finishing what they are serving first.
+"""
+import gc
+import os
+from config import Config
+
+# The master at most builds services; threads started there wouldn't survive into the workers
+Config.BACKGROUND_WORKERS_ON_IMPORT = False
+Config.WARM_UP = os.getenv('WARM_UP', 'eager')
+
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+# gthread, so streaming responses and slow crawls don't tie up a whole worker, but recycled without dropping requests
+worker_class = 'utils.gunicorn_worker.RecyclingThreadWorker'
+threads = Config.SERVER_THREADS
+preload_app = True
+max_requests = Config.SERVER_MAX_REQUESTS
+max_requests_jitter = Config.SERVER_MAX_REQUESTS_JITTER
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = Config.SERVER_KEEPALIVE
+
+
+def on_starting(server):
+    from utils.metrics import REGISTRY
+    REGISTRY.reset_directory()  # Snapshots and archived totals of the previous run's workers
+
+
+def when_ready(server):
+    # Everything the preloaded app allocated moves to the permanent generation, so collections
+    # in the workers never write to (and un-share) those pages
+    gc.freeze()
+    server.log.info("Preloaded app frozen for copy-on-write sharing; forking %s workers", workers)
+
+
+def post_fork(server, worker):
+    from app import start_background_workers
+    start_background_workers()
+
+
+def worker_exit(server, worker):
+    from app import stop_background_workers
+    stop_background_workers()
@@ -0,0 +1,381 @@
+from typing import Callable, List, Optional, Sequence, Union
+import json
+import os
+import numpy as np
+from models import BaseLead
+
+# Columnar (struct-of-arrays) lead container. Columns follow the Arrow memory
+# layout without depending on pyarrow: free text is one UTF-8 byte buffer plus
+# row offsets, low-cardinality strings are dictionary encoded, and numbers are
+# plain NumPy arrays. Nulls are tracked with a validity mask.
+
+# Bytes str.strip() treats as whitespace within ASCII (includes \x1c-\x1f)
+_ASCII_SPACE = np.zeros(256, dtype=bool)
+_ASCII_SPACE[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
+_ASCII_LOWER = np.arange(256, dtype=np.uint8)
+_ASCII_LOWER[65:91] += 32
+
+
+def _segment_sums(offsets: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Count the True bytes of ``mask`` inside every [offsets[i], offsets[i+1]) span"""
+    cum = np.zeros(len(mask) + 1, dtype=np.int64)
+    np.cumsum(mask, out=cum[1:])
+    return cum[offsets[1:]] - cum[offsets[:-1]]
+
+
+class StringColumn:
+    """UTF-8 strings stored as one contiguous byte buffer plus row offsets"""
+    __slots__ = ('data', 'offsets', 'valid')
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, valid: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> 'StringColumn':
+        encoded = [value.encode() if value is not None else b'' for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        valid = np.fromiter((value is not None for value in values), dtype=bool, count=len(encoded))
+        return cls(data, offsets, valid)
+
+    @classmethod
+    def from_ints(cls, values: np.ndarray) -> 'StringColumn':
+        """Decimal text of non-negative integers, formatted without str() per row"""
+        values = np.asarray(values, dtype=np.int64)
+        n_digits = np.ones(len(values), dtype=np.int64)
+        limit = 10
+        while len(values) and limit <= values.max():
+            n_digits += values >= limit
+            limit *= 10
+        width = int(n_digits.max()) if len(values) else 1
+        powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+        digits = (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(n_digits, out=offsets[1:])
+        data = digits[np.arange(width) >= width - n_digits[:, None]]
+        return cls(data, offsets, np.ones(len(values), dtype=bool))
+
+    @classmethod
+    def concat(cls, parts: Sequence[Union['StringColumn', str]]) -> 'StringColumn':
+        """Row-wise concatenation of columns and constant strings"""
+        columns = [part for part in parts if isinstance(part, StringColumn)]
+        n = len(columns[0])
+        constant_length = sum(len(part.encode()) for part in parts if not isinstance(part, StringColumn))
+        lengths = sum(np.diff(part.offsets) for part in columns) + constant_length
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        data = np.empty(offsets[-1], dtype=np.uint8)
+        cursor = offsets[:-1].copy()
+        for part in parts:
+            if isinstance(part, StringColumn):
+                part_lengths = np.diff(part.offsets)
+                data[np.repeat(cursor - part.offsets[:-1], part_lengths) + np.arange(len(part.data))] = part.data
+                cursor += part_lengths
+            elif part:
+                # Constants are written straight into place, without first repeating them into a column
+                pattern = np.frombuffer(part.encode(), dtype=np.uint8)
+                data[cursor[:, None] + np.arange(len(pattern))] = pattern
+                cursor += len(pattern)
+        valid = np.logical_and.reduce([part.valid for part in columns])
+        return cls(data, offsets, valid)
+
+    @classmethod
+    def stack(cls, columns: Sequence['StringColumn']) -> 'StringColumn':
+        """Rows of several columns, one after another"""
+        bases = np.cumsum([0] + [len(column.data) for column in columns[:-1]])
+        offsets = np.concatenate([[0]] + [column.offsets[1:] + base for column, base in zip(columns, bases)])
+        return cls(np.concatenate([column.data for column in columns]), offsets.astype(np.int64),
+                   np.concatenate([column.valid for column in columns]))
+
+    def take(self, indices: np.ndarray) -> 'StringColumn':
+        """Rows at ``indices``, gathered into a new buffer"""
+        lengths = np.diff(self.offsets)[indices]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        source = np.repeat(self.offsets[:-1][indices] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(self.data[source], offsets, self.valid[indices])
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if not self.valid[i]:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+    def to_list(self) -> List[Optional[str]]:
+        buffer = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        return [
+            buffer[start:end].decode() if valid else None
+            for start, end, valid in zip(bounds, bounds[1:], self.valid.tolist())
+        ]
+
+    def is_ascii(self) -> bool:
+        return not len(self.data) or self.data.max() < 0x80
+
+    def lengths(self) -> np.ndarray:
+        """len() of every row in code points (0 for nulls)"""
+        if self.is_ascii():
+            return np.diff(self.offsets)
+        return _segment_sums(self.offsets, (self.data & 0xC0) != 0x80)
+
+    def non_ascii(self) -> np.ndarray:
+        """Rows containing any non-ASCII byte"""
+        if self.is_ascii():
+            return np.zeros(len(self), dtype=bool)
+        return _segment_sums(self.offsets, self.data >= 0x80) > 0
+
+    def ascii_lower(self) -> 'StringColumn':
+        """Copy with A-Z folded to a-z; non-ASCII bytes are left untouched"""
+        return StringColumn(_ASCII_LOWER[self.data], self.offsets, self.valid)
+
+    def contains(self, needle: str) -> np.ndarray:
+        """Rows containing ``needle`` as a substring (case-sensitive)"""
+        pattern = np.frombuffer(needle.encode(), dtype=np.uint8)
+        found = np.zeros(len(self), dtype=bool)
+        if len(pattern) == 0:
+            found[:] = True
+            return found
+        if len(self.data) < len(pattern):
+            return found
+
+        candidates = np.flatnonzero(self.data[:len(self.data) - len(pattern) + 1] == pattern[0])
+        for j in range(1, len(pattern)):
+            candidates = candidates[self.data[candidates + j] == pattern[j]]
+
+        # Matches straddling two rows are artifacts of the shared buffer
+        rows = np.searchsorted(self.offsets, candidates, side='right') - 1
+        within_row = candidates + len(pattern) <= self.offsets[rows + 1]
+        found[rows[within_row]] = True
+        return found
+
+    def last_field(self, sep: str, strip: bool = False):
+        """Byte spans after the last ``sep`` in every row, plus which rows contain it.
+
+        Rows without ``sep`` span the whole row, like ``s.split(sep)[-1]``.
+        """
+        positions = np.flatnonzero(self.data == ord(sep))
+        rows = np.searchsorted(self.offsets, positions, side='right') - 1
+        start = self.offsets[:-1].copy()
+        end = self.offsets[1:].copy()
+        has_sep = np.zeros(len(self), dtype=bool)
+        if len(positions):
+            last = np.append(rows[1:] != rows[:-1], True)
+            has_sep[rows[last]] = True
+            start[rows[last]] = positions[last] + 1
+        if strip:
+            self._strip_spans(start, end)
+        return start, end, has_sep
+
+    def _strip_spans(self, start: np.ndarray, end: np.ndarray):
+        """Shrink spans in place past leading/trailing ASCII whitespace"""
+        for bound, step in ((start, 1), (end, -1)):
+            active = np.flatnonzero(start < end)
+            while len(active):
+                edge = bound[active] if step == 1 else bound[active] - 1
+                hit = _ASCII_SPACE[self.data[edge]]
+                active = active[hit]
+                bound[active] += step
+                active = active[start[active] < end[active]]
+
+    def spans_to_dict(self, start: np.ndarray, end: np.ndarray) -> 'DictColumn':
+        """Dictionary-encode the byte spans [start, end) of every row"""
+        lengths = end - start
+        width = max(int(lengths.max()) if len(lengths) else 0, 1)
+        cols = np.arange(width)
+        mask = cols < lengths[:, None]
+        matrix = np.zeros((len(lengths), width), dtype=np.uint8)
+        matrix[mask] = self.data[(start[:, None] + cols)[mask]]
+        uniques, codes = np.unique(matrix.view(f'S{width}').ravel(), return_inverse=True)
+        return DictColumn(codes.astype(np.int32), [value.decode() for value in uniques])
+
+
+class DictColumn:
+    """Dictionary-encoded column: integer codes into a small list of categories"""
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes: np.ndarray, categories: list):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values: Sequence) -> 'DictColumn':
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in values),
+            dtype=np.int32, count=len(values)
+        )
+        return cls(codes, list(index))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int):
+        return self.categories[self.codes[i]]
+
+    def to_list(self) -> list:
+        lookup = np.empty(len(self.categories), dtype=object)
+        lookup[:] = self.categories
+        return lookup[self.codes].tolist()
+
+    @classmethod
+    def stack(cls, columns: Sequence['DictColumn']) -> 'DictColumn':
+        """Rows of several columns, one after another, over the union of their categories"""
+        index, parts = {}, []
+        for column in columns:
+            remap = np.array([index.setdefault(value, len(index)) for value in column.categories], dtype=np.int32)
+            parts.append(remap[column.codes] if len(remap) else column.codes)
+        return cls(np.concatenate(parts).astype(np.int32), list(index))
+
+    def take(self, indices: np.ndarray) -> 'DictColumn':
+        return DictColumn(self.codes[indices], self.categories)
+
+    def map(self, fn: Callable) -> 'DictColumn':
+        """Apply ``fn`` once per category instead of once per row"""
+        return DictColumn(self.codes, [fn(value) for value in self.categories])
+
+    def with_default(self, mask: np.ndarray, value) -> 'DictColumn':
+        """Copy with the rows selected by ``mask`` set to ``value``"""
+        codes = self.codes.copy()
+        codes[mask] = len(self.categories)
+        return DictColumn(codes, self.categories + [value])
+
+    def with_values(self, rows: np.ndarray, values: list) -> 'DictColumn':
+        """Copy with ``rows`` overwritten by the matching ``values``"""
+        codes = self.codes.copy()
+        codes[rows] = np.arange(len(self.categories), len(self.categories) + len(values))
+        return DictColumn(codes, self.categories + list(values))
+
+
+class IntColumn:
+    """Integer values with a validity mask for nulls"""
+    __slots__ = ('values', 'valid')
+
+    def __init__(self, values: np.ndarray, valid: np.ndarray = None):
+        self.values = values
+        self.valid = valid if valid is not None else np.ones(len(values), dtype=bool)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[int]]) -> 'IntColumn':
+        n = len(values)
+        valid = np.fromiter((value is not None for value in values), dtype=bool, count=n)
+        data = np.fromiter((value or 0 for value in values), dtype=np.int64, count=n)
+        return cls(data, valid)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, i: int) -> Optional[int]:
+        return int(self.values[i]) if self.valid[i] else None
+
+    def to_list(self) -> List[Optional[int]]:
+        return [value if valid else None for value, valid in zip(self.values.tolist(), self.valid.tolist())]
+
+    @classmethod
+    def stack(cls, columns: Sequence['IntColumn']) -> 'IntColumn':
+        """Rows of several columns, one after another"""
+        return cls(np.concatenate([column.values for column in columns]),
+                   np.concatenate([column.valid for column in columns]))
+
+    def take(self, indices: np.ndarray) -> 'IntColumn':
+        return IntColumn(self.values[indices], self.valid[indices])
+
+
+class LeadBatch:
+    """Struct-of-arrays view of many BaseLeads, one column per field"""
+    FIELDS = (
+        'company', 'industry', 'address', 'bbb_rating', 'phone', 'website',
+        'employees', 'revenue', 'business_type', 'source',
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, company: StringColumn, industry: DictColumn, address: StringColumn,
+                 bbb_rating: DictColumn, phone: StringColumn, website: StringColumn,
+                 employees: IntColumn, revenue: DictColumn, business_type: DictColumn,
+                 source: DictColumn):
+        self.company = company
+        self.industry = industry
+        self.address = address
+        self.bbb_rating = bbb_rating
+        self.phone = phone
+        self.website = website
+        self.employees = employees
+        self.revenue = revenue
+        self.business_type = business_type
+        self.source = source
+
+    @classmethod
+    def from_leads(cls, leads: Sequence[BaseLead]) -> 'LeadBatch':
+        return cls(
+            company=StringColumn.from_values([lead.company for lead in leads]),
+            industry=DictColumn.from_values([lead.industry for lead in leads]),
+            address=StringColumn.from_values([lead.address for lead in leads]),
+            bbb_rating=DictColumn.from_values([lead.bbb_rating for lead in leads]),
+            phone=StringColumn.from_values([lead.phone for lead in leads]),
+            website=StringColumn.from_values([lead.website for lead in leads]),
+            employees=IntColumn.from_values([lead.employees for lead in leads]),
+            revenue=DictColumn.from_values([lead.revenue for lead in leads]),
+            business_type=DictColumn.from_values([lead.business_type for lead in leads]),
+            source=DictColumn.from_values([lead.source for lead in leads]),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence['LeadBatch']) -> 'LeadBatch':
+        """One batch holding the rows of ``batches`` in order"""
+        return cls(*(
+            type(getattr(batches[0], field)).stack([getattr(batch, field) for batch in batches])
+            for field in cls.FIELDS
+        ))
+
+    def save(self, directory: str):
+        """Write the batch as a directory of .npy arrays (one per column buffer) plus meta.json"""
+        os.makedirs(directory, exist_ok=True)
+        meta = {'rows': len(self), 'columns': {}}
+        for field in self.FIELDS:
+            column = getattr(self, field)
+            kind = _COLUMN_KINDS[type(column)]
+            meta['columns'][field] = {'kind': kind}
+            if kind == 'dict':
+                meta['columns'][field]['categories'] = column.categories
+            for name in _COLUMN_ARRAYS[kind]:
+                np.save(os.path.join(directory, f"{field}.{name}.npy"), getattr(column, name))
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'LeadBatch':
+        """Read a batch written by save(); arrays are memory-mapped unless ``mmap`` is False"""
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        columns = []
+        for field in cls.FIELDS:
+            spec = meta['columns'][field]
+            arrays = [np.load(os.path.join(directory, f"{field}.{name}.npy"), mmap_mode='r' if mmap else None)
+                      for name in _COLUMN_ARRAYS[spec['kind']]]
+            if spec['kind'] == 'dict':
+                arrays.append(spec['categories'])
+            columns.append(_COLUMN_TYPES[spec['kind']](*arrays))
+        return cls(*columns)
+
+    def __len__(self) -> int:
+        return len(self.company)
+
+    def take(self, indices) -> 'LeadBatch':
+        """New batch holding the rows at ``indices``, in that order"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return LeadBatch(*(getattr(self, field).take(indices) for field in self.FIELDS))
+
+    def to_leads(self) -> List[BaseLead]:
+        """Materialize BaseLead objects (new ids and timestamps are assigned)"""
+        # FIELDS mirrors BaseLead's declaration order, so rows map positionally
+        columns = [getattr(self, field).to_list() for field in self.FIELDS]
+        return [BaseLead(*row) for row in zip(*columns)]
+
+
+_COLUMN_TYPES = {'string': StringColumn, 'dict': DictColumn, 'int': IntColumn}
+_COLUMN_KINDS = {column_type: kind for kind, column_type in _COLUMN_TYPES.items()}
+_COLUMN_ARRAYS = {'string': ('data', 'offsets', 'valid'), 'dict': ('codes',), 'int': ('values', 'valid')}
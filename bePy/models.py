@@ -1,10 +1,48 @@
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict
+from typing import Optional, List
 from datetime import datetime
-import uuid
+import msgspec
+import os
+import threading
+import time
 
-@dataclass
-class BaseLead:
+# Leads are msgspec Structs: slotted (no per-instance __dict__), untracked by
+# the GC, and encoded straight to JSON by utils.serialization without any
+# intermediate dicts. Nothing in a lead can reference the lead itself, so
+# gc=False is safe. Every field is encoded, null or not, so the response
+# schema doesn't depend on which fields a lead happens to have.
+
+_id_lock = threading.Lock()
+_id_pool = b''
+_id_offset = 0
+_timestamp_cache = (0, '')
+
+
+def new_lead_id() -> str:
+    """Random (version 4) UUID string, formatted from a pooled urandom buffer"""
+    global _id_pool, _id_offset
+    with _id_lock:
+        if _id_offset >= len(_id_pool):
+            _id_pool = os.urandom(16 * 4096)
+            _id_offset = 0
+        raw = _id_pool[_id_offset:_id_offset + 16]
+        _id_offset += 16
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+def now_iso() -> str:
+    """ISO timestamp to the millisecond, formatted once per millisecond and shared"""
+    global _timestamp_cache
+    now = time.time()
+    tick = int(now * 1000)
+    cached_tick, cached = _timestamp_cache
+    if tick != cached_tick:
+        cached = datetime.fromtimestamp(tick / 1000).isoformat(timespec='milliseconds')
+        _timestamp_cache = (tick, cached)
+    return cached
+
+
+class BaseLead(msgspec.Struct, gc=False):
     """Base lead data from initial search"""
     company: str  # NO DEFAULT - REQUIRED FIELD
     industry: Optional[str] = None
@@ -16,25 +54,24 @@ class BaseLead:
     revenue: Optional[str] = None    # ADD THIS LINE
     business_type: Optional[str] = None  # ADD THIS LINE
     source: str = "mock"
-    id: str = None
-    created_at: str = None
+    id: Optional[str] = None
+    created_at: Optional[str] = None
     
     def __post_init__(self):
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = new_lead_id()
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = now_iso()
 
-@dataclass
-class OwnerInfo:
+class OwnerInfo(msgspec.Struct, gc=False):
     """Owner/Decision maker contact information"""
     name: Optional[str] = None
     email: Optional[str] = None
-    linkedin: Optional[str] = None
+    linkedin_url: Optional[str] = None
     title: Optional[str] = None
+    phone: Optional[str] = None
 
-@dataclass
-class EnrichedLead:
+class EnrichedLead(msgspec.Struct, gc=False):
     """Enriched lead with additional data"""
     company: str  # NO DEFAULT - REQUIRED
     industry: Optional[str] = None
@@ -48,13 +85,18 @@ class EnrichedLead:
     tags: Optional[List[str]] = None
     is_enriched: bool = False
     owner_info: Optional[OwnerInfo] = None
-    id: str = None  # MOVE TO END
-    created_at: str = None  # MOVE TO END
+    source: str = "mock"
+    founded_year: Optional[int] = None
+    company_linkedin: Optional[str] = None
+    activity_score: Optional[float] = None
+    enriched_at: Optional[str] = None
+    id: Optional[str] = None  # MOVE TO END
+    created_at: Optional[str] = None  # MOVE TO END
     
     def __post_init__(self):
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = new_lead_id()
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = now_iso()
         if self.tags is None:
-            self.tags = []
\ No newline at end of file
+            self.tags = []
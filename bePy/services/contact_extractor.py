@@ -0,0 +1,194 @@
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+from models import OwnerInfo
+
+# Patterns run over raw page bytes, so tags and attributes (mailto:, href=)
+# are scanned too. Compiled once at import. Emails and owner names are only
+# matched in a small window around a cheap literal trigger ('@' or a job
+# title found with bytes.find), which keeps the scan close to memchr speed.
+EMAIL_PATTERN = re.compile(rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+EMAIL_LOCAL_CHARS = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-')
+PHONE_PATTERN = re.compile(rb'[2-9]\d{2}\)?[\s.-]\d{3}[\s.-]\d{4}(?![\d-])')
+PHONE_PREFIX = re.compile(rb'(?:\+?1[\s.-]?)?\(?\Z')
+LINKEDIN_PATTERN = re.compile(rb'https?://(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|company)/[A-Za-z0-9_%-]+')
+OWNER_TITLES = (b'Co-Founder', b'Founder', b'CEO', b'Owner', b'President', b'Managing Director', b'Principal')
+NAME = rb'[A-Z][a-z]+(?: [A-Z]\.)? [A-Z][a-z]+(?:-[A-Z][a-z]+)?'
+OWNER_BEFORE_TITLE = re.compile(
+    rb'(?P<name>' + NAME + rb')\s*(?:,|-|\xe2\x80\x93|\||</[a-z0-9]+>\s*<[a-z0-9]+[^>]*>)\s*\Z'
+)
+OWNER_AFTER_TITLE = re.compile(rb'\s*(?::|,|-|\xe2\x80\x93)\s*(?P<name>' + NAME + rb')\b')
+# Asset names like logo@2x.png look like emails
+IGNORED_EMAIL_SUFFIXES = (b'.png', b'.jpg', b'.jpeg', b'.gif', b'.svg', b'.webp', b'.css', b'.js')
+OWNER_WINDOW = 96
+
+KINDS = ('email', 'phone', 'linkedin', 'owner')
+
+
+def _find_emails(buffer: bytes, pos: int) -> Iterator[Tuple[int, int, object]]:
+    at = buffer.find(b'@', pos)
+    while at != -1:
+        start = at
+        while start > pos and buffer[start - 1] in EMAIL_LOCAL_CHARS:
+            start -= 1
+        match = EMAIL_PATTERN.search(buffer, start, min(len(buffer), at + 256))
+        if match is not None and match.start() <= at < match.end():
+            email = match.group()
+            if not email.lower().endswith(IGNORED_EMAIL_SUFFIXES):
+                yield match.start(), match.end(), email.decode('ascii', 'ignore')
+            at = buffer.find(b'@', match.end())
+        else:
+            at = buffer.find(b'@', at + 1)
+
+
+def _find_phones(buffer: bytes, pos: int) -> Iterator[Tuple[int, int, object]]:
+    for match in PHONE_PATTERN.finditer(buffer, pos):
+        start = match.start()
+        if start > 0 and buffer[start - 1:start].isdigit():
+            continue
+        prefix = PHONE_PREFIX.search(buffer, max(pos, start - 4), start)
+        if prefix is not None:
+            start = prefix.start()
+        yield start, match.end(), buffer[start:match.end()].decode('ascii', 'ignore').strip()
+
+
+def _find_linkedin(buffer: bytes, pos: int) -> Iterator[Tuple[int, int, object]]:
+    for match in LINKEDIN_PATTERN.finditer(buffer, pos):
+        yield match.start(), match.end(), match.group().decode('ascii', 'ignore')
+
+
+def _find_owners(buffer: bytes, pos: int) -> Iterator[Tuple[int, int, object]]:
+    hits = []
+    for title in OWNER_TITLES:
+        at = buffer.find(title, pos)
+        while at != -1:
+            end = at + len(title)
+            # Whole words only ("Founder" inside "Co-Founder" is handled by its own entry)
+            whole_word = (at == 0 or not buffer[at - 1:at].isalpha()) and not buffer[end:end + 1].isalpha()
+            if whole_word and buffer[max(0, at - 3):at] != b'Co-':
+                before = OWNER_BEFORE_TITLE.search(buffer, max(pos, at - OWNER_WINDOW), at)
+                if before is not None:
+                    hits.append((before.start(), end, (before.group('name'), title)))
+                else:
+                    after = OWNER_AFTER_TITLE.match(buffer, end, min(len(buffer), end + OWNER_WINDOW))
+                    if after is not None:
+                        hits.append((at, after.end(), (after.group('name'), title)))
+            at = buffer.find(title, end)
+    hits.sort()
+    for start, end, (name, title) in hits:
+        yield start, end, (name.decode('utf-8', 'ignore'), title.decode('utf-8', 'ignore'))
+
+
+FINDERS = {'email': _find_emails, 'phone': _find_phones,
+           'linkedin': _find_linkedin, 'owner': _find_owners}
+
+
+class ContactExtractor:
+    """Incremental contact scanner over raw HTML bytes.
+
+    Feed chunks as they arrive; each is scanned once with precompiled
+    patterns, keeping a small overlap so matches that straddle a chunk
+    boundary are still found. Scanning stops once every kind of contact has
+    been seen or ``max_hits`` candidates have been collected.
+    """
+
+    OVERLAP = 256  # Longer than any single match we care about
+
+    def __init__(self, max_hits: int = 10):
+        self.max_hits = max_hits
+        self.emails: List[str] = []
+        self.phones: List[str] = []
+        self.linkedin_urls: List[str] = []
+        self.owners: List[Tuple[str, str]] = []  # (name, title)
+        self._buckets = {'email': self.emails, 'phone': self.phones,
+                         'linkedin': self.linkedin_urls, 'owner': self.owners}
+        self._seen = set()
+        self._resume = {}
+        self._tail = b''
+        self.bytes_scanned = 0
+
+    @property
+    def hit_count(self) -> int:
+        return len(self.emails) + len(self.phones) + len(self.linkedin_urls) + len(self.owners)
+
+    @property
+    def done(self) -> bool:
+        if self.hit_count >= self.max_hits:
+            return True
+        return bool(self.emails and self.phones and self.linkedin_urls and self.owners)
+
+    def feed(self, chunk: bytes) -> Iterator[Tuple[str, object]]:
+        """Scan one chunk, yielding (kind, value) for each new candidate"""
+        if self.done or not chunk:
+            return
+        buffer = self._tail + chunk
+        self.bytes_scanned += len(chunk)
+        # Matches starting in the last OVERLAP bytes may be cut off; they are
+        # deferred and seen whole when that tail is rescanned with the next chunk
+        cutoff = max(0, len(buffer) - self.OVERLAP)
+        self._tail = buffer[cutoff:]
+        yield from self._scan(buffer, cutoff)
+
+    def close(self) -> Iterator[Tuple[str, object]]:
+        """Scan whatever is left in the overlap once the page has ended"""
+        buffer, self._tail = self._tail, b''
+        if buffer and not self.done:
+            yield from self._scan(buffer, len(buffer))
+
+    def _scan(self, buffer: bytes, cutoff: int) -> Iterator[Tuple[str, object]]:
+        for kind in KINDS:
+            # Skip the remainder of a match already accepted from the previous buffer
+            resume_at = self._resume.get(kind, 0)
+            furthest_end = resume_at
+            for start, end, value in FINDERS[kind](buffer, resume_at):
+                if start >= cutoff:
+                    break
+                furthest_end = max(furthest_end, end)
+                yield from self._add(kind, value)
+                if self.done:
+                    return
+            self._resume[kind] = max(0, furthest_end - cutoff)
+
+    def _add(self, kind: str, value) -> Iterator[Tuple[str, object]]:
+        key = (kind, value.lower() if isinstance(value, str) else value)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self._buckets[kind].append(value)
+        yield kind, value
+
+    def owner_info(self) -> Optional[OwnerInfo]:
+        """Best single contact found so far, or None if nothing was found"""
+        if not (self.emails or self.phones or self.linkedin_urls or self.owners):
+            return None
+        personal = [url for url in self.linkedin_urls if '/in/' in url]
+        name, title = self.owners[0] if self.owners else (None, None)
+        return OwnerInfo(
+            name=name,
+            email=self.emails[0] if self.emails else None,
+            linkedin_url=(personal or self.linkedin_urls or [None])[0],
+            title=title,
+            phone=self.phones[0] if self.phones else None,
+        )
+
+
+def extract_owner_info(content, max_hits: int = 10, chunk_size: int = 64 * 1024) -> Optional[OwnerInfo]:
+    """One-shot extraction from a whole page (bytes or str)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'ignore')
+    return extract_from_chunks(
+        (content[start:start + chunk_size] for start in range(0, len(content), chunk_size)),
+        max_hits=max_hits
+    )
+
+
+def extract_from_chunks(chunks: Iterable[bytes], max_hits: int = 10) -> Optional[OwnerInfo]:
+    """Extraction over a chunk iterator, stopping as soon as the extractor is done"""
+    extractor = ContactExtractor(max_hits=max_hits)
+    for chunk in chunks:
+        for _ in extractor.feed(chunk):
+            pass
+        if extractor.done:
+            break
+    for _ in extractor.close():
+        pass
+    return extractor.owner_info()
@@ -1,34 +1,69 @@
 from .mock_data_service import MockDataService  
 from .semantic_tagging_service import SemanticTaggingService
 from models import BaseLead, EnrichedLead
+from lead_batch import LeadBatch
 from .scoring import MLScoringService
-from typing import List
+from .identity_index import IdentityIndex
+from .lead_store import LeadStore
+from config import Config
+from typing import List, Optional
+import logging
 import random
 
+logger = logging.getLogger(__name__)
+
 class EnhancedMockService(MockDataService):
     def __init__(self):
         super().__init__()
         self.ml_scorer = MLScoringService()
         self.semantic_tagger = SemanticTaggingService()
+        self.identity_index = IdentityIndex()
         self._ensure_model_trained()
     
     def _ensure_model_trained(self):
-        """Ensure ML model is trained"""
-        if not self.ml_scorer.is_trained:
-            print("Training ML model with synthetic data...")
-            training_leads = super().generate_leads(1000)  # Generate lots of training data
-            self.ml_scorer.train_model(training_leads)
+        """Load the saved model, training one only if no valid artifact exists"""
+        if not self.ml_scorer.is_trained and not self.ml_scorer.load_model():
+            logger.info("Training ML model with synthetic data")
+            self.ml_scorer.train_model(self.generate_batch(Config.MOCK_TRAINING_LEADS))
     
-    def generate_leads(self, count: int = 50) -> List[BaseLead]:
+    def generate_leads(self, count: int = 50, start: int = 0) -> List[BaseLead]:
         """Generate leads with ML scoring and semantic tags"""
-        leads = super().generate_leads(count)
+        batch = super().generate_leads(count, columnar=True, start=start)
+        leads = batch.to_leads()
+        unique = self._assign_identities(leads)
+        if len(unique) < len(leads):
+            leads = [leads[i] for i in unique]
+            batch = batch.take(unique)
+        
+        enhanced_leads = self._score_leads(leads, batch)
+        tags_per_lead = self.semantic_tagger.generate_semantic_tags_batch(leads)
+        for enhanced_lead, semantic_tags in zip(enhanced_leads, tags_per_lead):
+            enhanced_lead.tags = semantic_tags
+        
+        logger.debug("Generated %d leads with ML scoring and semantic tagging", count)
+        return enhanced_leads
+    
+    def seed_store(self, store: LeadStore, count: int, chunk_size: int = 10000) -> int:
+        """Generate, score and tag ``count`` distinct leads into ``store``, one chunk in memory at a time"""
+        written = 0
+        for start in range(0, count, chunk_size):
+            written += store.upsert_many(self.generate_leads(min(chunk_size, count - start), start=start))
+        store.optimize()
+        return written
+    
+    def _assign_identities(self, leads: List[BaseLead]) -> List[int]:
+        """Give leads their stable ids; returns the positions of the first lead of each company"""
+        ids = self.identity_index.resolve_many(leads)
+        for lead, lead_id in zip(leads, ids):
+            lead.id = lead_id
+        return IdentityIndex.group(ids)[0]
+    
+    def _score_leads(self, leads: List[BaseLead], batch: Optional[LeadBatch] = None) -> List[EnrichedLead]:
+        """Wrap base leads as untagged EnrichedLeads with one batched model call"""
+        ml_scores = self.ml_scorer.predict_scores(batch if batch is not None else leads)
         
         enhanced_leads = []
-        for lead in leads:
-            ml_score = self.ml_scorer.predict_score(lead)
-            
-            semantic_tags = self.semantic_tagger.generate_semantic_tags(lead)
-            
+        for lead, ml_score in zip(leads, ml_scores):
             enhanced_lead = EnrichedLead(
                 id=lead.id,
                 company=lead.company,
@@ -40,11 +75,9 @@ class EnhancedMockService(MockDataService):
                 revenue=getattr(lead, 'revenue', None),
                 business_type=getattr(lead, 'business_type', None),
                 fit_score=ml_score,
-                tags=semantic_tags,
                 is_enriched=False
             )
             
             enhanced_leads.append(enhanced_lead)
         
-        print(f"Generated {count} leads with ML scoring and semantic tagging")
-        return enhanced_leads
\ No newline at end of file
+        return enhanced_leads
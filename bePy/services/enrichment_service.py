@@ -1,26 +1,339 @@
-from typing import List
-from models import BaseLead, EnrichedLead
-from .scoring import MLScoringService  # CHANGE THIS LINE
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+import msgspec
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from config import Config
+from models import BaseLead, EnrichedLead, OwnerInfo, now_iso
+from utils.metrics import traced
+from .contact_extractor import ContactExtractor
+from .identity_index import IdentityIndex
+from .lead_store import LeadStore
+from .scoring import MLScoringService
+from .semantic_tagging_service import SemanticTaggingService
+from .website_crawler import WebsiteCrawler
+
+STAGES = ('normalize', 'score', 'tag', 'crawl')
+_STOP = object()  # End-of-input marker passed down the stage queues
+
+_worker_scorer = None  # Per-process scorer used by the optional scoring pool
+# Request fields read by _normalize; anything else on a record is ignored
+TEXT_FIELDS = ('company', 'industry', 'address', 'phone', 'website', 'revenue', 'business_type', 'source', 'id',
+               'created_at')
+
+
+def clean_record(record: Union[BaseLead, Dict]) -> Union[BaseLead, Dict]:
+    """A request lead with its fields coerced to the model's types; raises ValueError for ones that can't be"""
+    if isinstance(record, BaseLead):
+        return record
+    if not isinstance(record, dict):
+        raise ValueError("every lead must be an object with a company name")
+    cleaned = dict(record)
+    for field in TEXT_FIELDS:
+        value = cleaned.get(field)
+        if isinstance(value, (dict, list)):
+            raise ValueError(f"{field} must be a string")
+        if value is not None:
+            cleaned[field] = str(value)
+    employees = cleaned.get('employees')
+    if employees is not None:
+        try:
+            number = float(employees)
+            if isinstance(employees, bool) or not number.is_integer():
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("employees must be a whole number") from None
+        cleaned['employees'] = int(number)
+    if not (cleaned.get('company') or '').strip():
+        raise ValueError("every lead needs a company name")
+    return cleaned
+
+
+def _init_score_worker(model_dir: str):
+    global _worker_scorer
+    _worker_scorer = MLScoringService(model_dir=model_dir)
+    _worker_scorer.load_model()
+
+
+def _score_in_worker(leads: List[EnrichedLead]) -> List[float]:
+    return _worker_scorer.predict_scores(leads)
+
 
 class EnrichmentService:
-    def __init__(self):
-        self.scorer = MLScoringService()  # CHANGE THIS LINE
-    
-    def enrich_leads(self, base_leads: List[BaseLead]) -> List[EnrichedLead]:
-        """Basic enrichment service"""
-        enriched_leads = []
+    """Pipelined lead enrichment: normalize -> batch score -> tag -> crawl contacts.
+
+    Leads are split into chunks that flow through the stages over bounded
+    queues, so a chunk can be crawled while the next one is tagged and the one
+    after that is scored. A slow stage fills its input queue and holds the
+    earlier stages back instead of letting chunks pile up in memory.
+    """
+
+    def __init__(self, scorer: MLScoringService = None, tagger: SemanticTaggingService = None,
+                 crawler: WebsiteCrawler = None, chunk_size: int = None, queue_size: int = None,
+                 tag_workers: int = None, score_processes: int = None, crawl_contacts: bool = None,
+                 identity_index: IdentityIndex = None, lead_store: LeadStore = None):
+        self.scorer = scorer or MLScoringService()
+        self.tagger = tagger or SemanticTaggingService()
+        self.crawler = crawler or WebsiteCrawler()
+        self.identity_index = identity_index  # Optional; merges duplicates and assigns stable ids
+        self.lead_store = lead_store  # Optional; enriched leads are saved there for search
+        self.chunk_size = chunk_size or Config.ENRICH_CHUNK_SIZE
+        self.queue_size = queue_size or Config.ENRICH_QUEUE_SIZE
+        self.tag_workers = tag_workers or Config.ENRICH_TAG_WORKERS
+        self.score_processes = Config.ENRICH_SCORE_PROCESSES if score_processes is None else score_processes
+        self.crawl_contacts = Config.ENRICH_CRAWL_CONTACTS if crawl_contacts is None else crawl_contacts
+        self.mock_firmographics = Config.USE_MOCK_DATA
+        self._score_pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            stage: {'chunks': 0, 'leads': 0, 'busy_seconds': 0.0, 'blocked_seconds': 0.0}
+            for stage in STAGES
+        }
+        self.stats['runs'] = 0
+        self.stats['contacts_found'] = 0
+        self.stats['duplicates_merged'] = 0
+        self.last_run = {}
+
+    def get_stats(self) -> Dict:
+        """Cumulative per-stage counters plus the timing of the most recent run"""
+        with self._stats_lock:
+            stats = {key: dict(value) if isinstance(value, dict) else value for key, value in self.stats.items()}
+            stats['last_run'] = dict(self.last_run)
+        return stats
+
+    def enrich_leads(self, leads: List[Union[BaseLead, Dict]]) -> List[EnrichedLead]:
+        """Enrich leads (BaseLeads or raw request dicts), preserving input order.
         
-        for base_lead in base_leads:
-            # Convert BaseLead to EnrichedLead with scoring
-            enriched_lead = EnrichedLead(
-                company=base_lead.company,
-                industry=base_lead.industry,
-                website=base_lead.website,
-                phone=base_lead.phone,
-                address=base_lead.address,
-                fit_score=self.scorer.predict_score(base_lead),  # Use ML scoring
-                is_enriched=True
-            )
-            enriched_leads.append(enriched_lead)
+        With an identity index, leads that are the same company are enriched
+        once and every copy comes back with the same stable id.
+        """
+        if not leads:
+            return []
+        leads = [clean_record(record) for record in leads]
+        
+        records, ids, unique, owner = leads, [None] * len(leads), None, None
+        if self.identity_index is not None:
+            ids = self.identity_index.resolve_many(leads)
+            unique, owner = IdentityIndex.group(ids)
+            records, ids = [leads[i] for i in unique], [ids[i] for i in unique]
+        chunks = [
+            {'records': records[start:start + self.chunk_size], 'ids': ids[start:start + self.chunk_size], 'leads': None}
+            for start in range(0, len(records), self.chunk_size)
+        ]
+        stages = [
+            ('normalize', self._normalize_chunk, 1),
+            ('score', self._score_chunk, max(1, self.score_processes)),
+            ('tag', self._tag_chunk, self.tag_workers),
+            ('crawl', self._crawl_chunk, 1),
+        ]
+
+        started = time.perf_counter()
+        timings = {name: {'busy_seconds': 0.0, 'blocked_seconds': 0.0} for name, _, _ in stages}
+        if len(chunks) == 1:
+            # Nothing to overlap; skip the threads
+            for name, fn, _ in stages:
+                stage_started = time.perf_counter()
+                fn(chunks[0])
+                timings[name]['busy_seconds'] += time.perf_counter() - stage_started
+        else:
+            self._run_pipeline(chunks, stages, timings)
+        elapsed = time.perf_counter() - started
+
+        self._record_run(len(records), len(chunks), timings, elapsed)
+        enriched = [lead for chunk in chunks for lead in chunk['leads']]
+        if self.lead_store is not None:
+            self.lead_store.upsert_many(enriched)
+        if owner is None or len(unique) == len(leads):
+            return enriched
         
-        return enriched_leads
\ No newline at end of file
+        with self._stats_lock:
+            self.stats['duplicates_merged'] += len(leads) - len(unique)
+        results = []
+        for position, slot in enumerate(owner):
+            lead = enriched[slot]
+            if unique[slot] != position:
+                # Same company and id, but echo this copy's name so callers can match it up
+                lead = msgspec.structs.replace(lead, company=str(self._company_of(leads[position])).strip())
+            results.append(lead)
+        return results
+
+    def _run_pipeline(self, chunks: List[Dict], stages: List, timings: Dict):
+        """Push chunks through worker threads joined by bounded queues"""
+        inboxes = [queue.Queue(maxsize=self.queue_size) for _ in stages] + [queue.Queue()]
+        remaining = [workers for _, _, workers in stages]
+        counter_lock = threading.Lock()
+        failed = threading.Event()
+        errors = []
+
+        def work(index: int, name: str, fn):
+            inbox, outbox = inboxes[index], inboxes[index + 1]
+            downstream_workers = stages[index + 1][2] if index + 1 < len(stages) else 1
+            while True:
+                chunk = inbox.get()
+                if chunk is _STOP:
+                    with counter_lock:
+                        remaining[index] -= 1
+                        last_worker = remaining[index] == 0
+                    if last_worker:
+                        for _ in range(downstream_workers):
+                            outbox.put(_STOP)
+                    return
+                if failed.is_set():
+                    continue  # Keep draining so upstream puts never block
+                stage_started = time.perf_counter()
+                try:
+                    fn(chunk)
+                except Exception as e:
+                    errors.append(e)
+                    failed.set()
+                    continue
+                put_started = time.perf_counter()
+                outbox.put(chunk)
+                with counter_lock:
+                    timings[name]['busy_seconds'] += put_started - stage_started
+                    timings[name]['blocked_seconds'] += time.perf_counter() - put_started
+
+        threads = [
+            threading.Thread(target=work, args=(index, name, fn), name=f"enrich-{name}", daemon=True)
+            for index, (name, fn, workers) in enumerate(stages)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for chunk in chunks:
+            inboxes[0].put(chunk)
+        for _ in range(stages[0][2]):
+            inboxes[0].put(_STOP)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _record_run(self, n_leads: int, n_chunks: int, timings: Dict, elapsed: float):
+        with self._stats_lock:
+            self.stats['runs'] += 1
+            for name, timing in timings.items():
+                stage = self.stats[name]
+                stage['chunks'] += n_chunks
+                stage['leads'] += n_leads
+                stage['busy_seconds'] = round(stage['busy_seconds'] + timing['busy_seconds'], 4)
+                stage['blocked_seconds'] = round(stage['blocked_seconds'] + timing['blocked_seconds'], 4)
+            self.last_run = {
+                'leads': n_leads,
+                'chunks': n_chunks,
+                'elapsed_ms': round(elapsed * 1000, 1),
+                'leads_per_sec': round(n_leads / elapsed, 1) if elapsed else 0.0,
+                'stages': {
+                    name: {
+                        'busy_ms': round(timing['busy_seconds'] * 1000, 1),
+                        'blocked_ms': round(timing['blocked_seconds'] * 1000, 1),
+                    }
+                    for name, timing in timings.items()
+                },
+            }
+
+    @staticmethod
+    def _company_of(record: Union[BaseLead, Dict]) -> Optional[str]:
+        return record.get('company') if isinstance(record, dict) else record.company
+
+    def _normalize_chunk(self, chunk: Dict):
+        chunk['leads'] = [self._normalize(record, lead_id) for record, lead_id in zip(chunk['records'], chunk['ids'])]
+
+    def _normalize(self, record: Union[BaseLead, Dict], lead_id: str = None) -> EnrichedLead:
+        """Build the EnrichedLead shell: cleaned fields, slug and domain computed once"""
+        if not isinstance(record, dict):
+            record = {field: getattr(record, field) for field in record.__struct_fields__}
+        company = str(record.get('company')).strip()
+
+        website = (record.get('website') or '').strip()
+        if website and '://' not in website:
+            website = f"https://{website}"
+        slug = company.lower().replace(' ', '-')
+        domain = urlsplit(website).hostname if website else None
+        domain = (domain or f"{slug.replace('-', '')}.com").removeprefix('www.')
+
+        lead = EnrichedLead(
+            company=company,
+            industry=record.get('industry', 'Unknown'),
+            address=record.get('address') or '',
+            phone=record.get('phone'),
+            website=website,
+            employees=record.get('employees'),
+            revenue=record.get('revenue'),
+            business_type=record.get('business_type'),
+            source=record.get('source') or 'mock',
+            company_linkedin=f"https://linkedin.com/company/{slug}",
+            is_enriched=True,
+            enriched_at=now_iso(),
+            id=lead_id or record.get('id'),
+            created_at=record.get('created_at'),
+        )
+        if self.mock_firmographics:
+            # No firmographics provider is wired up yet; mock mode fills the gaps
+            lead.employees = lead.employees or random.randint(10, 500)
+            lead.revenue = lead.revenue or random.choice(['$1M-$5M', '$5M-$25M', '$25M+'])
+            lead.founded_year = random.randint(2010, 2020)
+            lead.activity_score = round(random.uniform(6, 10), 1)
+            lead.owner_info = OwnerInfo(
+                name=f"Contact at {company}",
+                email=f"contact@{domain}",
+                title='Business Development Manager',
+                linkedin_url=f"https://linkedin.com/in/contact-{slug}"
+            )
+        return lead
+
+    def _score_chunk(self, chunk: Dict):
+        leads = chunk['leads']
+        if self.score_processes > 0:
+            scores = self._get_score_pool().submit(_score_in_worker, leads).result()
+        else:
+            scores = self.scorer.predict_scores(leads)
+        for lead, score in zip(leads, scores):
+            lead.fit_score = score
+
+    def _get_score_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._score_pool is None:
+                # spawn, not fork: the parent is multi-threaded by the time this runs
+                self._score_pool = ProcessPoolExecutor(
+                    max_workers=self.score_processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_score_worker,
+                    initargs=(self.scorer.model_dir,)
+                )
+            return self._score_pool
+
+    def _tag_chunk(self, chunk: Dict):
+        leads = chunk['leads']
+        for lead, tags in zip(leads, self.tagger.generate_semantic_tags_batch(leads)):
+            lead.tags = tags
+
+    @traced('crawl')
+    def _crawl_chunk(self, chunk: Dict):
+        if not self.crawl_contacts:
+            return
+        leads = chunk['leads']
+        pages = self.crawler.fetch_all(
+            [lead.website for lead in leads if lead.website],
+            extractor_factory=ContactExtractor
+        )
+        found = 0
+        for lead in leads:
+            page = pages.get(lead.website)
+            if page is not None and page.ok and page.extracted is not None:
+                lead.owner_info = page.extracted
+                found += 1
+        with self._stats_lock:
+            self.stats['contacts_found'] += found
+
+    def close(self):
+        """Shut down the scoring process pool, if one was started"""
+        with self._pool_lock:
+            if self._score_pool is not None:
+                self._score_pool.shutdown(cancel_futures=True)
+                self._score_pool = None
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import threading
+import numpy as np
+from models import BaseLead
+from lead_batch import DictColumn
+
+FEATURE_COLS = [
+    'industry', 'employees', 'has_phone', 'has_website', 'website_length',
+    'company_name_length', 'address_state', 'revenue_category', 'business_type',
+    'domain_extension', 'company_name_keywords',
+]
+CATEGORICAL_COLS = ['industry', 'address_state', 'revenue_category', 'business_type', 'domain_extension']
+TECH_KEYWORDS = ('tech', 'data', 'software', 'digital', 'cloud', 'ai', 'solutions', 'systems')
+
+
+def categorize_revenue(revenue: Optional[str]) -> str:
+    """Bucket a revenue range string"""
+    if not revenue:
+        return 'Unknown'
+    if '$1M-$5M' in revenue:
+        return 'Small'
+    elif '$5M-$25M' in revenue:
+        return 'Medium'
+    elif '$25M+' in revenue:
+        return 'Large'
+    return 'Startup'
+
+
+def extract_address_state(address: Optional[str]) -> str:
+    """Last comma-separated part of the address"""
+    return address.rpartition(',')[2].strip() if address and ',' in address else 'Unknown'
+
+
+def extract_domain_extension(website: Optional[str]) -> str:
+    """Domain extension (.com, .io, etc.), lowercased"""
+    return website.rpartition('.')[2].lower() if website else 'none'
+
+
+def count_tech_keywords(company_name: str) -> int:
+    """Number of distinct technology keywords in the company name"""
+    name = company_name.lower()
+    return sum(keyword in name for keyword in TECH_KEYWORDS)
+
+
+def extract_features(lead: BaseLead) -> Dict:
+    """Model features of one lead, before encoding"""
+    return {
+        'industry': lead.industry,
+        'employees': lead.employees or 10,
+        'has_phone': 1 if lead.phone else 0,
+        'has_website': 1 if lead.website else 0,
+        'website_length': len(lead.website) if lead.website else 0,
+        'company_name_length': len(lead.company),
+        'address_state': extract_address_state(lead.address),
+        'revenue_category': categorize_revenue(getattr(lead, 'revenue', None)),
+        'business_type': getattr(lead, 'business_type', 'Unknown'),
+        'domain_extension': extract_domain_extension(lead.website),
+        'company_name_keywords': count_tech_keywords(lead.company),
+    }
+
+
+def feature_key(lead: BaseLead) -> Tuple:
+    """Exactly the lead fields extract_features reads; equal keys mean equal feature vectors"""
+    return (lead.company, lead.industry, lead.address, not lead.phone, lead.website, lead.employees,
+            lead.revenue, lead.business_type)
+
+
+class FeaturePipeline:
+    """Turns leads into the scaled feature matrix of one model version.
+
+    Built once per version from its fitted encoders and scaler: categories
+    map to codes through plain dicts and the scaler becomes two arrays, so
+    encoding never goes through LabelEncoder or pandas. Encoded rows of
+    individually scored leads are memoized in a bounded LRU keyed by the
+    lead's feature-relevant content rather than its id, so rescoring a known
+    lead is a dict lookup and an edited lead can't be served a stale vector.
+    """
+
+    def __init__(self, label_encoders: Dict, scaler, feature_cols: List[str], cache_size: int = 50000):
+        self.feature_cols = list(feature_cols)
+        self.category_maps = {
+            col: {value: code for code, value in enumerate(le.classes_)}
+            for col, le in label_encoders.items()
+        }
+        self.numerical_idx = [j for j, col in enumerate(self.feature_cols) if col not in CATEGORICAL_COLS]
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.cache_size = max(0, cache_size)
+        self._rows = np.empty((self.cache_size, len(self.feature_cols)), dtype=np.float64)
+        self._slots = OrderedDict()  # feature_key -> row in self._rows, least recently used first
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def encode(self, features: Dict[str, Union[np.ndarray, DictColumn]]) -> np.ndarray:
+        """Encode feature columns (as extract_features_batch returns them) into a scaled matrix"""
+        n_leads = len(features[self.feature_cols[0]])
+        X = np.empty((n_leads, len(self.feature_cols)), dtype=np.float64)
+        for j, col in enumerate(self.feature_cols):
+            column = features[col]
+            if col in CATEGORICAL_COLS:
+                # Encode each category once; unseen ones map to 0 like the LabelEncoder fallback
+                codes = self.category_maps.get(col, {})
+                lookup = np.array([codes.get(str(value), 0) for value in column.categories], dtype=np.float64)
+                X[:, j] = lookup[column.codes]
+            else:
+                X[:, j] = column
+        return self._scale(X)
+
+    def encode_rows(self, features_list: Sequence[Dict]) -> np.ndarray:
+        """Encode per-lead feature dicts (as extract_features returns them) into a scaled matrix"""
+        X = np.empty((len(features_list), len(self.feature_cols)), dtype=np.float64)
+        for j, col in enumerate(self.feature_cols):
+            values = [features[col] for features in features_list]
+            if col in CATEGORICAL_COLS:
+                codes = self.category_maps.get(col, {})
+                values = [codes.get(str(value), 0) for value in values]
+            X[:, j] = values
+        return self._scale(X)
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        X[:, self.numerical_idx] = (X[:, self.numerical_idx] - self.mean) / self.scale
+        return X
+
+    def transform(self, leads: Sequence[BaseLead]) -> np.ndarray:
+        """Scaled feature matrix for leads, reusing memoized rows for content seen before"""
+        keys = [feature_key(lead) for lead in leads]
+        X = np.empty((len(keys), len(self.feature_cols)), dtype=np.float64)
+        hits, slots, missing = [], [], []
+        with self._lock:
+            for i, key in enumerate(keys):
+                slot = self._slots.get(key)
+                if slot is None:
+                    missing.append(i)
+                else:
+                    self._slots.move_to_end(key)
+                    hits.append(i)
+                    slots.append(slot)
+            # Copy under the lock: a concurrent miss may evict and overwrite these slots
+            if hits:
+                X[hits] = self._rows[slots]
+            self.stats['hits'] += len(hits)
+            self.stats['misses'] += len(missing)
+        if not missing:
+            return X
+
+        encoded = self.encode_rows([extract_features(leads[i]) for i in missing])
+        X[missing] = encoded
+        if self.cache_size <= 0:
+            return X
+        with self._lock:
+            for i, row in zip(missing, encoded):
+                key = keys[i]
+                if key in self._slots:  # Repeated within the batch, or stored by another thread meanwhile
+                    continue
+                if len(self._slots) < self.cache_size:
+                    slot = len(self._slots)
+                else:
+                    _, slot = self._slots.popitem(last=False)
+                    self.stats['evictions'] += 1
+                self._rows[slot] = row
+                self._slots[key] = slot
+        return X
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._slots)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
@@ -1,11 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
+import logging
 import time
 from typing import List, Optional
 from models import BaseLead, EnrichedLead, OwnerInfo
+from .contact_extractor import ContactExtractor, extract_owner_info
+from .website_crawler import WebsiteCrawler
+
+logger = logging.getLogger(__name__)
 
 class FreeLeadScraper:
-    def __init__(self):
+    def __init__(self, crawler: WebsiteCrawler = None):
+        import requests  # Only for the one-off page fetches below
+        self.crawler = crawler or WebsiteCrawler()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -13,7 +18,7 @@ class FreeLeadScraper:
     
     def search_yellow_pages(self, query: str, location: str = "", limit: int = 20) -> List[BaseLead]:
         """Basic web scraping example (often blocked in practice)"""
-        print(f"Attempting to scrape for: {query}")
+        logger.debug("Attempting to scrape for: %s", query)
         # In practice, most sites block scraping
         # Return empty list and let app fallback to mock data
         return []
@@ -34,27 +39,47 @@ class FreeLeadScraper:
         
         try:
             response = self.session.get(lead.website, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
             
             # Try to extract basic info
-            enriched.owner_info = self._extract_contact_info(soup)
+            enriched.owner_info = self._extract_contact_info(response.content)
             
         except Exception as e:
-            print(f"Website enrichment failed for {lead.company}: {e}")
+            logger.info("Website enrichment failed for %s: %s", lead.company, e)
         
         return enriched
     
-    def _extract_contact_info(self, soup) -> Optional[OwnerInfo]:
-        """Basic contact extraction from website"""
-        try:
-            # Look for email addresses in text
-            text = soup.get_text()
-            import re
-            emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    def enrich_with_website_data_bulk(self, leads: List[BaseLead]) -> List[EnrichedLead]:
+        """Enrich many leads, fetching their websites concurrently"""
+        pages = self.crawler.fetch_all(
+            [lead.website for lead in leads if lead.website],
+            extractor_factory=ContactExtractor  # Contacts are scanned as chunks arrive
+        )
+        
+        enriched_leads = []
+        for lead in leads:
+            enriched = EnrichedLead(
+                company=lead.company,
+                industry=lead.industry,
+                address=lead.address,
+                phone=lead.phone,
+                website=lead.website,
+                source=lead.source
+            )
             
-            if emails:
-                return OwnerInfo(email=emails[0])
-                
+            page = pages.get(lead.website)
+            if page is not None and page.ok:
+                enriched.owner_info = page.extracted
+            elif page is not None:
+                logger.debug("Website enrichment failed for %s: %s", lead.company, page.error or page.status)
+            
+            enriched_leads.append(enriched)
+        
+        return enriched_leads
+    
+    def _extract_contact_info(self, content) -> Optional[OwnerInfo]:
+        """Basic contact extraction from raw website HTML (bytes or str)"""
+        try:
+            return extract_owner_info(content)
         except Exception:
             pass
         
@@ -0,0 +1,335 @@
+from hashlib import blake2b
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+import numpy as np
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import unicodedata
+from config import Config
+from models import new_lead_id
+from utils.bloom_filter import BloomFilter
+from utils.metrics import traced
+
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'gmbh', 'plc', 'lp', 'llp', 'pllc', 'sa', 'ag', 'bv', 'pty', 'the',
+}
+# Hosts shared by many unrelated businesses; a match on these says nothing
+SHARED_HOSTS = {
+    'linkedin.com', 'facebook.com', 'instagram.com', 'twitter.com', 'x.com', 'google.com',
+    'sites.google.com', 'business.site', 'yelp.com', 'yellowpages.com', 'wordpress.com',
+    'blogspot.com', 'wixsite.com', 'squarespace.com', 'godaddysites.com',
+}
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_DIGITS = re.compile(r'\d+')
+_LOOKUP_BATCH = 500  # Stay well under SQLite's bound-parameter limit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS identity_keys (
+    key INTEGER PRIMARY KEY,           -- 64-bit hash of 'd:domain', 'p:phone' or 'n:name'
+    lead_id TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS identities (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,                -- normalized company name, kept for fuzzy checks
+    domain TEXT,
+    seen INTEGER NOT NULL DEFAULT 1,
+    last_seen REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS identity_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL             -- 'bloom_tag': random id of this database's key set
+) WITHOUT ROWID;
+"""
+
+
+def normalize_name(company: Optional[str]) -> str:
+    """Lowercase ASCII alphanumerics with legal suffixes dropped ('Acme, Inc.' -> 'acme')"""
+    if not company:
+        return ''
+    text = unicodedata.normalize('NFKD', company).encode('ascii', 'ignore').decode().lower()
+    tokens = _NON_ALNUM.sub(' ', text.replace('&', ' and ')).split()
+    kept = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return ''.join(kept or tokens)
+
+
+def normalize_domain(website: Optional[str]) -> Optional[str]:
+    """Bare registrable host of a website URL, or None for blanks and shared hosts"""
+    if not website:
+        return None
+    website = website.strip().lower()
+    if '://' not in website:
+        website = f"http://{website}"
+    try:
+        host = urlsplit(website).hostname
+    except ValueError:
+        return None
+    if not host or '.' not in host:
+        return None
+    host = host.removeprefix('www.')
+    return None if host in SHARED_HOSTS else host
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """National digits of a phone number (a leading US/Canada 1 is dropped)"""
+    if not phone:
+        return None
+    digits = ''.join(ch for ch in phone if ch.isdigit())
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    return digits if len(digits) >= 7 else None
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Dice coefficient over character trigrams of two normalized names"""
+    if a == b:
+        return 1.0
+    grams_a = {a[i:i + 3] for i in range(len(a) - 2)} or {a}
+    grams_b = {b[i:i + 3] for i in range(len(b) - 2)} or {b}
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def _hash_key(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), 'little', signed=True)
+
+
+class IdentityIndex:
+    """Maps leads to stable ids by website domain, phone and normalized company name.
+
+    Keys are stored as 64-bit hashes in SQLite, and a fixed-size Bloom filter
+    answers most lookups for unseen keys without touching disk, so memory
+    stays bounded at millions of identities. The filter is mapped from a file
+    next to the database, so every process resolving against it shares one
+    filter: a key added by any of them is never "definitely absent" to the
+    others, whether they were forked from one master or started separately.
+
+    Two leads are the same company when:
+    - their normalized names are equal and their domains do not conflict, or
+    - they share a domain or phone and their names are near-duplicates
+      (trigram similarity, or one name extending the other).
+    Numbers in the names must match either way: 'Store 12' is not 'Store 13'.
+    """
+
+    def __init__(self, db_path: str = None, bloom_capacity: int = None, bloom_error_rate: float = None,
+                 fuzzy_threshold: float = None):
+        self.db_path = db_path or Config.IDENTITY_DB_PATH
+        self.fuzzy_threshold = fuzzy_threshold or Config.IDENTITY_FUZZY_THRESHOLD
+        self.bloom = BloomFilter(bloom_capacity or Config.IDENTITY_BLOOM_CAPACITY,
+                                 bloom_error_rate or Config.IDENTITY_BLOOM_ERROR_RATE,
+                                 path=f"{self.db_path}.bloom" if self.db_path != ':memory:' else None)
+        self.stats = {'resolved': 0, 'matched': 0, 'fuzzy_matches': 0, 'new_identities': 0,
+                      'batch_duplicates': 0, 'key_lookups': 0, 'bloom_skipped': 0,
+                      'bloom_false_positives': 0}
+        self._lock = threading.Lock()
+
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._conn, self._conn_pid = None, None
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        self._sync_bloom()
+
+    def _db(self) -> sqlite3.Connection:
+        """This process's connection (reopened after a fork); callers hold self._lock"""
+        if self._conn is None or (self._conn_pid != os.getpid() and self.db_path != ':memory:'):
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _sync_bloom(self):
+        """Rebuild the Bloom filter unless it was built from this database's keys and kept up since.
+
+        Runs in a write transaction, like every use of the filter, so no other
+        process resolves against it half-built.
+        """
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("INSERT OR IGNORE INTO identity_meta (name, value) VALUES ('bloom_tag', ?)",
+                       (secrets.randbits(63) or 1,))
+            tag = db.execute("SELECT value FROM identity_meta WHERE name = 'bloom_tag'").fetchone()[0]
+            if self.bloom.tag != tag:
+                self.bloom.clear()
+                self._load_bloom()
+                self.bloom.tag = tag  # Last, so a load cut short is redone by the next process
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _load_bloom(self):
+        """Rebuild the Bloom filter from the stored key hashes"""
+        cursor = self._db().execute("SELECT key FROM identity_keys")
+        while True:
+            rows = cursor.fetchmany(100000)
+            if not rows:
+                break
+            self.bloom.add_many(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['bloom_keys'] = self.bloom.count
+            stats['bloom_memory_mb'] = round(self.bloom.memory_bytes / (1024 * 1024), 2)
+            stats['bloom_error_rate'] = round(self.bloom.estimated_error_rate(), 5)
+        return stats
+
+    @staticmethod
+    def _fields(record) -> Tuple[str, Optional[str], Optional[str]]:
+        if isinstance(record, dict):
+            return record.get('company'), record.get('website'), record.get('phone')
+        return record.company, record.website, record.phone
+
+    @traced('identity')
+    def resolve_many(self, records: Sequence) -> List[str]:
+        """Stable id for every lead (BaseLead, EnrichedLead or request dict), in order.
+
+        Unseen companies become new identities; their ids are the lead's own
+        id when it has one. Duplicates inside ``records`` resolve to one id.
+        """
+        prepared = []
+        for record in records:
+            company, website, phone = self._fields(record)
+            name, domain, phone = normalize_name(company), normalize_domain(website), normalize_phone(phone)
+            keys = {}
+            if domain:
+                keys['d'] = _hash_key(f"d:{domain}")
+            if phone:
+                keys['p'] = _hash_key(f"p:{phone}")
+            if name:
+                keys['n'] = _hash_key(f"n:{name}")
+            prepared.append((name, domain, keys))
+
+        with self._lock:
+            # One write transaction from lookup to store: other processes resolving at the same time
+            # wait, then find these keys in the database and the file-backed Bloom filter
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                ids = self._resolve_locked(records, prepared)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self.stats['resolved'] += len(records)
+        return ids
+
+    def _resolve_locked(self, records: Sequence, prepared: List) -> List[str]:
+        """Match against stored and batch identities and stage new ones; runs inside the write transaction"""
+        stored_keys = self._lookup_keys([key for _, _, keys in prepared for key in keys.values()])
+        stored_identities = self._lookup_identities(set(stored_keys.values()))
+
+        ids, new_keys, touched = [], {}, {}
+        batch_keys, batch_identities = {}, {}  # Identities first seen in this call
+        for record, (name, domain, keys) in zip(records, prepared):
+            lead_id = self._match(name, domain, keys, batch_keys, batch_identities,
+                                  stored_keys, stored_identities)
+            if lead_id is None:
+                own_id = record.get('id') if isinstance(record, dict) else record.id
+                lead_id = own_id or new_lead_id()
+                batch_identities[lead_id] = (name, domain)
+                self.stats['new_identities'] += 1
+            elif lead_id in touched:
+                self.stats['batch_duplicates'] += 1
+            else:
+                self.stats['matched'] += 1
+            for key in keys.values():
+                if key not in stored_keys and key not in batch_keys:
+                    batch_keys[key] = lead_id
+                    new_keys[key] = lead_id
+            touched[lead_id] = touched.get(lead_id, 0) + 1
+            ids.append(lead_id)
+
+        self._store(new_keys, batch_identities, touched)
+        return ids
+
+    def _match(self, name: str, domain: Optional[str], keys: Dict[str, int], batch_keys: Dict,
+               batch_identities: Dict, stored_keys: Dict, stored_identities: Dict) -> Optional[str]:
+        """Identity this lead belongs to, checking the name key first, then domain and phone"""
+        for kind in ('n', 'd', 'p'):
+            key = keys.get(kind)
+            if key is None:
+                continue
+            candidate = batch_keys.get(key) or stored_keys.get(key)
+            if candidate is None:
+                continue
+            candidate_name, candidate_domain = batch_identities.get(candidate) or stored_identities.get(
+                candidate, ('', None))
+            if _DIGITS.findall(name) != _DIGITS.findall(candidate_name):
+                continue
+            if kind == 'n':
+                if not (domain and candidate_domain and domain != candidate_domain):
+                    return candidate
+            elif self._near_duplicate(name, candidate_name):
+                if name != candidate_name:
+                    self.stats['fuzzy_matches'] += 1
+                return candidate
+        return None
+
+    def _near_duplicate(self, name: str, other: str) -> bool:
+        """Similar names, or one extending the other ('acmedata' / 'acmedatasystems')"""
+        shorter, longer = sorted((name, other), key=len)
+        if len(shorter) >= 4 and longer.startswith(shorter):
+            return True
+        return name_similarity(name, other) >= self.fuzzy_threshold
+
+    def _lookup_keys(self, keys: List[int]) -> Dict[int, str]:
+        """Stored lead id for each key; the Bloom filter screens out keys never stored"""
+        if not keys:
+            return {}
+        keys = np.array(keys, dtype=np.int64)
+        maybe = keys[self.bloom.contains_many(keys)].tolist()
+        self.stats['key_lookups'] += len(keys)
+        self.stats['bloom_skipped'] += len(keys) - len(maybe)
+
+        found = {}
+        for start in range(0, len(maybe), _LOOKUP_BATCH):
+            batch = maybe[start:start + _LOOKUP_BATCH]
+            found.update(self._db().execute(
+                f"SELECT key, lead_id FROM identity_keys WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall())
+        self.stats['bloom_false_positives'] += len(set(maybe)) - len(found)
+        return found
+
+    def _lookup_identities(self, lead_ids: set) -> Dict[str, Tuple[str, Optional[str]]]:
+        lead_ids, found = list(lead_ids), {}
+        for start in range(0, len(lead_ids), _LOOKUP_BATCH):
+            batch = lead_ids[start:start + _LOOKUP_BATCH]
+            for lead_id, name, domain in self._db().execute(
+                f"SELECT id, name, domain FROM identities WHERE id IN ({','.join('?' * len(batch))})", batch
+            ):
+                found[lead_id] = (name, domain)
+        return found
+
+    def _store(self, new_keys: Dict[int, str], new_identities: Dict, touched: Dict[str, int]):
+        now = time.time()
+        db = self._db()
+        db.executemany("INSERT OR IGNORE INTO identity_keys (key, lead_id) VALUES (?, ?)", new_keys.items())
+        db.executemany(
+            "INSERT OR IGNORE INTO identities (id, name, domain, seen, last_seen) VALUES (?, ?, ?, 0, ?)",
+            [(lead_id, name, domain, now) for lead_id, (name, domain) in new_identities.items()]
+        )
+        db.executemany(
+            "UPDATE identities SET seen = seen + ?, last_seen = ? WHERE id = ?",
+            [(count, now, lead_id) for lead_id, count in touched.items()]
+        )
+        # Set before COMMIT releases the write lock; bits left by a rollback only cost a lookup
+        if new_keys:
+            self.bloom.add_many(np.fromiter(new_keys.keys(), dtype=np.int64, count=len(new_keys)))
+
+    @staticmethod
+    def group(ids: List[str]) -> Tuple[List[int], List[int]]:
+        """(position of the first lead of each identity, index into those positions for every lead)"""
+        first, unique, owner = {}, [], []
+        for position, lead_id in enumerate(ids):
+            if lead_id not in first:
+                first[lead_id] = len(unique)
+                unique.append(position)
+            owner.append(first[lead_id])
+        return unique, owner
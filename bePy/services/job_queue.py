@@ -0,0 +1,432 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+import msgspec
+import os
+import socket
+import sqlite3
+import threading
+import time
+from config import Config
+from models import EnrichedLead, new_lead_id
+from utils.serialization import dumps
+from .enrichment_service import EnrichmentService, clean_record
+
+logger = logging.getLogger(__name__)
+
+_decode_records = msgspec.json.Decoder(List[dict]).decode
+_decode_results = msgspec.json.Decoder(List[EnrichedLead]).decode
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrich_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,              -- queued, running, done, failed
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    chunks INTEGER NOT NULL,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    chunks_failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enrich_job_chunks (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL,              -- pending, running, done, failed
+    records BLOB NOT NULL,             -- input leads as JSON; emptied once done
+    results BLOB,                      -- enriched leads as JSON
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,                        -- host:pid:token of the lease holder
+    lease_expires REAL,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE INDEX IF NOT EXISTS enrich_job_chunks_by_status ON enrich_job_chunks (status, lease_expires);
+"""
+
+
+class EnrichmentJobQueue:
+    """Durable enrichment jobs on a local SQLite queue (no external broker).
+
+    A submitted payload is split into chunks stored on disk. Worker threads
+    claim one chunk at a time under a lease, run it through the enrichment
+    pipeline and store its results, so a restart only repeats the chunks
+    that were in flight. Several processes can share one database file.
+    """
+
+    def __init__(self, enrichment_service: EnrichmentService, db_path: str = None, workers: int = None,
+                 chunk_size: int = None, lease_seconds: float = None, max_attempts: int = None,
+                 retention_seconds: float = None, poll_interval: float = 1.0):
+        self.enrichment_service = enrichment_service
+        self.db_path = db_path or Config.JOB_DB_PATH
+        self.workers = workers or Config.JOB_WORKERS
+        self.chunk_size = chunk_size or Config.JOB_CHUNK_SIZE
+        self.lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        self.retention_seconds = Config.JOB_RETENTION if retention_seconds is None else retention_seconds
+        self.poll_interval = poll_interval
+        self.host = socket.gethostname()
+        self.stats = {'submitted': 0, 'chunks_done': 0, 'chunks_retried': 0, 'chunks_failed': 0,
+                      'orphans_released': 0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()  # Replaced on every start, so workers of an earlier start still exit
+        self._threads = []
+        self._leases = set()  # Leases held by this process's worker threads right now
+        self._leases_lock = threading.Lock()
+        self._started_pid = None
+        self._start_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        """One connection per thread; writes use explicit BEGIN IMMEDIATE transactions"""
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _bump(self, counter: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[counter] += amount
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        rows = self._db().execute("SELECT status, COUNT(*) FROM enrich_jobs GROUP BY status").fetchall()
+        stats['jobs'] = dict(rows)
+        stats['workers'] = len([thread for thread in self._threads if thread.is_alive()])
+        return stats
+
+    def ensure_started(self):
+        """Start the worker threads in this process (again after a fork)"""
+        with self._start_lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            self._stopping = threading.Event()
+            self._release_orphans()
+            self._purge_expired()
+            self._threads = [
+                threading.Thread(target=self._work, args=(self._stopping,), name=f"enrich-job-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop claiming chunks; in-flight chunks finish first"""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._started_pid = None
+
+    def submit(self, records: List[Dict]) -> Dict:
+        """Store a payload as a queued job and return its status"""
+        if not records:
+            raise ValueError("no leads to enrich")
+        records = [clean_record(record) for record in records]  # Rejected here rather than failing in a chunk
+
+        job_id = new_lead_id()
+        now = time.time()
+        chunks = []
+        for seq, start in enumerate(range(0, len(records), self.chunk_size)):
+            chunk = records[start:start + self.chunk_size]
+            chunks.append((job_id, seq, len(chunk), dumps(chunk)))
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "INSERT INTO enrich_jobs (id, status, total, chunks, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, len(records), len(chunks), now, now)
+            )
+            db.executemany(
+                "INSERT INTO enrich_job_chunks (job_id, seq, size, status, records) VALUES (?, ?, ?, 'pending', ?)",
+                chunks
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        self._bump('submitted')
+        with self._wakeup:
+            self._wakeup.notify_all()
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job status and progress, or None for an unknown id"""
+        db = self._db()
+        row = db.execute(
+            "SELECT id, status, total, completed, chunks, chunks_done, chunks_failed, error, created_at, updated_at "
+            "FROM enrich_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job_id, status, total, completed, chunks, chunks_done, chunks_failed, error, created_at, updated_at = row
+        return {
+            'id': job_id,
+            'status': status,
+            'total': total,
+            'completed': completed,
+            'progress': round(completed / total, 4) if total else 1.0,
+            'chunks': chunks,
+            'chunks_done': chunks_done,
+            'chunks_failed': chunks_failed,
+            'results_available': self._available_prefix(job_id)[0],
+            'error': error,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(timespec='milliseconds'),
+            'updated_at': datetime.fromtimestamp(updated_at).isoformat(timespec='milliseconds'),
+        }
+
+    def _available_prefix(self, job_id: str) -> Tuple[int, List[Tuple[int, int]]]:
+        """Leads in the unbroken run of settled chunks from the start, and the done chunks' (seq, size).
+
+        Results are only served from this prefix, so a client paging with
+        ``offset`` never skips leads from a chunk that finishes late. A chunk
+        that failed for good is settled too: it adds no leads (the job's
+        error names it) but doesn't hide the chunks after it.
+        """
+        rows = self._db().execute(
+            "SELECT seq, size, status FROM enrich_job_chunks WHERE job_id = ? ORDER BY seq", (job_id,)
+        ).fetchall()
+        available, prefix = 0, []
+        for seq, size, status in rows:
+            if status == 'failed':
+                continue
+            if status != 'done':
+                break
+            available += size
+            prefix.append((seq, size))
+        return available, prefix
+
+    def get_results(self, job_id: str, offset: int = 0, limit: int = None) -> List[EnrichedLead]:
+        """Enriched leads [offset, offset + limit) from the finished prefix of the job"""
+        _, prefix = self._available_prefix(job_id)
+        end = float('inf') if limit is None else offset + limit
+        db = self._db()
+        results, position = [], 0
+        for seq, size in prefix:
+            if position + size > offset and position < end:
+                blob, = db.execute(
+                    "SELECT results FROM enrich_job_chunks WHERE job_id = ? AND seq = ?", (job_id, seq)
+                ).fetchone()
+                leads = _decode_results(blob)
+                results.extend(leads[max(offset - position, 0):max(min(end - position, size), 0)])
+            position += size
+            if position >= end:
+                break
+        return results
+
+    def _work(self, stopping: threading.Event):
+        while not stopping.is_set():
+            claimed = self._claim_chunk()
+            if claimed is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            job_id, seq, records, attempts, lease = claimed
+            try:
+                self._run_chunk(job_id, seq, records, attempts, lease)
+            finally:
+                with self._leases_lock:
+                    self._leases.discard(lease)
+
+    def _run_chunk(self, job_id: str, seq: int, records: bytes, attempts: int, lease: str):
+        try:
+            enriched = self.enrichment_service.enrich_leads(_decode_records(records))
+        except Exception as e:
+            logger.exception("Enrichment job %s chunk %s failed (attempt %d)", job_id, seq, attempts)
+            self._fail_chunk(job_id, seq, lease, repr(e), attempts)
+            return
+        self._complete_chunk(job_id, seq, lease, enriched)
+
+    def _claim_chunk(self) -> Optional[Tuple[str, int, bytes, int, str]]:
+        """Lease the oldest runnable chunk (pending, or running with an expired lease).
+
+        A runnable chunk already out of attempts is failed instead: its last
+        worker died mid-chunk (crash, OOM kill) rather than raising, so
+        _fail_chunk never ran for it.
+        """
+        db = self._db()
+        now = time.time()
+        lease = f"{self.host}:{os.getpid()}:{new_lead_id()[:8]}"
+        abandoned = 0
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                row = db.execute(
+                    "SELECT c.job_id, c.seq, c.records, c.attempts FROM enrich_job_chunks c "
+                    "JOIN enrich_jobs j ON j.id = c.job_id "
+                    "WHERE c.status = 'pending' OR (c.status = 'running' AND c.lease_expires < ?) "
+                    "ORDER BY j.created_at, c.seq LIMIT 1", (now,)
+                ).fetchone()
+                if row is None or row[3] < self.max_attempts:
+                    break
+                job_id, seq, _, attempts = row
+                error = f"worker exited during attempt {attempts} of {self.max_attempts}"
+                db.execute(
+                    "UPDATE enrich_job_chunks SET status = 'failed', owner = NULL, lease_expires = NULL, error = ? "
+                    "WHERE job_id = ? AND seq = ?", (error, job_id, seq)
+                )
+                db.execute(
+                    "UPDATE enrich_jobs SET chunks_failed = chunks_failed + 1, error = ?, updated_at = ? "
+                    "WHERE id = ?", (f"chunk {seq}: {error}", now, job_id)
+                )
+                self._finish_if_complete(db, job_id, now)
+                abandoned += 1
+            if row is None:
+                db.execute("COMMIT")
+                if abandoned:
+                    self._bump('chunks_failed', abandoned)
+                return None
+            job_id, seq, records, attempts = row
+            db.execute(
+                "UPDATE enrich_job_chunks SET status = 'running', owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE job_id = ? AND seq = ?",
+                (lease, now + self.lease_seconds, job_id, seq)
+            )
+            db.execute(
+                "UPDATE enrich_jobs SET status = 'running', updated_at = ? WHERE id = ? AND status = 'queued'",
+                (now, job_id)
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        with self._leases_lock:
+            self._leases.add(lease)
+        if abandoned:
+            self._bump('chunks_failed', abandoned)
+        if attempts:
+            self._bump('chunks_retried')
+        return job_id, seq, records, attempts + 1, lease
+
+    def _complete_chunk(self, job_id: str, seq: int, lease: str, enriched: List[EnrichedLead]):
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            updated = db.execute(
+                "UPDATE enrich_job_chunks SET status = 'done', results = ?, records = x'', owner = NULL, "
+                "lease_expires = NULL, error = NULL WHERE job_id = ? AND seq = ? AND owner = ? AND status = 'running'",
+                (dumps(enriched), job_id, seq, lease)
+            ).rowcount
+            if updated:
+                # Only count the chunk if our lease was not taken over in the meantime
+                db.execute(
+                    "UPDATE enrich_jobs SET completed = completed + ?, chunks_done = chunks_done + 1, "
+                    "updated_at = ? WHERE id = ?", (len(enriched), now, job_id)
+                )
+                self._finish_if_complete(db, job_id, now)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if updated:
+            self._bump('chunks_done')
+
+    def _fail_chunk(self, job_id: str, seq: int, lease: str, error: str, attempts: int):
+        """Put the chunk back for another try, or fail it once it is out of attempts"""
+        give_up = attempts >= self.max_attempts
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            updated = db.execute(
+                "UPDATE enrich_job_chunks SET status = ?, owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE job_id = ? AND seq = ? AND owner = ? AND status = 'running'",
+                ('failed' if give_up else 'pending', error, job_id, seq, lease)
+            ).rowcount
+            if updated and give_up:
+                db.execute(
+                    "UPDATE enrich_jobs SET chunks_failed = chunks_failed + 1, error = ?, updated_at = ? "
+                    "WHERE id = ?", (f"chunk {seq}: {error}", now, job_id)
+                )
+                self._finish_if_complete(db, job_id, now)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if updated and give_up:
+            self._bump('chunks_failed')
+
+    def _finish_if_complete(self, db: sqlite3.Connection, job_id: str, now: float):
+        db.execute(
+            "UPDATE enrich_jobs SET status = CASE WHEN chunks_failed > 0 THEN 'failed' ELSE 'done' END, "
+            "updated_at = ? WHERE id = ? AND chunks_done + chunks_failed = chunks", (now, job_id)
+        )
+
+    def _release_orphans(self):
+        """Requeue chunks leased by processes on this host that no longer exist.
+
+        Chunks leased elsewhere are picked up once their lease expires.
+        """
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(
+                "SELECT job_id, seq, owner FROM enrich_job_chunks WHERE status = 'running' AND owner LIKE ?",
+                (f"{self.host}:%",)
+            ).fetchall()
+            orphans = [(job_id, seq) for job_id, seq, owner in rows if self._is_orphaned(owner)]
+            db.executemany(
+                "UPDATE enrich_job_chunks SET status = 'pending', owner = NULL, lease_expires = NULL "
+                "WHERE job_id = ? AND seq = ?", orphans
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if orphans:
+            self._bump('orphans_released', len(orphans))
+            logger.info("Resuming %d interrupted enrichment chunks", len(orphans))
+
+    def _is_orphaned(self, owner: str) -> bool:
+        """Whether a lease on this host belongs to a process that is gone"""
+        pid = int(owner.split(':')[1])
+        if pid == os.getpid():
+            # Ours only if a worker thread holds it now (one may outlive stop()); else an
+            # earlier process that had this pid, e.g. PID 1 in a restarted container
+            with self._leases_lock:
+                return owner not in self._leases
+        return not self._is_alive(pid)
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _purge_expired(self):
+        """Delete finished jobs older than the retention window"""
+        if not self.retention_seconds:
+            return
+        cutoff = time.time() - self.retention_seconds
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            expired = [row[0] for row in db.execute(
+                "SELECT id FROM enrich_jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (cutoff,)
+            )]
+            db.executemany("DELETE FROM enrich_job_chunks WHERE job_id = ?", [(job_id,) for job_id in expired])
+            db.executemany("DELETE FROM enrich_jobs WHERE id = ?", [(job_id,) for job_id in expired])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
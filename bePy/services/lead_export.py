@@ -0,0 +1,268 @@
+from operator import attrgetter
+from typing import Dict, Iterator, List
+import argparse
+import csv
+import io
+import logging
+import sys
+import time
+import zlib
+import msgspec
+from config import Config
+from models import EnrichedLead, OwnerInfo
+from utils.log import configure_logging
+from utils.metrics import span
+from .lead_store import LeadStore
+
+try:
+    import zstandard
+except ImportError:  # Optional; only needed for zstd-compressed CSV and NDJSON
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional; only needed for Parquet
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# format -> (content type, file extension)
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+# compression -> (content type of the compressed file, extension suffix)
+COMPRESSIONS = {
+    'none': (None, ''),
+    'gzip': ('application/gzip', '.gz'),
+    'zstd': ('application/zstd', '.zst'),
+}
+
+_decode_chunk = msgspec.json.Decoder(List[EnrichedLead]).decode
+
+# CSV columns are the EnrichedLead fields in declaration order, with owner_info
+# flattened into owner_* columns and tags joined with ';'
+LEAD_FIELDS = EnrichedLead.__struct_fields__
+OWNER_FIELDS = OwnerInfo.__struct_fields__
+CSV_COLUMNS = [column for field in LEAD_FIELDS
+               for column in ([f"owner_{name}" for name in OWNER_FIELDS] if field == 'owner_info' else [field])]
+_NO_OWNER = (None,) * len(OWNER_FIELDS)
+_lead_values = attrgetter(*LEAD_FIELDS)
+_owner_values = attrgetter(*OWNER_FIELDS)
+_TAGS = LEAD_FIELDS.index('tags')
+_OWNER = LEAD_FIELDS.index('owner_info')
+
+
+def _csv_row(lead: EnrichedLead) -> tuple:
+    values = _lead_values(lead)
+    owner = values[_OWNER]
+    return (values[:_TAGS] + (';'.join(values[_TAGS] or ()),) + values[_TAGS + 1:_OWNER]
+            + (_owner_values(owner) if owner is not None else _NO_OWNER) + values[_OWNER + 1:])
+
+
+def _arrow_type(info: msgspec.inspect.Type):
+    """Arrow type for a msgspec field type; Optional[...] becomes a nullable column of the inner type"""
+    if isinstance(info, msgspec.inspect.UnionType):
+        return _arrow_type(next(t for t in info.types if not isinstance(t, msgspec.inspect.NoneType)))
+    if isinstance(info, msgspec.inspect.StructType):
+        return pyarrow.struct([(field.name, _arrow_type(field.type)) for field in info.fields])
+    if isinstance(info, msgspec.inspect.ListType):
+        return pyarrow.list_(_arrow_type(info.item_type))
+    return {
+        msgspec.inspect.StrType: pyarrow.string(),
+        msgspec.inspect.IntType: pyarrow.int64(),
+        msgspec.inspect.FloatType: pyarrow.float64(),
+        msgspec.inspect.BoolType: pyarrow.bool_(),
+    }[type(info)]
+
+
+def parquet_schema():
+    """The EnrichedLead schema as Arrow; owner_info stays a nested struct and tags a list"""
+    return pyarrow.schema([(field.name, _arrow_type(field.type))
+                           for field in msgspec.inspect.type_info(EnrichedLead).fields])
+
+
+class _Spool(io.RawIOBase):
+    """Write-only file that hands over whatever was written since the last take(); the Parquet sink"""
+
+    def __init__(self):
+        self.parts, self.position = [], 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+class LeadExport:
+    """Streams stored leads out as NDJSON, CSV or Parquet, optionally gzip or zstd compressed.
+
+    Iterating yields the file's bytes one store chunk at a time, so memory
+    stays at one chunk however many leads match (or the best ``limit`` of
+    them). NDJSON passes each lead's stored JSON through untouched; CSV and
+    Parquet decode the chunk into EnrichedLead structs first. Parquet writes
+    one row group per chunk and compresses inside the file rather than
+    around it.
+    """
+
+    def __init__(self, lead_store: LeadStore, format: str = 'ndjson', compression: str = 'none',
+                 chunk_size: int = None, filters: Dict = None, limit: int = None):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        compression = compression or 'none'
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+        if format == 'parquet' and pyarrow is None:
+            raise ValueError("parquet export needs pyarrow installed")
+        if compression == 'zstd' and format != 'parquet' and zstandard is None:
+            raise ValueError("zstd compression needs zstandard installed")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+        self.lead_store = lead_store
+        self.format = format
+        self.compression = compression
+        self.chunk_size = chunk_size or Config.EXPORT_CHUNK_SIZE
+        self.filters = filters or {}
+        self.limit = limit
+        self.rows = 0
+
+    @property
+    def content_type(self) -> str:
+        if self.format == 'parquet' or self.compression == 'none':
+            return FORMATS[self.format][0]
+        return COMPRESSIONS[self.compression][0]
+
+    @property
+    def filename(self) -> str:
+        suffix = COMPRESSIONS[self.compression][1] if self.format != 'parquet' else ''
+        return f"leads.{FORMATS[self.format][1]}{suffix}"
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.rows = 0
+        chunks = self._chunks()
+        if self.format == 'parquet':
+            yield from self._parquet(chunks)
+            return
+        encode = self._ndjson if self.format == 'ndjson' else self._csv
+        compress, finish = self._compressor()
+        if self.format == 'csv':
+            yield compress(self._csv_header())
+        for chunk in chunks:
+            with span('export', items=len(chunk)):
+                data = compress(encode(chunk))
+            self.rows += len(chunk)
+            if data:
+                yield data
+        data = finish()
+        if data:
+            yield data
+
+    def _chunks(self) -> Iterator[List[bytes]]:
+        """The store's chunks of matching leads, best fit first, cut off after ``limit`` leads"""
+        chunk_size = min(self.chunk_size, self.limit) if self.limit else self.chunk_size
+        remaining = self.limit
+        for chunk in self.lead_store.scan(chunk_size=chunk_size, **self.filters):
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining == 0:
+                return
+
+    def write_to(self, f) -> int:
+        """Write the whole export to a binary file object; returns how many leads were written"""
+        for data in self:
+            f.write(data)
+        return self.rows
+
+    def _compressor(self):
+        """(compress, finish) for a streaming compressor; identity when uncompressed"""
+        level = Config.EXPORT_COMPRESSION_LEVEL
+        if self.compression == 'gzip':
+            compressor = zlib.compressobj(1 if level is None else level, zlib.DEFLATED, 31)  # 31: gzip framing
+            return compressor.compress, compressor.flush
+        if self.compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+            return compressor.compress, compressor.flush
+        return (lambda data: data), (lambda: b'')
+
+    @staticmethod
+    def _ndjson(chunk: List[bytes]) -> bytes:
+        return b'\n'.join(chunk) + b'\n'
+
+    @staticmethod
+    def _csv_header() -> bytes:
+        out = io.StringIO()
+        csv.writer(out).writerow(CSV_COLUMNS)
+        return out.getvalue().encode()
+
+    @staticmethod
+    def _csv(chunk: List[bytes]) -> bytes:
+        out = io.StringIO()
+        csv.writer(out).writerows(map(_csv_row, _decode_chunk(b'[' + b','.join(chunk) + b']')))
+        return out.getvalue().encode()
+
+    def _parquet(self, chunks: Iterator[List[bytes]]) -> Iterator[bytes]:
+        schema = parquet_schema()
+        spool = _Spool()
+        level = Config.EXPORT_COMPRESSION_LEVEL
+        writer = pyarrow.parquet.ParquetWriter(spool, schema, compression=self.compression,
+                                               compression_level=level)
+        try:
+            for chunk in chunks:
+                with span('export', items=len(chunk)):
+                    leads = msgspec.to_builtins(_decode_chunk(b'[' + b','.join(chunk) + b']'))
+                    writer.write_table(pyarrow.Table.from_pylist(leads, schema=schema))  # One row group
+                self.rows += len(chunk)
+                yield spool.take()
+        finally:
+            writer.close()
+        yield spool.take()  # The footer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored leads as NDJSON, CSV or Parquet")
+    parser.add_argument('--format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='none')
+    parser.add_argument('--output', '-o', help="file to write, '-' for stdout (default: leads.<format>)")
+    parser.add_argument('--store', default=Config.LEAD_STORE_PATH)
+    parser.add_argument('--query', default='')
+    parser.add_argument('--location', default='')
+    parser.add_argument('--min-score', type=float)
+    parser.add_argument('--max-score', type=float)
+    parser.add_argument('--tags', default='', help="comma-separated; leads must have all of them")
+    parser.add_argument('--limit', type=int, default=None, help="export only the best-scoring N leads")
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args()
+    configure_logging(Config.LOG_LEVEL)
+
+    filters = {'query': args.query, 'location': args.location, 'min_score': args.min_score,
+               'max_score': args.max_score, 'tags': [tag.strip() for tag in args.tags.split(',') if tag.strip()]}
+    export = LeadExport(LeadStore(db_path=args.store), args.format, args.compression, args.chunk_size, filters,
+                        args.limit)
+    output = args.output or export.filename
+    started = time.perf_counter()
+    if output == '-':
+        export.write_to(sys.stdout.buffer)
+    else:
+        with open(output, 'wb') as f:
+            export.write_to(f)
+    seconds = time.perf_counter() - started
+    logger.info("Exported %d leads to %s in %.2fs (%.0f leads/s)", export.rows, output, seconds,
+                export.rows / seconds if seconds else 0.0)
+
+
+if __name__ == '__main__':
+    main()
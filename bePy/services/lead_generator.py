@@ -0,0 +1,246 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+import argparse
+import json
+import os
+import time
+import numpy as np
+from lead_batch import DictColumn, IntColumn, LeadBatch, StringColumn
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+# Realistic mode draws from weighted tables instead of a handful of uniform choices, so every model
+# feature (state, domain extension, name keywords, size, revenue) actually varies across leads.
+# (city, state, weight): weights roughly follow where US businesses are registered
+CITIES = [
+    ('Los Angeles', 'CA', 6.0), ('San Francisco', 'CA', 4.0), ('San Diego', 'CA', 2.0), ('San Jose', 'CA', 2.0),
+    ('Houston', 'TX', 3.0), ('Austin', 'TX', 3.0), ('Dallas', 'TX', 3.0), ('New York', 'NY', 7.0),
+    ('Buffalo', 'NY', 1.0), ('Miami', 'FL', 3.0), ('Orlando', 'FL', 2.0), ('Tampa', 'FL', 2.0),
+    ('Chicago', 'IL', 4.0), ('Philadelphia', 'PA', 2.0), ('Pittsburgh', 'PA', 1.5), ('Columbus', 'OH', 1.5),
+    ('Cleveland', 'OH', 1.0), ('Atlanta', 'GA', 3.0), ('Charlotte', 'NC', 2.0), ('Raleigh', 'NC', 1.5),
+    ('Detroit', 'MI', 1.5), ('Newark', 'NJ', 2.0), ('Arlington', 'VA', 2.0), ('Seattle', 'WA', 3.0),
+    ('Phoenix', 'AZ', 2.0), ('Boston', 'MA', 3.0), ('Nashville', 'TN', 1.5), ('Indianapolis', 'IN', 1.0),
+    ('Denver', 'CO', 2.5), ('Minneapolis', 'MN', 1.5), ('Portland', 'OR', 1.5), ('Salt Lake City', 'UT', 1.0),
+    ('Las Vegas', 'NV', 1.0), ('Baltimore', 'MD', 1.0), ('St. Louis', 'MO', 1.0), ('Madison', 'WI', 0.5),
+]
+STREETS = ['Main St', 'Market St', 'Oak Ave', 'Park Ave', 'Broadway', 'Elm St', 'Washington Blvd',
+           'Lake Dr', 'Commerce Way', 'Innovation Dr', 'Industrial Pkwy', 'Pine St']
+DOMAIN_EXTENSIONS = {'com': 62.0, 'io': 8.0, 'net': 6.0, 'co': 6.0, 'ai': 5.0, 'us': 4.0, 'org': 3.0,
+                     'tech': 3.0, 'biz': 2.0, 'app': 1.0}
+# industry: (weight, share of names with a tech keyword, share of B2B companies)
+INDUSTRIES = {
+    'Technology': (14.0, 0.75, 0.7), 'Software': (10.0, 0.7, 0.8), 'SaaS': (8.0, 0.7, 0.9),
+    'E-commerce': (7.0, 0.35, 0.2), 'Healthcare': (10.0, 0.2, 0.5), 'Finance': (9.0, 0.3, 0.6),
+    'Manufacturing': (9.0, 0.15, 0.85), 'Retail': (9.0, 0.1, 0.1), 'Education': (5.0, 0.2, 0.4),
+    'Real Estate': (6.0, 0.05, 0.3), 'Logistics': (6.0, 0.25, 0.9), 'Marketing': (7.0, 0.3, 0.8),
+}
+NAME_STEMS = ['Blue', 'North', 'Apex', 'Summit', 'Bright', 'Iron', 'Silver', 'Pioneer', 'Harbor', 'Granite',
+              'Evergreen', 'Nova', 'Vertex', 'Cedar', 'Atlas', 'Crescent', 'Keystone', 'Meridian', 'Beacon',
+              'Falcon', 'Redwood', 'Horizon', 'Quantum', 'Clear', 'Swift', 'True', 'Prime', 'Union']
+TECH_NAME_WORDS = ['Tech', 'Data', 'Software', 'Digital', 'Cloud', 'AI', 'Solutions', 'Systems',
+                   'Data Systems', 'Cloud Solutions', 'Digital Solutions', 'AI Labs']
+PLAIN_NAME_WORDS = ['Partners', 'Group', 'Health', 'Capital', 'Foods', 'Goods', 'Logistics', 'Realty',
+                    'Manufacturing', 'Supply', 'Works', 'Consulting', 'Brands', 'Media']
+NAME_SUFFIXES = {'Inc': 30.0, 'LLC': 30.0, 'Corp': 12.0, 'Co': 8.0, 'Ltd': 5.0, '': 15.0}
+BBB_RATINGS = {'A+': 30.0, 'A': 25.0, 'A-': 10.0, 'B+': 8.0, 'B': 5.0, 'C': 2.0, None: 20.0}
+# Revenue ranges by company size, indexed by np.digitize(employees, REVENUE_SIZE_BOUNDS)
+REVENUE_RANGES = ['Startup', '$1M-$5M', '$5M-$25M', '$25M+']
+REVENUE_SIZE_BOUNDS = [20, 100, 500]
+
+DEFAULT_COMPANIES = ["TechFlow Solutions", "DataPipe Inc", "CloudBridge Corp",
+                     "StreamLine Systems", "NextGen Analytics", "FlexiCode LLC"]
+DEFAULT_INDUSTRIES = ["Technology", "Software", "SaaS", "E-commerce", "Healthcare", "Finance"]
+
+
+def _probabilities(weights: Sequence[float]) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+class LeadGenerator:
+    """Generates LeadBatches column by column from one NumPy random stream.
+
+    The same ``seed`` gives the same leads call after call. The default mode
+    mirrors the original mock data (a few uniform company and industry
+    choices); ``realistic`` draws states, domains, name keywords, sizes and
+    revenue from weighted, industry-dependent tables.
+    """
+
+    def __init__(self, seed: Seed = None, realistic: bool = False, companies: Sequence[str] = None,
+                 industries: Sequence[str] = None):
+        self.rng = np.random.default_rng(seed)
+        self.realistic = realistic
+        self.companies = list(companies or DEFAULT_COMPANIES)
+        self.industries = list(industries or DEFAULT_INDUSTRIES)
+
+    def generate(self, count: int, start: int = 0) -> LeadBatch:
+        """``count`` leads; companies are numbered from ``start + 1`` so shards never collide"""
+        if self.realistic:
+            return self._realistic(count, start)
+        return self._uniform(count, start)
+
+    def _digits(self, low: int, high: int, count: int) -> StringColumn:
+        return StringColumn.from_ints(self.rng.integers(low, high, size=count))
+
+    def _pick(self, choices: Sequence, count: int, p: np.ndarray = None) -> DictColumn:
+        if p is None:
+            codes = self.rng.integers(len(choices), size=count)
+        else:
+            codes = self.rng.choice(len(choices), size=count, p=p)
+        return DictColumn(codes.astype(np.int32), list(choices))
+
+    def _uniform(self, count: int, start: int) -> LeadBatch:
+        company_idx = self.rng.integers(len(self.companies), size=count)
+        companies = StringColumn.from_values(self.companies)
+        websites = StringColumn.from_values([f"https://{company.lower().replace(' ', '')}.com" for company in self.companies])
+        return LeadBatch(
+            company=StringColumn.concat([companies.take(company_idx), ' ', StringColumn.from_ints(np.arange(start + 1, start + count + 1))]),
+            industry=self._pick(self.industries, count),
+            address=StringColumn.concat([self._digits(100, 10000, count), ' Business St, City, ST 12345']),
+            bbb_rating=DictColumn(np.zeros(count, dtype=np.int32), [None]),
+            phone=StringColumn.concat(['+1-555-', self._digits(100, 1000, count), '-', self._digits(1000, 10000, count)]),
+            website=websites.take(company_idx),
+            employees=IntColumn(self.rng.choice([10, 25, 50, 100, 250, 500], size=count)),
+            revenue=self._pick(["$1M-$5M", "$5M-$25M", "$25M+", "Startup"], count),
+            business_type=self._pick(["B2B", "B2C"], count),
+            source=DictColumn(np.zeros(count, dtype=np.int32), ["mock"]),
+        )
+
+    def _realistic(self, count: int, start: int) -> LeadBatch:
+        rng = self.rng
+        industry_names = list(INDUSTRIES)
+        weights, tech_share, b2b_share = (np.array(values) for values in zip(*INDUSTRIES.values()))
+        industry = rng.choice(len(industry_names), size=count, p=_probabilities(weights))
+
+        # Name: stem, then a tech word with the industry's probability (else a plain word), then a legal suffix
+        words = TECH_NAME_WORDS + PLAIN_NAME_WORDS
+        word = np.where(rng.random(count) < tech_share[industry],
+                        rng.integers(len(TECH_NAME_WORDS), size=count),
+                        len(TECH_NAME_WORDS) + rng.integers(len(PLAIN_NAME_WORDS), size=count))
+        stem = rng.integers(len(NAME_STEMS), size=count)
+        suffix = rng.choice(len(NAME_SUFFIXES), size=count, p=_probabilities(list(NAME_SUFFIXES.values())))
+        numbers = StringColumn.from_ints(np.arange(start + 1, start + count + 1))
+        # Every stem/word(/suffix) combination is built once, so each row costs one gather instead of several
+        stem_word = stem * len(words) + word
+        names = StringColumn.from_values([
+            f"{stem_name} {word_name}{' ' + suffix_name if suffix_name else ''} "
+            for stem_name in NAME_STEMS for word_name in words for suffix_name in NAME_SUFFIXES
+        ])
+        company = StringColumn.concat([names.take(stem_word * len(NAME_SUFFIXES) + suffix), numbers])
+
+        # Domain: the name's stem and word, lowercased without spaces, numbered like the company
+        slugs = StringColumn.from_values([
+            f"https://www.{stem_name.lower()}{word_name.lower().replace(' ', '')}"
+            for stem_name in NAME_STEMS for word_name in words
+        ])
+        extension = rng.choice(len(DOMAIN_EXTENSIONS), size=count, p=_probabilities(list(DOMAIN_EXTENSIONS.values())))
+        extensions = StringColumn.from_values([f".{value}" for value in DOMAIN_EXTENSIONS])
+        website = StringColumn.concat([slugs.take(stem_word), numbers, extensions.take(extension)])
+        website.valid &= rng.random(count) >= 0.08  # Some companies have no site on record
+        website.offsets, website.data = _drop_invalid(website)
+
+        city = rng.choice(len(CITIES), size=count, p=_probabilities([weight for _, _, weight in CITIES]))
+        address = StringColumn.concat([
+            self._digits(1, 10000, count), ' ', StringColumn.from_values(STREETS).take(rng.integers(len(STREETS), size=count)),
+            ', ', StringColumn.from_values([f"{name}, {state}" for name, state, _ in CITIES]).take(city),
+        ])
+        phone = StringColumn.concat(['+1-', self._digits(201, 990, count), '-', self._digits(200, 1000, count),
+                                     '-', self._digits(1000, 10000, count)])
+        phone.valid &= rng.random(count) >= 0.12
+        phone.offsets, phone.data = _drop_invalid(phone)
+
+        # Heavy-tailed headcounts; revenue follows size, with some companies a bracket off either way
+        employees = np.clip(np.rint(rng.lognormal(mean=3.6, sigma=1.3, size=count)), 1, 20000).astype(np.int64)
+        bracket = np.digitize(employees, REVENUE_SIZE_BOUNDS) + rng.choice([-1, 0, 0, 0, 1], size=count)
+        revenue = DictColumn(np.clip(bracket, 0, len(REVENUE_RANGES) - 1).astype(np.int32), list(REVENUE_RANGES))
+        business_type = DictColumn(np.where(rng.random(count) < b2b_share[industry], 0, 1).astype(np.int32), ['B2B', 'B2C'])
+
+        return LeadBatch(
+            company=company,
+            industry=DictColumn(industry.astype(np.int32), industry_names),
+            address=address,
+            bbb_rating=self._pick(list(BBB_RATINGS), count, _probabilities(list(BBB_RATINGS.values()))),
+            phone=phone,
+            website=website,
+            employees=IntColumn(employees),
+            revenue=revenue,
+            business_type=business_type,
+            source=DictColumn(np.zeros(count, dtype=np.int32), ['synthetic']),
+        )
+
+
+def _drop_invalid(column: StringColumn):
+    """Offsets and data with the bytes of null rows removed, so nulls read as empty like from_values"""
+    keep = np.repeat(column.valid, np.diff(column.offsets))
+    lengths = np.where(column.valid, np.diff(column.offsets), 0)
+    offsets = np.zeros(len(column) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets, column.data[keep]
+
+
+def _write_shard(out_dir: str, index: int, seed: np.random.SeedSequence, count: int, start: int,
+                 realistic: bool) -> str:
+    path = os.path.join(out_dir, f"shard-{index:05d}")
+    LeadGenerator(seed=seed, realistic=realistic).generate(count, start=start).save(path)
+    return path
+
+
+def generate_shards(out_dir: str, count: int, seed: Optional[int] = None, realistic: bool = False,
+                    shard_size: int = 250000, processes: int = None) -> Dict:
+    """Write ``count`` leads to ``out_dir`` as LeadBatch shards, generated in parallel processes.
+
+    Every shard draws from its own child of one SeedSequence, so the output
+    depends only on ``seed``, ``count`` and ``shard_size`` -- not on how many
+    processes produced it. Returns the manifest also written as manifest.json.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    seed_sequence = np.random.SeedSequence(seed)
+    starts = list(range(0, count, shard_size))
+    children = seed_sequence.spawn(len(starts))
+    processes = min(processes or os.cpu_count() or 1, max(len(starts), 1))
+    jobs = [(out_dir, i, child, min(shard_size, count - start), start, realistic)
+            for i, (start, child) in enumerate(zip(starts, children))]
+    if processes == 1:
+        paths = [_write_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            paths = list(pool.map(_write_shard, *zip(*jobs)))
+    manifest = {
+        'count': count,
+        'seed': seed_sequence.entropy,
+        'realistic': realistic,
+        'shard_size': shard_size,
+        'shards': [os.path.basename(path) for path in paths],
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def load_shards(out_dir: str, mmap: bool = True) -> List[LeadBatch]:
+    """The shards generate_shards wrote, in order"""
+    with open(os.path.join(out_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    return [LeadBatch.load(os.path.join(out_dir, shard), mmap=mmap) for shard in manifest['shards']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic leads into columnar .npy shards")
+    parser.add_argument('--count', type=int, required=True)
+    parser.add_argument('--out', required=True, help="directory for the shards and manifest.json")
+    parser.add_argument('--seed', type=int, default=None, help="omit for fresh entropy (recorded in the manifest)")
+    parser.add_argument('--realistic', action='store_true', help="weighted states, domains, name keywords and sizes")
+    parser.add_argument('--shard-size', type=int, default=250000)
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    manifest = generate_shards(args.out, args.count, seed=args.seed, realistic=args.realistic,
+                               shard_size=args.shard_size, processes=args.processes)
+    elapsed = time.perf_counter() - started
+    print(f"{args.count} leads in {len(manifest['shards'])} shards under {args.out} "
+          f"in {elapsed:.2f}s ({args.count / elapsed:,.0f} leads/s, seed {manifest['seed']})")
+
+
+if __name__ == '__main__':
+    main()
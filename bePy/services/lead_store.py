@@ -0,0 +1,279 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import msgspec
+import os
+import re
+import sqlite3
+import threading
+import time
+from config import Config
+from models import EnrichedLead
+from utils.metrics import traced
+from utils.serialization import dumps
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+_decode_cursor = msgspec.json.Decoder(int).decode
+_decode_lead = msgspec.json.Decoder(EnrichedLead).decode
+
+# Leads are ranked by rank = score_bucket * 2**40 + seq, so ordering by rank is
+# ordering by fit_score (0.001 steps), newest first among ties. The full-text
+# index and the tag table are keyed by rank too: both can be walked best-first
+# and stop as soon as a page is full, however many leads match.
+RANK_SHIFT = 1 << 40
+RANK = "(score_bucket * 1099511627776 + seq)"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS leads (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    company TEXT NOT NULL,
+    industry TEXT,
+    address TEXT,
+    fit_score REAL NOT NULL,
+    score_bucket INTEGER NOT NULL,     -- fit_score * 1000, truncated
+    is_enriched INTEGER NOT NULL,
+    tags TEXT NOT NULL,                -- JSON array, fanned out into lead_tags by the triggers
+    updated_at REAL NOT NULL,
+    data BLOB NOT NULL                 -- the EnrichedLead as JSON, returned without decoding
+);
+CREATE INDEX IF NOT EXISTS leads_by_rank ON leads {RANK};
+CREATE INDEX IF NOT EXISTS leads_by_updated ON leads (updated_at);
+CREATE TABLE IF NOT EXISTS lead_tags (
+    tag TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (tag, rank)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5(
+    company, industry, address,        -- rowid is the lead's rank
+    content='', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS leads_after_insert AFTER INSERT ON leads BEGIN
+    INSERT INTO leads_fts (rowid, company, industry, address)
+        VALUES (new.score_bucket * 1099511627776 + new.seq, new.company, new.industry, new.address);
+    INSERT INTO lead_tags (tag, rank)
+        SELECT DISTINCT value, new.score_bucket * 1099511627776 + new.seq FROM json_each(new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_after_delete AFTER DELETE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, company, industry, address)
+        VALUES ('delete', old.score_bucket * 1099511627776 + old.seq, old.company, old.industry, old.address);
+    DELETE FROM lead_tags WHERE tag IN (SELECT value FROM json_each(old.tags))
+        AND rank = old.score_bucket * 1099511627776 + old.seq;
+END;
+CREATE TRIGGER IF NOT EXISTS leads_after_update AFTER UPDATE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, company, industry, address)
+        VALUES ('delete', old.score_bucket * 1099511627776 + old.seq, old.company, old.industry, old.address);
+    INSERT INTO leads_fts (rowid, company, industry, address)
+        VALUES (new.score_bucket * 1099511627776 + new.seq, new.company, new.industry, new.address);
+    DELETE FROM lead_tags WHERE tag IN (SELECT value FROM json_each(old.tags))
+        AND rank = old.score_bucket * 1099511627776 + old.seq;
+    INSERT INTO lead_tags (tag, rank)
+        SELECT DISTINCT value, new.score_bucket * 1099511627776 + new.seq FROM json_each(new.tags);
+END;
+"""
+
+UPSERT = """
+INSERT INTO leads (id, company, industry, address, fit_score, score_bucket, is_enriched, tags, updated_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    company = excluded.company, industry = excluded.industry, address = excluded.address,
+    fit_score = excluded.fit_score, score_bucket = excluded.score_bucket, is_enriched = excluded.is_enriched,
+    tags = excluded.tags, updated_at = excluded.updated_at, data = excluded.data
+"""
+
+
+def score_bucket(fit_score: Optional[float]) -> int:
+    return int(max(fit_score or 0.0, 0.0) * 1000)
+
+
+def match_expression(query: str = '', location: str = '') -> Optional[str]:
+    """FTS5 query: every query word as a prefix of company/industry, every location word of address"""
+    clauses = []
+    for columns, text in (('{company industry}', query), ('address', location)):
+        terms = ' AND '.join('"%s"*' % term for term in _TERM.findall(text or ''))
+        if terms:
+            clauses.append(f"{columns} : ({terms})")
+    return ' AND '.join(clauses) or None
+
+
+def encode_cursor(rank: int) -> str:
+    return urlsafe_b64encode(dumps(rank)).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return _decode_cursor(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, msgspec.DecodeError):
+        raise ValueError("invalid cursor")
+
+
+class LeadStore:
+    """Scored and enriched leads in a local SQLite database, searchable without regenerating them.
+
+    Company, industry and address are full-text indexed (FTS5) and tags are
+    fanned out into their own table by triggers, both keyed by score rank, so
+    a search walks one index best-first and stops after a page. Pages are
+    chained with an opaque keyset cursor: page N costs the same as page 1.
+    Each lead is stored as its JSON encoding and returned as-is.
+    """
+
+    def __init__(self, db_path: str = None, max_limit: int = None):
+        self.db_path = db_path or Config.LEAD_STORE_PATH
+        self.max_limit = max_limit or Config.LEAD_STORE_MAX_LIMIT
+        self.stats = {'searches': 0, 'search_seconds': 0.0, 'upserted': 0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        """One connection per thread, so searches read concurrently under WAL"""
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA cache_size=-65536")  # 64 MB page cache per connection
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['leads'] = self.count()
+        stats['avg_search_ms'] = round(stats.pop('search_seconds') / stats['searches'] * 1000, 2) \
+            if stats['searches'] else 0.0
+        return stats
+
+    def count(self, since: float = None) -> int:
+        """Stored leads, or only those written after the ``since`` timestamp"""
+        if since is None:
+            return self._db().execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+        return self._db().execute("SELECT COUNT(*) FROM leads WHERE updated_at > ?", (since,)).fetchone()[0]
+    
+    def last_write(self) -> Optional[float]:
+        """When leads were last written by any process; changes with every upsert (an index lookup)"""
+        return self._db().execute("SELECT MAX(updated_at) FROM leads").fetchone()[0]
+
+    def load_recent(self, since: float = None, limit: int = None) -> List[Tuple[float, EnrichedLead]]:
+        """(updated_at, lead) for the most recently written leads, newest first"""
+        sql, params = "SELECT updated_at, data FROM leads", []
+        if since is not None:
+            sql += " WHERE updated_at > ?"
+            params.append(since)
+        sql += " ORDER BY updated_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(updated_at, _decode_lead(data)) for updated_at, data in self._db().execute(sql, params)]
+
+    @traced('store_write')
+    def upsert_many(self, leads: Iterable[EnrichedLead], batch_size: int = 10000) -> int:
+        """Insert leads or replace the stored copy with the same id; returns how many were written"""
+        db, written, rows = self._db(), 0, []
+
+        def flush():
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(UPSERT, rows)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        now = time.time()
+        for lead in leads:
+            rows.append((lead.id, lead.company, lead.industry, lead.address, lead.fit_score or 0.0,
+                         score_bucket(lead.fit_score), lead.is_enriched, dumps(lead.tags or []).decode(), now, dumps(lead)))
+            if len(rows) >= batch_size:
+                flush()
+                written += len(rows)
+                rows = []
+        if rows:
+            flush()
+            written += len(rows)
+        with self._stats_lock:
+            self.stats['upserted'] += written
+        return written
+
+    def optimize(self):
+        """Refresh planner statistics and merge FTS segments; run after bulk loads"""
+        db = self._db()
+        db.execute("INSERT INTO leads_fts (leads_fts) VALUES ('optimize')")
+        db.execute("ANALYZE")
+
+    def _filtered(self, query: str, location: str, min_score: Optional[float], max_score: Optional[float],
+                  tags: Sequence[str], upper: Optional[int]) -> Tuple[str, str, List]:
+        """(rank expression, FROM ... WHERE clause, params) for leads matching the filters below rank ``upper``"""
+        if max_score is not None:
+            bound = (score_bucket(float(max_score)) + 1) * RANK_SHIFT
+            upper = bound if upper is None else min(upper, bound)
+        lower = score_bucket(float(min_score)) * RANK_SHIFT if min_score is not None else None
+        tags = list(dict.fromkeys(tags or ()))
+
+        # Drive from the most selective index we have; everything else is checked per row
+        expression = match_expression(query, location)
+        if expression:
+            rank, params = "leads_fts.rowid", [expression]
+            sql = f"FROM leads_fts CROSS JOIN leads ON leads.seq = {rank} % {RANK_SHIFT} WHERE leads_fts MATCH ?"
+        elif tags:
+            rank, params = "lead_tags.rank", [tags.pop(0)]
+            sql = f"FROM lead_tags CROSS JOIN leads ON leads.seq = {rank} % {RANK_SHIFT} WHERE lead_tags.tag = ?"
+        else:
+            rank, params = RANK, []
+            sql = "FROM leads WHERE 1"
+        if upper is not None:
+            sql += f" AND {rank} < ?"
+            params.append(upper)
+        if lower is not None:
+            sql += f" AND {rank} >= ?"
+            params.append(lower)
+        for tag in tags:
+            sql += f" AND EXISTS (SELECT 1 FROM lead_tags AS tagged WHERE tagged.tag = ? AND tagged.rank = {rank})"
+            params.append(tag)
+        if min_score is not None:
+            sql += " AND leads.fit_score >= ?"  # Exact bounds; the rank bounds are 0.001 buckets
+            params.append(float(min_score))
+        if max_score is not None:
+            sql += " AND leads.fit_score <= ?"
+            params.append(float(max_score))
+        return rank, sql, params
+
+    @traced('store_search')
+    def search(self, query: str = '', location: str = '', min_score: float = None, max_score: float = None,
+               tags: Sequence[str] = (), limit: int = 20, cursor: str = None) -> Tuple[List[msgspec.Raw], Optional[str]]:
+        """One page of matching leads, best fit first, plus the cursor for the next page (None at the end)"""
+        limit = max(1, min(int(limit), self.max_limit))
+        upper = decode_cursor(cursor) if cursor else None  # Exclusive rank bound
+        rank, sql, params = self._filtered(query, location, min_score, max_score, tags, upper)
+        sql = f"SELECT {rank}, leads.data {sql} ORDER BY {rank} DESC LIMIT ?"
+        params.append(limit + 1)
+
+        started = time.perf_counter()
+        rows = self._db().execute(sql, params).fetchall()
+        with self._stats_lock:
+            self.stats['searches'] += 1
+            self.stats['search_seconds'] += time.perf_counter() - started
+
+        next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        return [msgspec.Raw(data) for _, data in rows[:limit]], next_cursor
+
+    def scan(self, query: str = '', location: str = '', min_score: float = None, max_score: float = None,
+             tags: Sequence[str] = (), chunk_size: int = 10000) -> Iterator[List[bytes]]:
+        """Every matching lead's stored JSON, best fit first, in chunks of up to ``chunk_size``.
+
+        Same filters as search, but with no page limit: each chunk is its own
+        keyset query, so no read transaction stays open between chunks and
+        only one chunk is held in memory at a time.
+        """
+        upper = None
+        while True:
+            rank, sql, params = self._filtered(query, location, min_score, max_score, tags, upper)
+            params.append(chunk_size)
+            rows = self._db().execute(f"SELECT {rank}, leads.data {sql} ORDER BY {rank} DESC LIMIT ?", params).fetchall()
+            if rows:
+                yield [data for _, data in rows]
+            if len(rows) < chunk_size:
+                return
+            upper = rows[-1][0]
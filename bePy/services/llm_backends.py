@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+
+class RetryableBackendError(Exception):
+    """Transient backend failure (rate limit, 5xx) that is worth retrying"""
+
+
+class ChatCompletionsBackend:
+    """OpenAI-compatible /chat/completions backend.
+
+    Works against api.openai.com or any compatible server, including the
+    local stub in benchmarks/llm_stub_server.py. Any object with the same
+    async ``complete`` signature can be passed to SemanticTaggingService.
+    """
+
+    def __init__(self, base_url: str, api_key: str = None, model: str = "gpt-3.5-turbo"):
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.api_key = api_key
+        self.model = model
+
+    async def complete(self, session: 'aiohttp.ClientSession', messages: List[Dict],
+                       max_tokens: int, temperature: float, timeout: float) -> str:
+        """Send one chat completion request and return the message text"""
+        import aiohttp  # Deferred: the app only loads it when an LLM endpoint is configured
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+        }
+        async with session.post(self.url, json=payload, headers=headers,
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status == 429 or response.status >= 500:
+                raise RetryableBackendError(f"HTTP {response.status}")
+            response.raise_for_status()
+            data = await response.json()
+            return data['choices'][0]['message']['content']
@@ -1,34 +1,35 @@
-from typing import List
-import random
-import uuid
+from typing import Iterator, List, Union
+from config import Config
 from models import BaseLead
+from lead_batch import LeadBatch
+from utils.metrics import span
+from .lead_generator import DEFAULT_COMPANIES, DEFAULT_INDUSTRIES, LeadGenerator
 
 class MockDataService:
-    def __init__(self):
-        self.companies = [
-            "TechFlow Solutions", "DataPipe Inc", "CloudBridge Corp", 
-            "StreamLine Systems", "NextGen Analytics", "FlexiCode LLC"
-        ]
-        self.industries = [
-            "Technology", "Software", "SaaS", "E-commerce", "Healthcare", "Finance"
-        ]
+    def __init__(self, seed: int = None, realistic: bool = None):
+        self.companies = list(DEFAULT_COMPANIES)
+        self.industries = list(DEFAULT_INDUSTRIES)
+        self.generator = LeadGenerator(
+            seed=Config.MOCK_SEED if seed is None else seed,
+            realistic=Config.MOCK_REALISTIC if realistic is None else realistic,
+            companies=self.companies, industries=self.industries
+        )
     
-    def generate_leads(self, count: int = 50) -> List[BaseLead]:
-        leads = []
-        for i in range(count):
-            company = random.choice(self.companies)
-            industry = random.choice(self.industries) if hasattr(self, 'industries') else 'Technology'
-            
-            lead = BaseLead(
-                company=f"{company} {i+1}",
-                industry=industry,
-                website=f"https://{company.lower().replace(' ', '')}.com",
-                phone=f"+1-555-{random.randint(100,999)}-{random.randint(1000,9999)}",
-                address=f"{random.randint(100,9999)} Business St, City, ST 12345",
-                employees=random.choice([10, 25, 50, 100, 250, 500]),  # ADD THIS
-                revenue=random.choice(["$1M-$5M", "$5M-$25M", "$25M+", "Startup"]),  # ADD THIS
-                business_type=random.choice(["B2B", "B2C"])  # ADD THIS
-            )
-            leads.append(lead)
+    def generate_leads(self, count: int = 50, columnar: bool = False, start: int = 0) -> Union[List[BaseLead], LeadBatch]:
+        with span('generation', count):
+            if columnar:
+                return self.generate_batch(count, start)
+            return list(self.iter_leads(count, start))
+    
+    def generate_batch(self, count: int = 50, start: int = 0) -> LeadBatch:
+        """Generate leads straight into columns, never building per-lead objects.
         
-        return leads
\ No newline at end of file
+        Companies are numbered from ``start + 1``, so successive calls with
+        advancing starts produce distinct companies.
+        """
+        return self.generator.generate(count, start)
+    
+    def iter_leads(self, count: int = 50, start: int = 0, chunk_size: int = 1000) -> Iterator[BaseLead]:
+        """Yield leads one at a time, generated a column chunk at a time, so large counts never sit in memory"""
+        for chunk_start in range(start, start + count, chunk_size):
+            yield from self.generate_batch(min(chunk_size, start + count - chunk_start), chunk_start).to_leads()
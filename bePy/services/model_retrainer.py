@@ -0,0 +1,233 @@
+from typing import Dict, Optional
+import argparse
+import fcntl
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from config import Config
+from utils.log import configure_logging
+from .lead_store import LeadStore
+from .model_selection import read_report, search, selection_metrics, write_report
+from .scoring import MLScoringService, model_size
+
+logger = logging.getLogger(__name__)
+
+MODES = ('auto', 'full', 'warm_start', 'search')
+
+
+def retrain(model_dir: str, store_path: str, mode: str, options: Dict) -> Dict:
+    """Fit a candidate model on stored leads, check it on a holdout and publish it if it holds up.
+
+    Runs in its own process (``python -m services.model_retrainer``). A lock
+    file keeps retrains started by different server workers from racing; the
+    loser reports 'skipped'.
+    """
+    started = time.perf_counter()
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, 'retrain.lock'), 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return {'status': 'skipped', 'reason': 'another retrain is running'}
+        result = _retrain_locked(model_dir, store_path, mode, options)
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def _retrain_locked(model_dir: str, store_path: str, mode: str, options: Dict) -> Dict:
+    scorer = MLScoringService(model_dir=model_dir)
+    scorer.load_model()
+    base = scorer.state
+    warm = (base is not None and mode in ('auto', 'warm_start') and hasattr(base.model, 'estimators_')
+            and len(base.model.estimators_) + options['add_trees'] <= options['max_trees'])
+    if mode == 'warm_start' and not warm:
+        return {'status': 'skipped', 'reason': 'no model to grow' if base is None else 'tree limit reached'}
+
+    # Warm start only sees leads written since the live model; a full refit sees the newest max_rows
+    rows = LeadStore(db_path=store_path).load_recent(since=base.trained_through if warm else None,
+                                                     limit=options['max_rows'])
+    needed = options['min_new_leads'] if mode == 'auto' else 10
+    if len(rows) < needed:
+        return {'status': 'skipped', 'reason': f"{len(rows)} new leads, need {needed}"}
+
+    df = scorer.prepare_training_data([lead for _, lead in rows])
+    order = np.random.default_rng().permutation(len(df))
+    n_holdout = max(1, int(len(df) * options['holdout']))
+    holdout, train = df.iloc[order[:n_holdout]], df.iloc[order[n_holdout:]]
+    targets = train['target_score'].to_numpy()
+    holdout_targets = holdout['target_score'].to_numpy()
+
+    # Score the live model first: growing it below extends its forest in place
+    baseline_mae = float(np.mean(np.abs(scorer.score_state(base, holdout) - holdout_targets))) if base else None
+    report = None
+    if warm:
+        # New categories map to the 'unseen' code until the next full refit re-fits the encoders
+        candidate = scorer.grow_state(base, train, targets, options['add_trees'], trained_through=rows[0][0])
+    elif mode == 'search' or (mode == 'auto' and options['search']):
+        # Pick the model on the training rows only; the holdout below still judges the winner
+        report = search(train, targets)
+        write_report(model_dir, report)  # Also when the winner is rejected, so the search isn't rerun at every start
+        candidate = scorer.fit_state(train, targets, params=report['winner']['params'], trained_through=rows[0][0])
+        candidate.metrics.update(selection_metrics(report))
+    else:
+        # A plain full refit keeps the model kind and size the last search chose
+        params = base.metrics.get('params') if base else None
+        candidate = scorer.fit_state(train, targets, params=params, trained_through=rows[0][0])
+    candidate_mae = float(np.mean(np.abs(scorer.score_state(candidate, holdout) - holdout_targets)))
+
+    candidate.metrics.update({
+        'mode': 'warm_start' if warm else 'search' if report else 'full',
+        'train_rows': len(train),
+        'holdout_rows': n_holdout,
+        'holdout_mae': round(candidate_mae, 4),
+        'baseline_mae': round(baseline_mae, 4) if baseline_mae is not None else None,
+        'n_estimators': model_size(candidate.model),
+    })
+    if baseline_mae is not None and candidate_mae > baseline_mae * (1 + options['tolerance']):
+        return {'status': 'rejected', **candidate.metrics}
+    scorer.publish(candidate)
+    if report is not None:
+        write_report(model_dir, report, version=candidate.version)
+    return {'status': 'published', 'version': candidate.version, **candidate.metrics}
+
+
+class ModelRetrainer:
+    """Retrains the lead scoring model in the background and hot-swaps it in once it validates.
+
+    Training runs in a child process, so serving threads never wait on it.
+    A published version is announced through the scorer's pointer file, which
+    every worker process (this one included) picks up on its next prediction;
+    requests already scoring finish on the version they started with.
+    """
+
+    def __init__(self, scorer: MLScoringService, lead_store: LeadStore, interval: float = None,
+                 min_new_leads: int = None, max_rows: int = None, holdout: float = None, tolerance: float = None,
+                 add_trees: int = None, max_trees: int = None):
+        self.scorer = scorer
+        self.lead_store = lead_store
+        self.interval = Config.RETRAIN_INTERVAL if interval is None else interval
+        overrides = {'min_new_leads': min_new_leads, 'max_rows': max_rows, 'holdout': holdout,
+                     'tolerance': tolerance, 'add_trees': add_trees, 'max_trees': max_trees}
+        self.options = self.default_options()
+        self.options.update({key: value for key, value in overrides.items() if value is not None})
+        self.stats = {'runs': 0, 'published': 0, 'rejected': 0, 'skipped': 0, 'failed': 0}
+        self.last_result = {}
+        self._lock = threading.Lock()
+        self._running: Optional[subprocess.Popen] = None
+        self._stopping = threading.Event()
+        self._thread = None
+        self._started_pid = None
+
+    @staticmethod
+    def default_options() -> Dict:
+        return {
+            'min_new_leads': Config.RETRAIN_MIN_NEW_LEADS,
+            'max_rows': Config.RETRAIN_MAX_ROWS,
+            'holdout': Config.RETRAIN_HOLDOUT,
+            'tolerance': Config.RETRAIN_TOLERANCE,
+            'add_trees': Config.RETRAIN_ADD_TREES,
+            'max_trees': Config.RETRAIN_MAX_TREES,
+            'search': Config.RETRAIN_SEARCH,
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['running'] = self._running is not None
+            stats['last_result'] = dict(self.last_result)
+        stats['model'] = self.scorer.get_info()
+        return stats
+
+    def ensure_started(self):
+        """Start the periodic retrain check in this process (again after a fork)"""
+        with self._lock:
+            if self.interval <= 0 or self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            self._running = None  # A fork doesn't inherit the parent's child process
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._watch, name='model-retrainer', daemon=True)
+            self._thread.start()
+        state = self.scorer.state
+        if (self.options['search'] and state is not None and 'params' not in state.metrics
+                and read_report(self.scorer.model_dir) is None):
+            # The bootstrap model is a default forest; look for the fastest one that is as accurate
+            self.trigger('search')
+
+    def stop(self):
+        self._stopping.set()
+
+    def _watch(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                since = self.scorer.state.trained_through if self.scorer.state else None
+                if self.lead_store.count(since=since) >= self.options['min_new_leads']:
+                    self.trigger()
+            except Exception as e:
+                logger.warning("Retrain check failed: %s", e)
+
+    def trigger(self, mode: str = 'auto') -> bool:
+        """Start a retrain unless one is already running; returns whether one was started"""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        with self._lock:
+            if self._running is not None:
+                return False
+            # A fresh interpreter rather than multiprocessing, which would re-import the app in the child
+            self._running = subprocess.Popen(
+                [sys.executable, '-m', 'services.model_retrainer', '--mode', mode,
+                 '--model-dir', os.path.abspath(self.scorer.model_dir),
+                 '--store', os.path.abspath(self.lead_store.db_path), '--options', json.dumps(self.options)],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                stdout=subprocess.PIPE, text=True
+            )
+            self.stats['runs'] += 1
+            process = self._running
+        logger.info("Retraining lead scorer (%s) in the background (pid %d)", mode, process.pid)
+        threading.Thread(target=self._wait, args=(process,), name='model-retrain-wait', daemon=True).start()
+        return True
+
+    def _wait(self, process: subprocess.Popen):
+        output, _ = process.communicate()
+        lines = output.strip().splitlines()
+        try:
+            result = json.loads(lines[-1])  # The child prints its result as the last line
+        except (IndexError, ValueError):
+            result = {'status': 'failed', 'error': f"retrain process exited with code {process.returncode}"}
+        if result['status'] == 'published':
+            self.scorer.maybe_reload(force=True)
+            logger.info("Lead scorer v%s published (%s, holdout MAE %s vs %s)", result['version'], result['mode'],
+                        result['holdout_mae'], result['baseline_mae'])
+        else:
+            logger.warning("Retrain %s: %s", result['status'], result.get('reason') or result.get('error') or result)
+        with self._lock:
+            self.stats[result['status']] += 1
+            self.last_result = result
+            self._running = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the lead scoring model on stored leads")
+    parser.add_argument('--mode', choices=MODES, default='auto')
+    parser.add_argument('--model-dir', default=Config.MODEL_DIR)
+    parser.add_argument('--store', default=Config.LEAD_STORE_PATH)
+    parser.add_argument('--options', default='{}', help="JSON overrides for the RETRAIN_* settings")
+    args = parser.parse_args()
+    configure_logging(Config.LOG_LEVEL)  # Logs go to stderr; stdout carries only the result line
+
+    options = ModelRetrainer.default_options()
+    options.update(json.loads(args.options))
+    try:
+        result = retrain(args.model_dir, args.store, args.mode, options)
+    except Exception as e:
+        result = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
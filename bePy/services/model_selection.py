@@ -0,0 +1,204 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import KFold
+from config import Config
+from utils.compiled_forest import CompiledForest
+from utils.log import configure_logging
+from .feature_pipeline import FEATURE_COLS
+from .scoring import MLScoringService, build_model
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = 'model_selection.json'  # Report of the latest search, next to the model artifacts
+
+_worker_data = None  # (X, y, latency lock) shipped once to each search process
+
+
+def default_candidates() -> List[Dict]:
+    """The search grid from config: forest sizes x depths, plus HistGradientBoosting iteration counts"""
+    candidates = [
+        {'kind': 'forest', 'n_estimators': n_estimators, 'max_depth': max_depth}
+        for n_estimators in Config.MODEL_SEARCH_TREES for max_depth in Config.MODEL_SEARCH_DEPTHS
+    ]
+    candidates += [
+        {'kind': 'hist_gb', 'max_iter': max_iter, 'max_depth': max_depth}
+        for max_iter in Config.MODEL_SEARCH_GB_ITERATIONS for max_depth in Config.MODEL_SEARCH_DEPTHS
+    ]
+    return candidates
+
+
+def _init_search_worker(X: np.ndarray, y: np.ndarray, latency_lock):
+    global _worker_data
+    _worker_data = (X, y, latency_lock)
+
+
+def _evaluate(params: Dict, folds: int, seed: int, latency_batch: int) -> Dict:
+    """Cross-validated MAE of one candidate, plus its scoring latency on held-out rows"""
+    X, y, latency_lock = _worker_data
+    maes, fit_seconds, model, test_rows = [], 0.0, None, None
+    for train_idx, test_idx in KFold(folds, shuffle=True, random_state=seed).split(X):
+        model = build_model(params)
+        if isinstance(model, RandomForestRegressor):
+            model.set_params(n_jobs=1)  # The pool already runs one candidate per core
+        started = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_seconds += time.perf_counter() - started
+        maes.append(float(np.mean(np.abs(np.clip(model.predict(X[test_idx]), 1.0, 10.0) - y[test_idx]))))
+        test_rows = X[test_idx]
+    # One measurement at a time across the pool, so candidates aren't timed against each other
+    with latency_lock:
+        latency = _latency_ms_per_1k(model, test_rows, latency_batch)
+    return {
+        'params': params,
+        'mae': round(float(np.mean(maes)), 4),
+        'mae_std': round(float(np.std(maes)), 4),
+        'fit_seconds': round(fit_seconds / folds, 3),
+        'latency_ms_per_1k': round(latency, 3),
+    }
+
+
+def _latency_ms_per_1k(model, rows: np.ndarray, batch: int, repeats: int = 5) -> float:
+    """Milliseconds to score 1000 rows in request-sized batches, through the engine that would serve them"""
+    rows = rows[np.arange(1000) % len(rows)]
+    predict = model.predict
+    if (isinstance(model, RandomForestRegressor) and Config.SCORING_ENGINE == 'compiled'
+            and batch <= Config.SCORING_COMPILED_MAX_ROWS):
+        predict = CompiledForest.from_sklearn(model).predict
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for start in range(0, len(rows), batch):
+            predict(rows[start:start + batch])
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def select(results: List[Dict], tolerance: float, target_mae: float = None) -> Dict:
+    """The fastest candidate whose CV MAE meets the target (by default within ``tolerance`` of the best)"""
+    best_mae = min(result['mae'] for result in results)
+    threshold = target_mae if target_mae is not None else best_mae * (1 + tolerance)
+    qualified = [result for result in results if result['mae'] <= threshold]
+    if not qualified:  # An absolute target nobody meets: fall back to the most accurate
+        qualified = [min(results, key=lambda result: result['mae'])]
+    return min(qualified, key=lambda result: (result['latency_ms_per_1k'], result['mae']))
+
+
+def search(features: pd.DataFrame, targets: np.ndarray, candidates: List[Dict] = None, folds: int = None,
+           processes: int = None, tolerance: float = None, target_mae: float = None, seed: int = 0) -> Dict:
+    """Cross-validate every candidate in a process pool and pick the winner; returns the report.
+
+    Features are encoded once up front. Label encoding and scaling are fit
+    without targets, so sharing them across folds leaks nothing the model
+    could use.
+    """
+    candidates = candidates or default_candidates()
+    folds = folds or Config.MODEL_SEARCH_FOLDS
+    tolerance = Config.MODEL_SEARCH_TOLERANCE if tolerance is None else tolerance
+    target_mae = Config.MODEL_SEARCH_TARGET_MAE if target_mae is None else target_mae
+    processes = min(processes or Config.MODEL_SEARCH_PROCESSES, len(candidates))
+    _, _, X = MLScoringService.fit_encoders(features)
+    y = np.asarray(targets, dtype=np.float64)
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context('fork')
+    latency_lock = context.Lock()
+    args = (folds, seed, Config.MODEL_SEARCH_LATENCY_BATCH)
+    if processes <= 1:
+        _init_search_worker(X, y, latency_lock)
+        results = [_evaluate(params, *args) for params in candidates]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=_init_search_worker,
+                                 initargs=(X, y, latency_lock)) as pool:
+            futures = [pool.submit(_evaluate, params, *args) for params in candidates]
+            results = [future.result() for future in futures]
+
+    winner = select(results, tolerance, target_mae)
+    return {
+        'rows': len(y),
+        'folds': folds,
+        'tolerance': tolerance,
+        'target_mae': target_mae,
+        'seconds': round(time.perf_counter() - started, 2),
+        'winner': winner,
+        'candidates': sorted(results, key=lambda result: result['mae']),
+    }
+
+
+def selection_metrics(report: Dict) -> Dict:
+    """The summary of a search that travels with the published model"""
+    winner = report['winner']
+    return {
+        'params': winner['params'],
+        'cv_mae': winner['mae'],
+        'latency_ms_per_1k': winner['latency_ms_per_1k'],
+        'search_candidates': len(report['candidates']),
+    }
+
+
+def write_report(model_dir: str, report: Dict, version: int = None):
+    path = os.path.join(model_dir, REPORT_FILE)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(dict(report, version=version), f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def read_report(model_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(model_dir, REPORT_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated model search; publishes the winner")
+    parser.add_argument('--model-dir', default=Config.MODEL_DIR)
+    parser.add_argument('--store', default=None, help="train on the newest stored leads (default: synthetic)")
+    parser.add_argument('--rows', type=int, default=Config.RETRAIN_MAX_ROWS)
+    parser.add_argument('--synthetic', type=int, default=20000, help="synthetic leads when no --store is given")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help="print the report without publishing")
+    args = parser.parse_args()
+    configure_logging(Config.LOG_LEVEL)
+
+    scorer = MLScoringService(model_dir=args.model_dir)
+    if args.store:
+        from .lead_store import LeadStore
+        rows = LeadStore(db_path=args.store).load_recent(limit=args.rows)
+        df, trained_through = scorer.prepare_training_data([lead for _, lead in rows]), rows[0][0] if rows else None
+    else:
+        from .lead_generator import LeadGenerator
+        df = scorer.prepare_training_data(LeadGenerator(seed=args.seed, realistic=True).generate(args.synthetic))
+        trained_through = None
+    report = search(df[FEATURE_COLS], df['target_score'].to_numpy(), processes=args.processes, seed=args.seed)
+
+    print(f"{report['rows']} rows, {report['folds']}-fold CV, {len(report['candidates'])} candidates "
+          f"in {report['seconds']}s")
+    print(f"  {'model':<44} {'CV MAE':>8} {'±':>7} {'fit s':>7} {'ms/1k rows':>11}")
+    for result in report['candidates']:
+        mark = '*' if result is report['winner'] else ' '
+        label = ', '.join(f"{key}={value}" for key, value in result['params'].items())
+        print(f"{mark} {label:<44} {result['mae']:8.4f} {result['mae_std']:7.4f} "
+              f"{result['fit_seconds']:7.2f} {result['latency_ms_per_1k']:11.2f}")
+    if args.dry_run:
+        return
+    state = scorer.fit_state(df[FEATURE_COLS], df['target_score'].to_numpy(), params=report['winner']['params'],
+                             trained_through=trained_through)
+    state.metrics.update(selection_metrics(report))
+    scorer.publish(state)
+    write_report(args.model_dir, report, version=state.version)
+    print(f"published v{state.version}: {report['winner']['params']}")
+
+
+if __name__ == '__main__':
+    main()
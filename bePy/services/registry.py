@@ -0,0 +1,147 @@
+from typing import Dict
+import logging
+import os
+import threading
+import time
+from config import Config
+from utils.process_stats import current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+class _service:
+    """Attribute built by the decorated method on first access, exactly once even if threads race for it.
+
+    Each service has its own lock, so building a slow one (the scorer) doesn't
+    hold up a request that only needs a cheap one (the lead store). Once built
+    the value sits in the instance __dict__ and is read without the lock.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.name = build.__name__
+        self.__doc__ = build.__doc__
+
+    def __get__(self, registry, owner):
+        if registry is None:
+            return self
+        with registry._lock_for(self.name):
+            if self.name not in registry.__dict__:
+                started = time.perf_counter()
+                registry.__dict__[self.name] = self.build(registry)
+                logger.debug("Built %s in %.2fs", self.name, time.perf_counter() - started)
+        return registry.__dict__[self.name]
+
+
+class ServiceRegistry:
+    """The backend's services, each constructed on first use.
+
+    The heavy libraries (pandas, scikit-learn, joblib, aiohttp) are imported
+    by the builders, not at module load, so importing the app and answering
+    liveness or search requests doesn't wait for them. warm_up() builds
+    everything, including loading or training the scoring model; readiness
+    reports whether it has finished.
+    """
+
+    SERVICES = ('lead_store', 'search_cache', 'mock_service', 'enrichment_service', 'job_queue', 'model_retrainer')
+
+    def __init__(self):
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._warmup_thread = None
+        self.warmup_error = None
+        self.warmup_seconds = None
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def built(self, name: str):
+        """The service if it has been built, else None; never builds it"""
+        return self.__dict__.get(name)
+
+    @_service
+    def lead_store(self):
+        from .lead_store import LeadStore
+        return LeadStore()
+
+    @_service
+    def search_cache(self):
+        from .search_cache import SearchCache
+        return SearchCache(
+            max_entries=Config.SEARCH_CACHE_SIZE,
+            max_bytes=int(Config.SEARCH_CACHE_MAX_MB * 2 ** 20),
+            ttl_seconds=Config.SEARCH_CACHE_TTL,
+            wait_timeout=Config.SEARCH_CACHE_WAIT
+        )
+
+    @_service
+    def mock_service(self):
+        """Generation, scoring (loads or trains the model), tagging and identity resolution"""
+        from .enhanced_mock_service import EnhancedMockService
+        service = EnhancedMockService()
+        if Config.USE_MOCK_DATA and self.lead_store.count() == 0:
+            seeded = service.seed_store(self.lead_store, Config.LEAD_STORE_SEED_COUNT)
+            logger.info("Seeded lead store with %d mock leads", seeded)
+        return service
+
+    @_service
+    def enrichment_service(self):
+        from .enrichment_service import EnrichmentService
+        return EnrichmentService(
+            scorer=self.mock_service.ml_scorer,
+            tagger=self.mock_service.semantic_tagger,
+            identity_index=self.mock_service.identity_index,
+            lead_store=self.lead_store
+        )
+
+    @_service
+    def job_queue(self):
+        from .job_queue import EnrichmentJobQueue
+        return EnrichmentJobQueue(self.enrichment_service)
+
+    @_service
+    def model_retrainer(self):
+        from .model_retrainer import ModelRetrainer
+        return ModelRetrainer(self.mock_service.ml_scorer, self.lead_store)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def warm_up(self):
+        """Build every service now, in this thread; readiness turns true once the model is loaded"""
+        started = time.perf_counter()
+        try:
+            for name in self.SERVICES:
+                getattr(self, name)
+        except Exception as e:
+            self.warmup_error = f"{type(e).__name__}: {e}"
+            logger.exception("Service warm-up failed")
+            return False
+        self.warmup_seconds = round(time.perf_counter() - started, 2)
+        self._ready.set()
+        logger.info("Services ready in %.2fs (pid %d, RSS %.1f MB)",
+                    self.warmup_seconds, os.getpid(), current_rss_mb())
+        return True
+
+    def warm_up_in_background(self, then=None):
+        """Run warm_up() in a thread, then ``then()`` if it succeeded; once per process"""
+        if self._warmup_thread is not None and self._warmup_thread.is_alive():
+            return
+
+        def run():
+            if self.warm_up() and then is not None:
+                then()
+
+        self._warmup_thread = threading.Thread(target=run, name='service-warmup', daemon=True)
+        self._warmup_thread.start()
+
+    def readiness(self) -> Dict:
+        state = {'ready': self.ready, 'pending': [name for name in self.SERVICES if self.built(name) is None]}
+        if self.warmup_error:
+            state['error'] = self.warmup_error
+        if self.warmup_seconds is not None:
+            state['warmup_seconds'] = self.warmup_seconds
+        return state
@@ -1,173 +1,443 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.model_selection import train_test_split
+import sklearn
 import joblib
+import json
+import logging
 import os
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, List, Optional, Union
+from config import Config
 from models import BaseLead
+from lead_batch import DictColumn, LeadBatch
+from utils.compiled_forest import CompiledForest
+from utils.metrics import span
+from .feature_pipeline import (
+    CATEGORICAL_COLS, FEATURE_COLS, TECH_KEYWORDS, FeaturePipeline, categorize_revenue, count_tech_keywords,
+    extract_address_state, extract_domain_extension, extract_features
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extract_features or the artifact layout changes so stale
+# artifacts on disk are retrained instead of silently mis-scoring.
+MODEL_SCHEMA_VERSION = 1
+POINTER_FILE = 'lead_scorer.json'  # Names the live artifact; replacing it is the reload signal
+LEGACY_ARTIFACT = 'lead_scorer.joblib'  # Unversioned artifact written before versioning
+
+
+def new_forest(n_estimators: int = 100, max_depth: int = 10, n_jobs: int = -1) -> RandomForestRegressor:
+    return RandomForestRegressor(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        random_state=42,
+        n_jobs=n_jobs
+    )
+
+
+def build_model(params: Dict):
+    """Unfitted regressor for model parameters such as {'kind': 'forest', 'n_estimators': 50, 'max_depth': 8}"""
+    options = dict(params)
+    kind = options.pop('kind', 'forest')
+    if kind == 'forest':
+        return new_forest(**options)
+    if kind == 'hist_gb':
+        return HistGradientBoostingRegressor(random_state=42, **options)
+    raise ValueError(f"unknown model kind {kind!r}")
+
+
+def model_size(model) -> int:
+    """Trees in a forest, boosting iterations in a gradient-boosted model"""
+    return len(model.estimators_) if hasattr(model, 'estimators_') else int(model.n_iter_)
+
+
+def compile_forest(model) -> Optional[CompiledForest]:
+    """Flatten the forest for fast small-batch scoring, or None if it doesn't reproduce predict()"""
+    if not isinstance(model, RandomForestRegressor):
+        return None  # Other model kinds are scored by sklearn
+    compiled = CompiledForest.from_sklearn(model)
+    probe = np.random.default_rng(0).normal(scale=3.0, size=(64, compiled.n_features))
+    if not np.allclose(compiled.predict(probe), model.predict(probe), rtol=0, atol=1e-9):
+        logger.warning("Compiled forest disagrees with the sklearn model; scoring with sklearn")
+        return None
+    return compiled
+
+
+def feature_importance(model) -> Dict:
+    """Impurity-based importances where the model has them (forests), else empty"""
+    importances = getattr(model, 'feature_importances_', None)
+    return dict(zip(FEATURE_COLS, importances)) if importances is not None else {}
+
+
+class ModelState:
+    """One trained model version: everything a prediction reads, swapped in as a unit"""
+    
+    def __init__(self, model, label_encoders: Dict, scaler: StandardScaler,
+                 feature_cols: List[str], feature_importance: Dict, version: int = 0,
+                 trained_at: float = None, trained_through: float = None, metrics: Dict = None):
+        self.model = model
+        self.label_encoders = label_encoders
+        self.scaler = scaler
+        self.feature_cols = feature_cols
+        self.feature_importance = feature_importance
+        self.version = version
+        self.trained_at = trained_at or time.time()
+        self.trained_through = trained_through or self.trained_at  # Newest training lead's timestamp
+        self.metrics = metrics or {}
+        self.compiled = compile_forest(model) if Config.SCORING_ENGINE == 'compiled' else None
+        self.pipeline = FeaturePipeline(label_encoders, scaler, feature_cols, cache_size=Config.FEATURE_CACHE_SIZE)
 
 class MLScoringService:
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            n_jobs=-1
-        )
-        self.label_encoders = {}
-        self.scaler = StandardScaler()
-        self.feature_importance = {}
-        self.is_trained = False
-        self.model_path = 'models/lead_scorer.joblib'
+    def __init__(self, model_dir: str = None):
+        self.state: Optional[ModelState] = None
+        self.model_dir = model_dir or Config.MODEL_DIR
+        self.model_path = os.path.join(self.model_dir, LEGACY_ARTIFACT)
+        self.pointer_path = os.path.join(self.model_dir, POINTER_FILE)
+        self.reload_interval = Config.MODEL_RELOAD_INTERVAL
+        self.compiled_max_rows = Config.SCORING_COMPILED_MAX_ROWS
+        self._pointer_mtime = None
+        self._next_reload_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._warned_untrained = False
+    
+    @property
+    def is_trained(self) -> bool:
+        return self.state is not None
+    
+    @property
+    def version(self) -> int:
+        return self.state.version if self.state else 0
+    
+    @property
+    def feature_importance(self) -> Dict:
+        return self.state.feature_importance if self.state else {}
         
     def extract_features(self, lead: BaseLead) -> Dict:
         """Extract ML features from lead data"""
-        return {
-            'industry': lead.industry,
-            'employees': lead.employees or 10,  
-            'has_phone': 1 if lead.phone else 0,
-            'has_website': 1 if lead.website else 0,
-            'website_length': len(lead.website) if lead.website else 0,
-            'company_name_length': len(lead.company),
-            'address_state': lead.address.split(',')[-1].strip() if ',' in lead.address else 'Unknown',
-            'revenue_category': self._categorize_revenue(getattr(lead, 'revenue', None)),
-            'business_type': getattr(lead, 'business_type', 'Unknown'),
-            'domain_extension': self._extract_domain_extension(lead.website),
-            'company_name_keywords': self._count_tech_keywords(lead.company),
-        }
+        return extract_features(lead)
     
-    def _categorize_revenue(self, revenue: str) -> str:
-        """Categorize revenue into buckets"""
-        if not revenue:
-            return 'Unknown'
-        if '$1M-$5M' in revenue:
-            return 'Small'
-        elif '$5M-$25M' in revenue:
-            return 'Medium'
-        elif '$25M+' in revenue:
-            return 'Large'
-        return 'Startup'
-    
-    def _extract_domain_extension(self, website: str) -> str:
-        """Extract domain extension (.com, .io, etc.)"""
-        if not website:
-            return 'none'
-        try:
-            return website.split('.')[-1].lower()
-        except:
-            return 'unknown'
+    def extract_features_batch(self, batch: LeadBatch) -> Dict[str, Union[np.ndarray, DictColumn]]:
+        """Column-at-a-time equivalent of extract_features for a whole LeadBatch.
+        
+        Numeric features come back as arrays and categorical ones as DictColumns.
+        String work runs over the batch's shared byte buffers with ASCII rules;
+        rows holding non-ASCII text are recomputed with the scalar helpers so
+        results always match extract_features exactly.
+        """
+        company = batch.company.ascii_lower()
+        website_lengths = batch.website.lengths()
+        
+        start, end, has_comma = batch.address.last_field(',', strip=True)
+        address_state = batch.address.spans_to_dict(start, end).with_default(~has_comma, 'Unknown')
+        
+        start, end, _ = batch.website.last_field('.')
+        domain_extension = batch.website.ascii_lower().spans_to_dict(start, end)
+        domain_extension = domain_extension.with_default(website_lengths == 0, 'none')
+        
+        features = {
+            'industry': batch.industry,
+            'employees': np.where(batch.employees.valid & (batch.employees.values != 0),
+                                  batch.employees.values, 10),
+            'has_phone': (batch.phone.lengths() > 0).astype(np.int64),
+            'has_website': (website_lengths > 0).astype(np.int64),
+            'website_length': website_lengths,
+            'company_name_length': batch.company.lengths(),
+            'address_state': address_state,
+            'revenue_category': batch.revenue.map(categorize_revenue),
+            'business_type': batch.business_type,
+            'domain_extension': domain_extension,
+            'company_name_keywords': sum(company.contains(keyword).astype(np.int64) for keyword in TECH_KEYWORDS),
+        }
+        
+        rows = np.flatnonzero(batch.company.non_ascii())
+        for i in rows:
+            features['company_name_keywords'][i] = count_tech_keywords(batch.company[i])
+        rows = np.flatnonzero(batch.address.non_ascii())
+        if len(rows):
+            features['address_state'] = address_state.with_values(
+                rows, [extract_address_state(batch.address[i]) for i in rows])
+        rows = np.flatnonzero(batch.website.non_ascii())
+        if len(rows):
+            features['domain_extension'] = domain_extension.with_values(
+                rows, [extract_domain_extension(batch.website[i]) for i in rows])
+        return features
     
-    def _count_tech_keywords(self, company_name: str) -> int:
-        """Count technology-related keywords in company name"""
-        tech_keywords = ['tech', 'data', 'software', 'digital', 'cloud', 'ai', 'solutions', 'systems']
-        return sum(1 for keyword in tech_keywords if keyword.lower() in company_name.lower())
+    def feature_frame(self, leads: Union[LeadBatch, List[BaseLead]]) -> pd.DataFrame:
+        """Unencoded features of a LeadBatch (or list of leads), one row per lead"""
+        if isinstance(leads, LeadBatch):
+            columns = self.extract_features_batch(leads)
+            return pd.DataFrame({
+                col: columns[col].to_list() if col in CATEGORICAL_COLS else columns[col] for col in FEATURE_COLS
+            })
+        return pd.DataFrame([extract_features(lead) for lead in leads], columns=FEATURE_COLS)
     
-    def prepare_training_data(self, leads: List[BaseLead]) -> pd.DataFrame:
+    def prepare_training_data(self, leads: Union[LeadBatch, List[BaseLead]]) -> pd.DataFrame:
         """Convert leads to ML-ready DataFrame"""
-        features_list = []
-        for lead in leads:
-            features = self.extract_features(lead)
-            features['target_score'] = self._generate_target_score(features)
-            features_list.append(features)
-        
-        return pd.DataFrame(features_list)
+        df = self.feature_frame(leads)
+        df['target_score'] = self._generate_target_scores(df)
+        return df
     
-    def _generate_target_score(self, features: Dict) -> float:
+    def _generate_target_scores(self, features: pd.DataFrame) -> np.ndarray:
         """Generate realistic target scores for training"""
-        score = 5.0 
+        score = self.rule_scores(features) + np.random.normal(0, 0.5, size=len(features))
+        return np.clip(score, 1.0, 10.0)
+    
+    @staticmethod
+    def rule_scores(features: pd.DataFrame) -> np.ndarray:
+        """Hand-weighted, unclipped scores: the training targets before noise, and the no-model fallback"""
+        score = np.full(len(features), 5.0)
         
         high_value_industries = ['Technology', 'Finance', 'Healthcare', 'SaaS']
-        if features['industry'] in high_value_industries:
-            score += 2.0
+        score += np.where(features['industry'].isin(high_value_industries), 2.0, 0.0)
         
-        if features['employees'] > 100:
-            score += 1.5
-        elif features['employees'] > 50:
-            score += 1.0
+        employees = features['employees'].to_numpy()
+        score += np.select([employees > 100, employees > 50], [1.5, 1.0], 0.0)
         
         revenue_scores = {'Large': 2.0, 'Medium': 1.5, 'Small': 1.0, 'Startup': 0.5}
-        score += revenue_scores.get(features['revenue_category'], 0)
+        score += features['revenue_category'].map(revenue_scores).fillna(0).to_numpy()
         
-        score += features['has_phone'] * 0.5
-        score += features['has_website'] * 0.5
+        score += features['has_phone'].to_numpy() * 0.5
+        score += features['has_website'].to_numpy() * 0.5
         
-        score += features['company_name_keywords'] * 0.3
+        score += features['company_name_keywords'].to_numpy() * 0.3
         
-        if features['business_type'] == 'B2B':
-            score += 1.0
+        score += np.where(features['business_type'] == 'B2B', 1.0, 0.0)
         
-        score += np.random.normal(0, 0.5)
-        
-        return min(max(score, 1.0), 10.0)  
+        return score
     
-    def train_model(self, leads: List[BaseLead]):
+    def train_model(self, leads: Union[LeadBatch, List[BaseLead]]):
         """Train the ML model"""
         df = self.prepare_training_data(leads)
+        state = self.fit_state(df[FEATURE_COLS], df['target_score'].to_numpy())
+        self.publish(state)
+        self.state = state
         
-        feature_cols = [col for col in df.columns if col != 'target_score']
-        X = df[feature_cols].copy()
-        y = df['target_score']
-        
-        categorical_cols = ['industry', 'address_state', 'revenue_category', 'business_type', 'domain_extension']
-        for col in categorical_cols:
-            if col in X.columns:
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-                self.label_encoders[col] = le
+        top = sorted(state.feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]
+        logger.info("Model trained with %d leads; top features: %s", len(leads),
+                    ', '.join(f"{feature} {importance:.3f}" for feature, importance in top))
+    
+    def fit_state(self, features: pd.DataFrame, targets: np.ndarray, n_estimators: int = 100,
+                  trained_through: float = None, params: Dict = None) -> ModelState:
+        """Fit encoders, scaler and a fresh model on a feature frame.
         
-        numerical_cols = [col for col in X.columns if col not in categorical_cols]
-        X[numerical_cols] = self.scaler.fit_transform(X[numerical_cols])
+        ``params`` (see build_model) choose the model, e.g. a model selection
+        winner; without them it is a forest of ``n_estimators`` trees.
+        """
+        label_encoders, scaler, X = self.fit_encoders(features)
+        model = build_model(params) if params else new_forest(n_estimators)
+        model.fit(X, targets)
+        state = ModelState(model, label_encoders, scaler, list(FEATURE_COLS), feature_importance(model),
+                           trained_through=trained_through)
+        if params:
+            state.metrics['params'] = dict(params)
+        return state
+    
+    @staticmethod
+    def fit_encoders(features: pd.DataFrame):
+        """Fitted label encoders and scaler for a feature frame, plus the frame encoded as a plain array"""
+        X = features[FEATURE_COLS].copy()
+        label_encoders = {}
+        for col in CATEGORICAL_COLS:
+            le = LabelEncoder()
+            X[col] = le.fit_transform(X[col].astype(str))
+            label_encoders[col] = le
         
-        self.model.fit(X, y)
-        self.feature_importance = dict(zip(feature_cols, self.model.feature_importances_))
-        self.is_trained = True
+        scaler = StandardScaler()
+        numerical_cols = [col for col in FEATURE_COLS if col not in CATEGORICAL_COLS]
+        X[numerical_cols] = scaler.fit_transform(X[numerical_cols].to_numpy())
         
-        os.makedirs('models', exist_ok=True)
-        joblib.dump({
-            'model': self.model,
-            'label_encoders': self.label_encoders,
-            'scaler': self.scaler,
-            'feature_importance': self.feature_importance
-        }, self.model_path)
+        # A plain array, so batch prediction can pass NumPy matrices directly
+        return label_encoders, scaler, X.to_numpy(dtype=np.float64)
+    
+    def grow_state(self, base: ModelState, features: pd.DataFrame, targets: np.ndarray, add_trees: int,
+                   trained_through: float = None) -> ModelState:
+        """Warm start: keep ``base``'s trees, encoders and scaler and fit ``add_trees`` more on new data.
         
-        print(f"Model trained with {len(leads)} leads")
-        print("Top feature importance:")
-        for feature, importance in sorted(self.feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]:
-            print(f"  {feature}: {importance:.3f}")
+        ``base.model`` is extended in place, so pass a state nothing else scores with.
+        """
+        X = base.pipeline.encode(self._frame_columns(features))
+        model = base.model
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees)
+        model.fit(X, targets)
+        model.set_params(warm_start=False)
+        state = ModelState(model, base.label_encoders, base.scaler, base.feature_cols, feature_importance(model),
+                           trained_through=trained_through)
+        if 'params' in base.metrics:
+            state.metrics['params'] = dict(base.metrics['params'], n_estimators=len(model.estimators_))
+        return state
+    
+    def score_state(self, state: ModelState, features: pd.DataFrame) -> np.ndarray:
+        """Predictions of a (possibly not yet published) model version for a feature frame"""
+        return np.clip(state.model.predict(state.pipeline.encode(self._frame_columns(features))), 1.0, 10.0)
+    
+    @staticmethod
+    def _frame_columns(features: pd.DataFrame) -> Dict[str, Union[np.ndarray, DictColumn]]:
+        return {
+            col: DictColumn.from_values(features[col].tolist()) if col in CATEGORICAL_COLS else features[col].to_numpy()
+            for col in FEATURE_COLS
+        }
     
     def predict_score(self, lead: BaseLead) -> float:
         """Predict lead score using trained model"""
+        return self.predict_scores([lead])[0]
+    
+    def predict_scores(self, leads: Union[LeadBatch, List[BaseLead]]) -> List[float]:
+        """Predict scores for a LeadBatch (or list of leads) with a single model call"""
+        if not len(leads):
+            return []
         if not self.is_trained:
             self.load_model()
-        
-        features = self.extract_features(lead)
-        df = pd.DataFrame([features])
-        
-        categorical_cols = ['industry', 'address_state', 'revenue_category', 'business_type', 'domain_extension']
-        for col in categorical_cols:
-            if col in df.columns and col in self.label_encoders:
-                try:
-                    df[col] = self.label_encoders[col].transform(df[col].astype(str))
-                except ValueError:
-                    df[col] = 0
-        
-        numerical_cols = [col for col in df.columns if col not in categorical_cols]
-        df[numerical_cols] = self.scaler.transform(df[numerical_cols])
-        
-        score = self.model.predict(df)[0]
-        return min(max(score, 1.0), 10.0)
-    
-    def load_model(self):
-        """Load trained model"""
-        if os.path.exists(self.model_path):
-            data = joblib.load(self.model_path)
-            self.model = data['model']
-            self.label_encoders = data['label_encoders']
-            self.scaler = data['scaler']
-            self.feature_importance = data['feature_importance']
-            self.is_trained = True
-            print("Model loaded successfully")
         else:
-            print("No trained model found")
\ No newline at end of file
+            self.maybe_reload()
+        state = self.state  # One version for the whole batch, even if a reload lands meanwhile
+        if state is None:
+            # No usable artifact (missing, unreadable or rejected); score by the rules the model is trained on
+            if not self._warned_untrained:
+                logger.warning("No usable scoring model; falling back to rule-based scores")
+                self._warned_untrained = True
+            return np.clip(self.rule_scores(self.feature_frame(leads)), 1.0, 10.0).tolist()
+        
+        with span('features', len(leads)):
+            if isinstance(leads, LeadBatch):
+                X = state.pipeline.encode(self.extract_features_batch(leads))
+            else:
+                # Objects already exist here; the per-lead path beats columnizing them first
+                X = state.pipeline.transform(leads)
+        with span('predict', len(leads)):
+            if state.compiled is not None and len(X) <= self.compiled_max_rows:
+                # No sklearn validation or thread fan-out; large batches are faster in sklearn's Cython loop
+                scores = state.compiled.predict(X)
+            else:
+                scores = state.model.predict(X)
+        return np.clip(scores, 1.0, 10.0).tolist()
+    
+    def _read_pointer(self) -> Dict:
+        try:
+            with open(self.pointer_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def publish(self, state: ModelState):
+        """Save ``state`` as the next versioned artifact and point every worker at it"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        state.version = self._read_pointer().get('version', 0) + 1
+        artifact = f"lead_scorer-v{state.version:05d}.joblib"
+        tmp_path = os.path.join(self.model_dir, f"{artifact}.{os.getpid()}.tmp")
+        joblib.dump({
+            'schema_version': MODEL_SCHEMA_VERSION,
+            'sklearn_version': sklearn.__version__,
+            'feature_cols': state.feature_cols,
+            'categorical_cols': CATEGORICAL_COLS,
+            'model': state.model,
+            'label_encoders': state.label_encoders,
+            'scaler': state.scaler,
+            'feature_importance': state.feature_importance,
+            'version': state.version,
+            'trained_at': state.trained_at,
+            'trained_through': state.trained_through,
+            'metrics': state.metrics
+        }, tmp_path)
+        # Atomic renames: the artifact is complete before the pointer names it,
+        # so other workers never load a half-written file
+        os.replace(tmp_path, os.path.join(self.model_dir, artifact))
+        pointer_tmp = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(pointer_tmp, 'w') as f:
+            json.dump({'version': state.version, 'artifact': artifact, 'trained_at': state.trained_at,
+                       'n_estimators': model_size(state.model), 'metrics': state.metrics}, f)
+        os.replace(pointer_tmp, self.pointer_path)
+        self._prune_artifacts(state.version)
+    
+    def _prune_artifacts(self, current_version: int):
+        """Delete old versions; workers still scoring with one keep their mapping until they reload"""
+        for name in os.listdir(self.model_dir):
+            if name.startswith('lead_scorer-v') and name.endswith('.joblib'):
+                version = int(name[len('lead_scorer-v'):-len('.joblib')])
+                if version <= current_version - Config.MODEL_KEEP_VERSIONS:
+                    os.remove(os.path.join(self.model_dir, name))
+    
+    def _validate_artifact(self, data: Dict) -> str:
+        """Return a reason the artifact can't be used, or '' if it is valid"""
+        if not isinstance(data, dict):
+            return "unrecognized artifact format"
+        if data.get('schema_version') != MODEL_SCHEMA_VERSION:
+            return f"schema version {data.get('schema_version')} != {MODEL_SCHEMA_VERSION}"
+        if data.get('sklearn_version') != sklearn.__version__:
+            return f"built with scikit-learn {data.get('sklearn_version')}, running {sklearn.__version__}"
+        if data.get('feature_cols') != FEATURE_COLS or data.get('categorical_cols') != CATEGORICAL_COLS:
+            return "feature schema mismatch"
+        return ''
+    
+    def load_model(self) -> bool:
+        """Load the live model version, returning False if no valid artifact exists.
+        
+        On failure the model already loaded (if any) keeps serving.
+        """
+        try:
+            self._pointer_mtime = os.stat(self.pointer_path).st_mtime_ns
+        except FileNotFoundError:
+            self._pointer_mtime = None
+        pointer = self._read_pointer()
+        path = os.path.join(self.model_dir, pointer['artifact']) if pointer else self.model_path
+        if not os.path.exists(path):
+            logger.info("No trained model found")
+            return False
+        
+        try:
+            # mmap_mode lets forked workers share the artifact's arrays via the page cache
+            data = joblib.load(path, mmap_mode='r')
+        except Exception as e:
+            logger.warning("Model artifact could not be read: %s", e)
+            return False
+        
+        reason = self._validate_artifact(data)
+        if reason:
+            logger.warning("Ignoring model artifact at %s: %s", path, reason)
+            return False
+        
+        self.state = ModelState(
+            data['model'], data['label_encoders'], data['scaler'], data['feature_cols'],
+            data['feature_importance'], version=data.get('version', 0), trained_at=data.get('trained_at'),
+            trained_through=data.get('trained_through'), metrics=data.get('metrics')
+        )
+        logger.info("Model v%s loaded", self.state.version)
+        return True
+    
+    def maybe_reload(self, force: bool = False) -> bool:
+        """Swap in a newly published version if the pointer file changed (checked at most every few seconds)"""
+        now = time.monotonic()
+        if not force and now < self._next_reload_check:
+            return False
+        self._next_reload_check = now + self.reload_interval
+        try:
+            mtime = os.stat(self.pointer_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._pointer_mtime or not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._read_pointer().get('version') == self.version:
+                self._pointer_mtime = mtime
+                return False
+            # In-flight predictions hold the old state; new ones see the new state once assigned
+            return self.load_model()
+        finally:
+            self._reload_lock.release()
+    
+    def get_info(self) -> Dict:
+        state = self.state
+        if state is None:
+            return {'version': 0, 'trained': False}
+        return {
+            'version': state.version,
+            'trained': True,
+            'n_estimators': model_size(state.model),
+            'params': state.metrics.get('params'),
+            'engine': 'compiled' if state.compiled is not None else 'sklearn',
+            'trained_at': state.trained_at,
+            'metrics': state.metrics,
+            'feature_cache': state.pipeline.get_stats(),
+        }
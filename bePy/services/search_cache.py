@@ -0,0 +1,147 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Sequence, Tuple
+
+
+class _Flight:
+    """One in-progress computation that identical requests wait on"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SearchCache:
+    """Encoded /api/leads/search responses, keyed on the normalized request.
+
+    Entries expire ``ttl_seconds`` after they are computed, and the cache is
+    bounded both in entries and in body bytes, evicting the least recently
+    used. An entry is also dropped as soon as the lead store has been written
+    since it was computed (the caller passes the store's version), so the
+    TTL only bounds how long an unchanged result is reused.
+
+    Identical requests that miss at the same time are coalesced: the first
+    computes and the rest wait for its result (or its exception) instead of
+    running the same search again.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 2 ** 20, ttl_seconds: float = 30,
+                 wait_timeout: float = 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()  # key -> (expires_at, version, body, etag)
+        self._bytes = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'stale': 0, 'expirations': 0,
+                      'evictions': 0, 'errors': 0}
+
+    @staticmethod
+    def key_for(query: str = '', location: str = '', min_score: float = None, max_score: float = None,
+                tags: Sequence[str] = (), limit: int = 20, cursor: str = None) -> str:
+        """Hash of the search parameters after normalizing the ways one search can be spelled"""
+        def normalize(text):
+            return ' '.join((text or '').split())
+
+        params = [
+            normalize(query),
+            normalize(location),
+            None if min_score is None else float(min_score),
+            None if max_score is None else float(max_score),
+            sorted(set(tags or ())),
+            int(limit),
+            cursor or None,
+        ]
+        return hashlib.sha256(json.dumps(params, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def etag_for(body: bytes) -> str:
+        """Entity tag (unquoted) for a response body"""
+        return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes], version=None) -> Tuple[bytes, str, str]:
+        """(body, ETag, 'hit' | 'miss' | 'coalesced'), running ``compute`` only if no live entry or flight exists"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] <= now or entry[1] != version):
+                self._forget(key)
+                self.stats['expirations' if entry[0] <= now else 'stale'] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[2], entry[3], 'hit'
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats['misses'] += 1
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                with self._lock:
+                    self.stats['coalesced'] += 1
+                return flight.result[0], flight.result[1], 'coalesced'
+            # The leader is stuck; don't hold this request hostage to it
+            with self._lock:
+                self.stats['misses'] += 1
+            body = compute()
+            return body, self.etag_for(body), 'miss'
+
+        try:
+            body = compute()
+            flight.result = (body, self.etag_for(body))
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.stats['errors'] += 1
+                del self._flights[key]
+            flight.done.set()
+            raise
+        with self._lock:
+            del self._flights[key]
+            self._remember(key, (time.time() + self.ttl_seconds, version) + flight.result)
+        flight.done.set()
+        return flight.result[0], flight.result[1], 'miss'
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, key: str, entry: tuple):
+        """Insert an entry, evicting least recently used ones past either bound; call with the lock held"""
+        if len(entry[2]) > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        if key in self._entries:
+            self._forget(key)
+        self._entries[key] = entry
+        self._bytes += len(entry[2])
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._forget(next(iter(self._entries)))
+            self.stats['evictions'] += 1
+
+    def _forget(self, key: str):
+        self._bytes -= len(self._entries.pop(key)[2])
+
+    def get_stats(self) -> Dict:
+        """Snapshot of cache counters for /api/health"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+            stats['megabytes'] = round(self._bytes / 2 ** 20, 2)
+            stats['in_flight'] = len(self._flights)
+        served = stats['hits'] + stats['coalesced']
+        lookups = served + stats['misses']
+        stats['hit_rate'] = round(served / lookups, 4) if lookups else 0.0
+        return stats
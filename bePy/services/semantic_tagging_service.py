@@ -1,17 +1,223 @@
-import openai
+import asyncio
 import json
-import os
-from typing import List, Dict
+import logging
+import random
+import threading
+from typing import List, Dict, Optional
+from config import Config
 from models import BaseLead
+from utils.metrics import span
+from .llm_backends import ChatCompletionsBackend, RetryableBackendError
+from .tag_cache import TagCache
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "You are a B2B sales expert generating precise lead tags."
+BATCH_TOKENS_PER_LEAD = 40  # Room for ~5 short tags plus the id key
 
 class SemanticTaggingService:
-    def __init__(self):
-        # Fix for OpenAI client initialization
-        openai.api_key = os.getenv('OPENAI_API_KEY')
+    def __init__(self, backend=None, concurrency: int = None, timeout: float = None,
+                 max_retries: int = None, batch_size: int = None, tag_cache: TagCache = None):
+        self.backend = backend or self._default_backend()
+        self.tag_cache = tag_cache or TagCache(
+            max_entries=Config.TAG_CACHE_SIZE,
+            ttl_seconds=Config.TAG_CACHE_TTL,
+            db_path=Config.TAG_CACHE_PATH or None
+        )
+        self.concurrency = concurrency or Config.TAGGING_CONCURRENCY
+        self.timeout = timeout or Config.TAGGING_TIMEOUT
+        self.max_retries = Config.TAGGING_MAX_RETRIES if max_retries is None else max_retries
+        self.batch_size = batch_size or Config.TAGGING_BATCH_SIZE
+        self.stats = {
+            'requests': 0, 'retries': 0, 'failures': 0, 'fallbacks': 0,
+            'batch_requests': 0, 'batch_parse_failures': 0,
+            'batch_partial_responses': 0, 'batch_leads_retagged': 0,
+        }
+        self._stats_lock = threading.Lock()
+    
+    def _default_backend(self) -> Optional[ChatCompletionsBackend]:
+        """Use the configured endpoint if there is a key or a non-default URL"""
+        custom_url = Config.TAGGING_BASE_URL != 'https://api.openai.com/v1'
+        if not Config.OPENAI_API_KEY and not custom_url:
+            return None
+        return ChatCompletionsBackend(Config.TAGGING_BASE_URL, Config.OPENAI_API_KEY, Config.TAGGING_MODEL)
+    
+    def _bump(self, counter: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[counter] += amount
+    
+    def get_stats(self) -> Dict:
+        """Snapshot of tagging counters, including the batch parse failure rate"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        batch_requests = stats['batch_requests']
+        stats['batch_parse_failure_rate'] = (
+            round(stats['batch_parse_failures'] / batch_requests, 4) if batch_requests else 0.0
+        )
+        return stats
         
     def generate_semantic_tags(self, lead: BaseLead, scraped_content: str = None) -> List[str]:
-        """Generate semantic tags using OpenAI"""
+        """Generate semantic tags for a single lead"""
+        return self.generate_semantic_tags_batch([lead], [scraped_content])[0]
+    
+    def generate_semantic_tags_batch(self, leads: List[BaseLead],
+                                     scraped_contents: List[Optional[str]] = None) -> List[List[str]]:
+        """Tag many leads concurrently; blocks until every lead has tags"""
+        if not leads:
+            return []
+        with span('tagging', len(leads)):
+            if self.backend is None:
+                self._bump('fallbacks', len(leads))
+                return [self._fallback_tags(lead) for lead in leads]
+            return asyncio.run(self.agenerate_semantic_tags(leads, scraped_contents))
+    
+    async def agenerate_semantic_tags(self, leads: List[BaseLead],
+                                      scraped_contents: List[Optional[str]] = None) -> List[List[str]]:
+        """Tag leads from the cache, then the LLM, falling back per lead on failure"""
+        scraped_contents = scraped_contents or [None] * len(leads)
+        keys = [TagCache.key_for(lead, content) for lead, content in zip(leads, scraped_contents)]
+        results = self.tag_cache.get_many(keys)
+        
+        # Only the first lead per distinct uncached key goes to the LLM
+        pending = {}
+        for i, (key, tags) in enumerate(zip(keys, results)):
+            if tags is None and key not in pending:
+                pending[key] = i
+        
+        if pending:
+            indices = list(pending.values())
+            llm_tags = await self._agenerate_llm_tags(
+                [leads[i] for i in indices], [scraped_contents[i] for i in indices]
+            )
+            fresh = {keys[i]: tags for i, tags in zip(indices, llm_tags) if tags is not None}
+            self.tag_cache.set_many(fresh)
+            
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = fresh.get(key)
+        
+        failed = [i for i, tags in enumerate(results) if tags is None]
+        if failed:
+            self._bump('fallbacks', len(failed))
+            for i in failed:
+                results[i] = self._fallback_tags(leads[i])
+        return results
+    
+    async def _agenerate_llm_tags(self, leads: List[BaseLead],
+                                  scraped_contents: List[Optional[str]]) -> List[Optional[List[str]]]:
+        """Tag leads with bounded concurrency; None for each lead the LLM could not tag"""
+        import aiohttp  # Only needed once an LLM backend is configured
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def tag_one(lead, scraped_content):
+                async with semaphore:
+                    return await self._tag_with_retries(session, lead, scraped_content)
+            
+            if self.batch_size <= 1:
+                return await asyncio.gather(*(
+                    tag_one(lead, content) for lead, content in zip(leads, scraped_contents)
+                ))
+            
+            async def tag_chunk(start):
+                chunk = leads[start:start + self.batch_size]
+                contents = scraped_contents[start:start + self.batch_size]
+                async with semaphore:
+                    tagged = await self._tag_chunk(session, chunk, contents)
+                if tagged is None:
+                    # Whole batch request failed after retries: backend is unhealthy
+                    return [None] * len(chunk)
+                
+                missing = [i for i, tags in enumerate(tagged) if tags is None]
+                if missing:
+                    self._bump('batch_leads_retagged', len(missing))
+                    retagged = await asyncio.gather(*(tag_one(chunk[i], contents[i]) for i in missing))
+                    for i, tags in zip(missing, retagged):
+                        tagged[i] = tags
+                return tagged
+            
+            chunks = await asyncio.gather(*(
+                tag_chunk(start) for start in range(0, len(leads), self.batch_size)
+            ))
+            return [tags for chunk in chunks for tags in chunk]
+    
+    async def _complete_with_retries(self, session: 'aiohttp.ClientSession', messages: List[Dict],
+                                     max_tokens: int, label: str) -> Optional[str]:
+        """Send one request with timeout and exponential backoff; None if it never succeeds"""
+        import aiohttp
+        for attempt in range(self.max_retries + 1):
+            self._bump('requests')
+            try:
+                return await self.backend.complete(
+                    session, messages, max_tokens=max_tokens, temperature=0.3, timeout=self.timeout
+                )
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError, RetryableBackendError) as e:
+                if attempt == self.max_retries:
+                    logger.warning("LLM tagging failed for %s after %d attempts: %r", label, attempt + 1, e)
+                    break
+                self._bump('retries')
+                # Exponential backoff with jitter: ~0.5s, 1s, 2s, ...
+                await asyncio.sleep(0.5 * (2 ** attempt) * (0.5 + random.random()))
+            except Exception as e:
+                logger.warning("LLM tagging failed for %s: %r", label, e)
+                break
+        
+        self._bump('failures')
+        return None
+    
+    async def _tag_with_retries(self, session: 'aiohttp.ClientSession', lead: BaseLead,
+                                scraped_content: Optional[str]) -> Optional[List[str]]:
+        """One lead's request; None if the LLM gave no usable tags"""
+        messages = self._build_messages(lead, scraped_content)
+        tags_text = await self._complete_with_retries(session, messages, 100, lead.company)
+        
+        if tags_text is not None:
+            try:
+                return self._validate_tags(json.loads(tags_text.strip()))
+            except ValueError as e:
+                logger.warning("LLM tagging returned invalid JSON for %s: %s", lead.company, e)
         
+        return None
+    
+    async def _tag_chunk(self, session: 'aiohttp.ClientSession', leads: List[BaseLead],
+                         scraped_contents: List[Optional[str]]) -> Optional[List[Optional[List[str]]]]:
+        """Tag several leads in one prompt.
+        
+        Returns None if the request itself failed, otherwise one entry per
+        lead: its validated tags, or None if the response omitted or mangled it.
+        """
+        self._bump('batch_requests')
+        messages = self._build_batch_messages(leads, scraped_contents)
+        max_tokens = BATCH_TOKENS_PER_LEAD * len(leads)
+        tags_text = await self._complete_with_retries(session, messages, max_tokens, f"batch of {len(leads)}")
+        if tags_text is None:
+            return None
+        
+        try:
+            tags_by_id = json.loads(tags_text.strip())
+            if not isinstance(tags_by_id, dict):
+                raise ValueError(f"expected a JSON object, got {type(tags_by_id).__name__}")
+        except ValueError as e:
+            logger.warning("LLM batch tagging response could not be parsed: %s", e)
+            self._bump('batch_parse_failures')
+            return [None] * len(leads)
+        
+        tagged = [self._validate_tags(tags_by_id.get(lead.id)) for lead in leads]
+        if any(tags is None for tags in tagged):
+            self._bump('batch_partial_responses')
+        return tagged
+    
+    def _validate_tags(self, tags) -> Optional[List[str]]:
+        """Accept a non-empty list of tag strings, trimmed to 5"""
+        if not isinstance(tags, list) or not tags:
+            return None
+        if not all(isinstance(tag, str) and tag for tag in tags):
+            return None
+        return tags[:5]
+    
+    def _build_messages(self, lead: BaseLead, scraped_content: str = None) -> List[Dict]:
+        """Build the chat messages for one lead"""
         context = f"""
         Company: {lead.company}
         Industry: {lead.industry}
@@ -34,24 +240,44 @@ class SemanticTaggingService:
         Return only a JSON array like: ["high-growth", "tech-forward", "b2b-focused"]
         """
         
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a B2B sales expert generating precise lead tags."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=100,
-                temperature=0.3
-            )
-            
-            tags_text = response.choices[0].message.content.strip()
-            tags = json.loads(tags_text)
-            return tags if isinstance(tags, list) else []
-            
-        except Exception as e:
-            print(f"OpenAI tagging failed: {e}")
-            return self._fallback_tags(lead)
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _build_batch_messages(self, leads: List[BaseLead],
+                              scraped_contents: List[Optional[str]]) -> List[Dict]:
+        """Build one set of chat messages covering several leads"""
+        companies = []
+        for lead, scraped_content in zip(leads, scraped_contents):
+            company = {
+                'id': lead.id,
+                'company': lead.company,
+                'industry': lead.industry,
+                'website': lead.website,
+                'employees': getattr(lead, 'employees', None),
+                'revenue': getattr(lead, 'revenue', None),
+                'business_type': getattr(lead, 'business_type', None),
+            }
+            if scraped_content:
+                company['website_content'] = scraped_content[:500]
+            companies.append(company)
+        
+        prompt = f"""
+        Analyze each company below and generate 3-5 semantic tags per company for B2B sales targeting.
+        Generate tags for: growth stage, tech maturity, market focus, business characteristics.
+        
+        Companies:
+        {json.dumps(companies)}
+        
+        Return only a JSON object mapping every company id to its tag array, like:
+        {{"<id>": ["high-growth", "tech-forward", "b2b-focused"]}}
+        """
+        
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
     
     def _fallback_tags(self, lead: BaseLead) -> List[str]:
         """Rule-based fallback tagging"""
@@ -76,4 +302,4 @@ class SemanticTaggingService:
         elif business_type == 'B2C':
             tags.append('consumer-facing')
         
-        return tags[:5]
\ No newline at end of file
+        return tags[:5]
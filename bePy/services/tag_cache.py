@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from models import BaseLead
+
+
+class TagCache:
+    """Content-addressed cache of semantic tags.
+
+    Keys are a hash of the normalized prompt context, so the same company
+    data maps to the same entry no matter which search produced the lead.
+    An in-process LRU tier sits in front of an optional SQLite tier that
+    survives restarts. Every entry expires ``ttl_seconds`` after it is set.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 86400, db_path: str = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key -> (expires_at, tags)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                      'evictions': 0, 'expirations': 0, 'sets': 0}
+        self._db = self._open_db(db_path) if db_path else None
+        self._db_pid = os.getpid()
+
+    def _open_db(self, db_path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS tag_cache "
+                   "(key TEXT PRIMARY KEY, tags TEXT NOT NULL, expires_at REAL NOT NULL)")
+        db.execute("DELETE FROM tag_cache WHERE expires_at <= ?", (time.time(),))
+        return db
+
+    @staticmethod
+    def key_for(lead: BaseLead, scraped_content: str = None) -> str:
+        """Hash of exactly the lead fields that go into the tagging prompt"""
+        def normalize(value):
+            if value is None:
+                return None
+            return ' '.join(str(value).split()).lower()
+
+        context = [
+            normalize(lead.company),
+            normalize(lead.industry),
+            normalize(lead.website),
+            normalize(getattr(lead, 'employees', None)),
+            normalize(getattr(lead, 'revenue', None)),
+            normalize(getattr(lead, 'business_type', None)),
+            normalize(scraped_content[:500]) if scraped_content else None,
+        ]
+        encoded = json.dumps(context, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[str]]]:
+        """Look up tags for each key; None where there is no live entry"""
+        now = time.time()
+        results = []
+        disk_lookups = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[key]
+                    self.stats['expirations'] += 1
+                    entry = None
+                if entry is None:
+                    results.append(None)
+                    disk_lookups.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                results.append(entry[1])
+
+            db = self._disk()
+            if db is not None and disk_lookups:
+                for i in disk_lookups:
+                    row = db.execute(
+                        "SELECT tags, expires_at FROM tag_cache WHERE key = ? AND expires_at > ?",
+                        (keys[i], now)
+                    ).fetchone()
+                    if row is not None:
+                        tags = json.loads(row[0])
+                        self._remember(keys[i], row[1], tags)
+                        self.stats['disk_hits'] += 1
+                        results[i] = tags
+
+            hits = sum(1 for tags in results if tags is not None)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(keys) - hits
+        return results
+
+    def set_many(self, items: Dict[str, List[str]]):
+        """Store tags for each key with a fresh TTL"""
+        if not items:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            for key, tags in items.items():
+                self._remember(key, expires_at, tags)
+            self.stats['sets'] += len(items)
+            db = self._disk()
+            if db is not None:
+                db.executemany(
+                    "INSERT OR REPLACE INTO tag_cache (key, tags, expires_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(tags), expires_at) for key, tags in items.items()]
+                )
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """The SQLite tier's connection, reopened in a forked worker (connections must not cross a fork)"""
+        if self._db is not None and self._db_pid != os.getpid():
+            self._db = self._open_db(self.db_path)
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _remember(self, key: str, expires_at: float, tags: List[str]):
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        self._entries[key] = (expires_at, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get_stats(self) -> Dict:
+        """Snapshot of cache counters for /api/health"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['persistent'] = self._db is not None
+        return stats
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from config import Config
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of fetching one URL"""
+    url: str
+    status: Optional[int] = None
+    body: bytes = b''
+    truncated: bool = False
+    elapsed: float = 0.0
+    error: Optional[str] = None  # 'robots', 'deadline', or the fetch exception
+    extracted: Any = None  # extractor.owner_info() when an extractor_factory was given
+    stopped_early: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+
+class WebsiteCrawler:
+    """Polite concurrent fetcher for lead websites.
+
+    Requests share one keep-alive connection pool and are capped globally
+    (``concurrency``) and per host (``per_host_rate`` requests/sec). Bodies
+    are truncated at ``max_bytes``, robots.txt is honoured and cached per
+    host, and a batch stops at ``deadline`` seconds no matter what is still
+    in flight.
+    """
+
+    def __init__(self, concurrency: int = None, per_host_rate: float = None, max_bytes: int = None,
+                 timeout: float = None, deadline: float = None, robots_ttl: float = None,
+                 user_agent: str = None):
+        self.concurrency = concurrency or Config.CRAWL_CONCURRENCY
+        self.per_host_rate = per_host_rate or Config.CRAWL_PER_HOST_RATE
+        self.max_bytes = max_bytes or Config.CRAWL_MAX_BYTES
+        self.timeout = timeout or Config.CRAWL_TIMEOUT
+        self.deadline = deadline or Config.CRAWL_DEADLINE
+        self.robots_ttl = Config.CRAWL_ROBOTS_TTL if robots_ttl is None else robots_ttl
+        self.user_agent = user_agent or Config.CRAWL_USER_AGENT
+        self._robots = {}  # origin -> (expires_at, RobotFileParser); kept across batches
+        self._robots_lock = threading.Lock()
+        self.stats = {'pages': 0, 'bytes': 0, 'errors': 0, 'robots_blocked': 0,
+                      'deadline_skipped': 0, 'truncated': 0}
+        self.last_batch = {}
+
+    def fetch_all(self, urls: List[str], extractor_factory: Callable = None) -> Dict[str, CrawlResult]:
+        """Fetch every URL concurrently; blocks until done or the deadline passes.
+
+        With ``extractor_factory`` (e.g. ContactExtractor), each body is fed to
+        a fresh extractor chunk by chunk as it downloads, and reading stops as
+        soon as the extractor reports it is done.
+        """
+        if not urls:
+            return {}
+        return asyncio.run(self.afetch_all(urls, extractor_factory))
+
+    async def afetch_all(self, urls: List[str], extractor_factory: Callable = None) -> Dict[str, CrawlResult]:
+        """Async version of fetch_all"""
+        import aiohttp  # Deferred to the first crawl, like the other network clients
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        host_locks = {}
+        host_next_slot = {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.perf_counter()
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': self.user_agent}) as session:
+            async def wait_for_host_slot(origin):
+                # Space requests to one host at least 1/per_host_rate seconds apart
+                lock = host_locks.setdefault(origin, asyncio.Lock())
+                async with lock:
+                    now = time.monotonic()
+                    slot = max(now, host_next_slot.get(origin, now))
+                    host_next_slot[origin] = slot + 1.0 / self.per_host_rate
+                if slot > now:
+                    await asyncio.sleep(slot - now)
+
+            async def crawl(url):
+                origin = self._origin(url)
+                robots = await self._robots_for(session, origin, host_locks)
+                if robots is not None and not robots.can_fetch(self.user_agent, url):
+                    return CrawlResult(url=url, error='robots')
+                # Wait for the host outside the global semaphore so one slow host can't starve the rest
+                await wait_for_host_slot(origin)
+                async with semaphore:
+                    return await self._fetch(session, url, extractor_factory)
+
+            tasks = {asyncio.ensure_future(crawl(url)): url for url in unique_urls}
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+
+            results = {}
+            for task, url in tasks.items():
+                if task in pending:
+                    results[url] = CrawlResult(url=url, error='deadline')
+                elif task.exception() is not None:
+                    results[url] = CrawlResult(url=url, error=repr(task.exception()))
+                else:
+                    results[url] = task.result()
+
+        self._record_batch(list(results.values()), time.perf_counter() - started)
+        return results
+
+    async def _fetch(self, session: 'aiohttp.ClientSession', url: str,
+                     extractor_factory: Callable = None) -> CrawlResult:
+        """GET one page, reading at most max_bytes of the body"""
+        result = CrawlResult(url=url)
+        extractor = extractor_factory() if extractor_factory else None
+        began = time.perf_counter()
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                result.status = response.status
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    chunk = chunk[:self.max_bytes - size]
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if extractor is not None:
+                        for _ in extractor.feed(chunk):
+                            pass
+                        if extractor.done:
+                            result.stopped_early = True
+                            break
+                    if size >= self.max_bytes:
+                        result.truncated = True
+                        break
+                result.body = b''.join(chunks)
+            if extractor is not None:
+                for _ in extractor.close():
+                    pass
+                result.extracted = extractor.owner_info()
+        except Exception as e:
+            result.error = repr(e)
+        result.elapsed = time.perf_counter() - began
+        return result
+
+    async def _robots_for(self, session: 'aiohttp.ClientSession', origin: str,
+                          host_locks: Dict) -> Optional[RobotFileParser]:
+        """Cached robots.txt parser for an origin; None means no restrictions"""
+        with self._robots_lock:
+            cached = self._robots.get(origin)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+
+        # One robots.txt fetch per origin, even with many of its pages in flight
+        lock = host_locks.setdefault(('robots', origin), asyncio.Lock())
+        async with lock:
+            with self._robots_lock:
+                cached = self._robots.get(origin)
+            if cached is not None and cached[0] > time.time():
+                return cached[1]
+
+            parser = RobotFileParser()
+            try:
+                async with session.get(f"{origin}/robots.txt") as response:
+                    if response.status in (401, 403):
+                        parser.disallow_all = True
+                    elif response.status >= 400:
+                        parser.allow_all = True
+                    else:
+                        text = (await response.content.read(self.max_bytes)).decode('utf-8', 'replace')
+                        parser.parse(text.splitlines())
+            except Exception:
+                parser.allow_all = True  # Unreachable robots.txt: the page fetch will tell
+            with self._robots_lock:
+                self._robots[origin] = (time.time() + self.robots_ttl, parser)
+            return parser
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _record_batch(self, results: List[CrawlResult], elapsed: float):
+        """Update counters and keep pages/sec and p95 latency for the last batch"""
+        fetched = [r for r in results if r.error is None]
+        latencies = sorted(r.elapsed for r in fetched)
+        self.stats['pages'] += len(fetched)
+        self.stats['bytes'] += sum(len(r.body) for r in fetched)
+        self.stats['truncated'] += sum(1 for r in fetched if r.truncated)
+        self.stats['robots_blocked'] += sum(1 for r in results if r.error == 'robots')
+        self.stats['deadline_skipped'] += sum(1 for r in results if r.error == 'deadline')
+        self.stats['errors'] += sum(1 for r in results if r.error not in (None, 'robots', 'deadline'))
+        self.last_batch = {
+            'urls': len(results),
+            'pages': len(fetched),
+            'seconds': round(elapsed, 3),
+            'pages_per_sec': round(len(fetched) / elapsed, 1) if elapsed > 0 else 0.0,
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else None,
+        }
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from services.mock_data_service import MockDataService
+from services.scoring import MLScoringService
+from utils.compiled_forest import CompiledForest
+
+
+@pytest.fixture(scope='module')
+def scorer(tmp_path_factory):
+    np.random.seed(0)
+    scorer = MLScoringService(model_dir=str(tmp_path_factory.mktemp('model')))
+    scorer.train_model(MockDataService().generate_batch(500))
+    return scorer
+
+
+@pytest.fixture(scope='module')
+def encoded_leads(scorer):
+    return scorer.state.pipeline.encode(scorer.extract_features_batch(MockDataService().generate_batch(2000)))
+
+
+def test_matches_sklearn_on_encoded_leads(scorer, encoded_leads):
+    model = scorer.state.model
+    compiled = CompiledForest.from_sklearn(model)
+    np.testing.assert_allclose(compiled.predict(encoded_leads), model.predict(encoded_leads), rtol=0, atol=1e-9)
+
+
+def test_matches_sklearn_on_random_inputs(scorer):
+    model = scorer.state.model
+    X = np.random.default_rng(1).normal(scale=3.0, size=(5000, model.n_features_in_))
+    np.testing.assert_allclose(CompiledForest.from_sklearn(model).predict(X), model.predict(X), rtol=0, atol=1e-9)
+
+
+def test_unbounded_depth_forest():
+    rng = np.random.default_rng(2)
+    X, y = rng.normal(size=(300, 4)), rng.normal(size=300)
+    model = RandomForestRegressor(n_estimators=7, max_depth=None, random_state=0).fit(X, y)
+    probe = rng.normal(scale=2.0, size=(1000, 4))
+    np.testing.assert_allclose(CompiledForest.from_sklearn(model).predict(probe), model.predict(probe),
+                               rtol=0, atol=1e-9)
+
+
+def test_single_row_and_empty_batches(scorer, encoded_leads):
+    model = scorer.state.model
+    compiled = CompiledForest.from_sklearn(model)
+    for row in encoded_leads[:20]:
+        single = row[None, :]
+        assert compiled.predict(single).shape == (1,)
+        np.testing.assert_allclose(compiled.predict(single), model.predict(single), rtol=0, atol=1e-9)
+    empty = compiled.predict(np.empty((0, model.n_features_in_)))
+    assert empty.shape == (0,)
+
+
+def test_rejects_wrong_feature_count(scorer):
+    compiled = CompiledForest.from_sklearn(scorer.state.model)
+    with pytest.raises(ValueError):
+        compiled.predict(np.zeros((3, compiled.n_features + 1)))
@@ -0,0 +1,33 @@
+import pytest
+from services.enrichment_service import EnrichmentService
+from services.job_queue import EnrichmentJobQueue
+from services.scoring import MLScoringService
+
+
+@pytest.fixture
+def service(tmp_path):
+    return EnrichmentService(scorer=MLScoringService(model_dir=str(tmp_path)), crawl_contacts=False)
+
+
+def test_numeric_strings_are_coerced(service):
+    lead, = service.enrich_leads([{'company': 'Acme', 'employees': '50', 'phone': 5550100}])
+    assert lead.employees == 50 and lead.phone == '5550100'
+    assert isinstance(lead.tags, list)
+
+
+@pytest.mark.parametrize('leads, message', [
+    (['Acme'], 'must be an object'),
+    ([{'company': 'Acme', 'employees': 'fifty'}], 'employees'),
+    ([{'company': 'Acme', 'employees': 12.5}], 'employees'),
+    ([{'company': 'Acme', 'website': ['acme.io']}], 'website'),
+    ([{'company': None}], 'company name'),
+])
+def test_malformed_leads_are_rejected(service, leads, message):
+    with pytest.raises(ValueError, match=message):
+        service.enrich_leads(leads)
+
+
+def test_malformed_leads_are_rejected_on_submit(service, tmp_path):
+    queue = EnrichmentJobQueue(service, db_path=str(tmp_path / 'jobs.sqlite3'))
+    with pytest.raises(ValueError, match='must be an object'):
+        queue.submit(['Acme'])
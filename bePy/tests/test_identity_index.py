@@ -0,0 +1,27 @@
+import pytest
+from services.identity_index import IdentityIndex
+
+LEAD = {'company': 'Acme Data, Inc.', 'website': 'https://www.acmedata.io', 'phone': '(555) 010-0199'}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'identity.sqlite3')
+
+
+def test_indexes_on_one_database_agree(db_path):
+    # Two workers that each built their index, rather than inheriting one from a common master
+    first, second = IdentityIndex(db_path=db_path), IdentityIndex(db_path=db_path)
+    lead_id, = first.resolve_many([LEAD])
+    assert second.resolve_many([LEAD]) == [lead_id]
+    assert second.resolve_many([dict(LEAD, company='Acme Data LLC')]) == [lead_id]
+    assert first.resolve_many([LEAD]) == [lead_id]
+    assert second.get_stats()['new_identities'] == 0
+
+
+def test_stale_filter_is_rebuilt(db_path):
+    first = IdentityIndex(db_path=db_path)
+    lead_id, = first.resolve_many([LEAD])
+    first.bloom.clear()  # As if the filter file were lost, or the database swapped under it
+    assert IdentityIndex(db_path=db_path).resolve_many([LEAD]) == [lead_id]
+    assert first.resolve_many([LEAD]) == [lead_id]
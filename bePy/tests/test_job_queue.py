@@ -0,0 +1,91 @@
+import threading
+import time
+from models import EnrichedLead
+from services.job_queue import EnrichmentJobQueue
+
+
+class CountingEnrichment:
+    """Stands in for EnrichmentService; optionally holds every call until released"""
+
+    def __init__(self, hold: bool = False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def enrich_leads(self, records):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(10)
+        return [EnrichedLead(company=record['company']) for record in records]
+
+
+def new_queue(tmp_path, enrichment, **options):
+    settings = dict(workers=1, chunk_size=10, max_attempts=2, retention_seconds=0, poll_interval=0.01)
+    settings.update(options)
+    return EnrichmentJobQueue(enrichment, db_path=str(tmp_path / 'jobs.sqlite3'), **settings)
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_chunk_whose_worker_keeps_dying_is_failed(tmp_path):
+    queue = new_queue(tmp_path, CountingEnrichment())
+    job = queue.submit([{'company': 'Acme'}])
+    # As left behind by a worker process killed mid-chunk on its last allowed attempt
+    queue._db().execute(
+        "UPDATE enrich_job_chunks SET status = 'running', attempts = 2, owner = ?, lease_expires = ?",
+        (f"{queue.host}:999999999:dead", time.time() + 600)
+    )
+    queue._release_orphans()
+
+    assert queue._claim_chunk() is None
+    job = queue.get_job(job['id'])
+    assert job['status'] == 'failed' and job['chunks_failed'] == 1
+    assert 'attempt 2 of 2' in job['error']
+    assert queue.get_stats()['chunks_failed'] == 1
+
+
+def test_restart_leaves_a_busy_workers_lease_alone(tmp_path):
+    enrichment = CountingEnrichment(hold=True)
+    queue = new_queue(tmp_path, enrichment)
+    queue.ensure_started()
+    job = queue.submit([{'company': 'Acme'}])
+    assert enrichment.started.wait(10)
+
+    queue.stop(timeout=0.05)  # Returns with the chunk still in flight
+    queue.ensure_started()
+    assert queue.get_stats()['orphans_released'] == 0
+
+    enrichment.release.set()
+    wait_for(lambda: queue.get_job(job['id'])['status'] == 'done')
+    queue.stop(timeout=5)
+    assert enrichment.calls == 1
+    assert [lead.company for lead in queue.get_results(job['id'])] == ['Acme']
+
+
+class FailingEnrichment(CountingEnrichment):
+    def enrich_leads(self, records):
+        if any(record['company'] == 'Boom' for record in records):
+            raise RuntimeError("enrichment failed")
+        return super().enrich_leads(records)
+
+
+def test_failed_chunk_does_not_hide_later_results(tmp_path):
+    queue = new_queue(tmp_path, FailingEnrichment(), chunk_size=1, max_attempts=1)
+    job = queue.submit([{'company': 'Acme'}, {'company': 'Boom'}, {'company': 'Cogs'}])
+    queue.ensure_started()
+    wait_for(lambda: queue.get_job(job['id'])['status'] in ('done', 'failed'))
+    queue.stop(timeout=5)
+
+    job = queue.get_job(job['id'])
+    assert job['status'] == 'failed' and job['chunks_failed'] == 1 and job['chunks_done'] == 2
+    assert 'chunk 1' in job['error']
+    assert job['results_available'] == 2
+    assert [lead.company for lead in queue.get_results(job['id'])] == ['Acme', 'Cogs']
+    assert [lead.company for lead in queue.get_results(job['id'], offset=1)] == ['Cogs']
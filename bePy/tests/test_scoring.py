@@ -0,0 +1,47 @@
+import json
+import joblib
+import pytest
+from lead_batch import LeadBatch
+from models import BaseLead
+from services.scoring import POINTER_FILE, MLScoringService
+
+LEADS = [
+    BaseLead(company="Acme Cloud Software", industry="Technology", phone="555-0100", website="acme.io",
+             employees=250, revenue="$10M-50M", business_type="B2B", address="Austin, TX"),
+    BaseLead(company="Corner Bakery"),
+]
+
+
+def write_artifact(model_dir, write):
+    artifact = 'lead_scorer-v00001.joblib'
+    write(str(model_dir / artifact))
+    (model_dir / POINTER_FILE).write_text(json.dumps({'version': 1, 'artifact': artifact}))
+
+
+def corrupt(path):
+    with open(path, 'wb') as f:
+        f.write(b'not a joblib file')
+
+
+def wrong_schema(path):
+    joblib.dump({'schema_version': -1}, path)
+
+
+@pytest.mark.parametrize('write', [corrupt, wrong_schema])
+def test_unusable_artifact_falls_back_to_rule_scores(tmp_path, write):
+    write_artifact(tmp_path, write)
+    scorer = MLScoringService(model_dir=str(tmp_path))
+    assert not scorer.load_model()
+
+    scores = scorer.predict_scores(LEADS)
+    expected = MLScoringService.rule_scores(scorer.feature_frame(LEADS)).clip(1.0, 10.0).tolist()
+    assert scores == expected
+    assert scores[0] > scores[1]
+    assert scorer.predict_scores(LeadBatch.from_leads(LEADS)) == expected
+    assert scorer.predict_score(LEADS[1]) == expected[1]
+    assert not scorer.is_trained
+
+
+def test_missing_artifact_falls_back_to_rule_scores(tmp_path):
+    scorer = MLScoringService(model_dir=str(tmp_path))
+    assert all(1.0 <= score <= 10.0 for score in scorer.predict_scores(LEADS))
@@ -0,0 +1,26 @@
+import msgspec
+from models import BaseLead, EnrichedLead, OwnerInfo
+from utils.serialization import dumps
+
+
+def test_every_field_is_written_even_at_its_default():
+    lead = EnrichedLead(company="Acme", fit_score=7.5, id="lead-1", created_at="2024-01-01T00:00:00.000")
+    assert dumps(lead) == (
+        b'{"company":"Acme","industry":null,"website":null,"phone":null,"address":null,"employees":null,'
+        b'"revenue":null,"business_type":null,"fit_score":7.5,"tags":[],"is_enriched":false,"owner_info":null,'
+        b'"source":"mock","founded_year":null,"company_linkedin":null,"activity_score":null,"enriched_at":null,'
+        b'"id":"lead-1","created_at":"2024-01-01T00:00:00.000"}'
+    )
+    assert dumps(BaseLead(company="Acme", id="lead-1", created_at="t")) == (
+        b'{"company":"Acme","industry":null,"address":null,"bbb_rating":null,"phone":null,"website":null,'
+        b'"employees":null,"revenue":null,"business_type":null,"source":"mock","id":"lead-1","created_at":"t"}'
+    )
+    assert dumps(OwnerInfo(name="Ada")) == (
+        b'{"name":"Ada","email":null,"linkedin_url":null,"title":null,"phone":null}'
+    )
+
+
+def test_leads_round_trip():
+    lead = EnrichedLead(company="Acme", phone="555-0100", is_enriched=True, source="yelp",
+                        owner_info=OwnerInfo(title="CEO"))
+    assert msgspec.json.decode(dumps(lead), type=EnrichedLead) == lead
@@ -0,0 +1,95 @@
+import math
+import mmap
+import os
+import numpy as np
+
+_HEADER = 16  # int64 key count, then int64 tag
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit key hashes, vectorized with NumPy.
+
+    Sized for ``capacity`` keys at ``error_rate`` false positives; memory is
+    about 1.2 bytes per key at 1% and never grows. Bit positions come from
+    double hashing the two 32-bit halves of each key, so callers hash once.
+
+    With ``shared=True`` the bits (and the key count) live in an anonymous
+    shared mapping, so processes forked after construction all see keys any
+    of them adds. With ``path`` they live in a file mapped shared instead, so
+    every process opening the same path sees them, however it was started;
+    the file name gets the filter's geometry appended, so filters sized
+    differently never map each other's bits. Concurrent adds from several
+    processes must be serialized by the caller.
+
+    ``tag`` is a caller-defined int kept with the bits (0 for a new filter),
+    for recording what they were built from.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, shared: bool = False, path: str = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        n_bytes = (self.n_bits + 7) // 8
+        self.path = f"{path}.{self.n_bits}x{self.n_hashes}" if path else None
+        if self.path:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < _HEADER + n_bytes:
+                    os.ftruncate(fd, _HEADER + n_bytes)  # Zero-filled; only ever grows a new file
+                buffer = mmap.mmap(fd, _HEADER + n_bytes)
+            finally:
+                os.close(fd)
+        elif shared:
+            buffer = mmap.mmap(-1, _HEADER + n_bytes)  # MAP_SHARED and zero-filled
+        else:
+            buffer = bytearray(_HEADER + n_bytes)
+        self._buffer = buffer
+        self._header = np.frombuffer(buffer, dtype=np.int64, count=2)
+        self.bits = np.frombuffer(buffer, dtype=np.uint8, offset=_HEADER)
+        self.shared = shared or bool(path)
+
+    @property
+    def count(self) -> int:
+        return int(self._header[0])
+
+    @property
+    def tag(self) -> int:
+        return int(self._header[1])
+
+    @tag.setter
+    def tag(self, value: int):
+        self._header[1] = value
+
+    def clear(self):
+        """Drop every key and the tag"""
+        self.bits[:] = 0
+        self._header[:] = 0
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        keys = np.asarray(keys, dtype=np.int64).view(np.uint64)
+        low = keys & np.uint64(0xFFFFFFFF)
+        high = (keys >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        return (low[:, None] + steps * high[:, None]) % np.uint64(self.n_bits)
+
+    def add_many(self, keys: np.ndarray):
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+        self._header[0] += len(keys)
+
+    def contains_many(self, keys: np.ndarray) -> np.ndarray:
+        """False means definitely absent; True means possibly present"""
+        if not len(keys):
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        hits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.bits.nbytes
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected at the current fill"""
+        return (1 - math.exp(-self.n_hashes * self.count / self.n_bits)) ** self.n_hashes
@@ -0,0 +1,92 @@
+import numpy as np
+
+_CHUNK_CELLS = 1 << 20  # (rows x trees) node slots evaluated at once, to bound temporaries
+
+
+class CompiledForest:
+    """A fitted scikit-learn tree ensemble (regression) flattened into NumPy node arrays.
+
+    Every tree's nodes are concatenated into one set of arrays, and leaves
+    point back to themselves, so scoring is ``depth`` rounds of gathers over
+    a (rows x trees) matrix of node positions with no per-tree Python loop
+    and none of sklearn's per-call validation or thread dispatch. Inputs are
+    rounded to float32 before comparing, as sklearn's trees do, so results
+    match ``predict`` exactly up to summation order.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, first_child: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, depth: int, n_features: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.first_child = first_child  # Left child; the right child is always first_child + 1
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+
+    @classmethod
+    def from_sklearn(cls, forest) -> 'CompiledForest':
+        """Flatten a fitted RandomForestRegressor (or any ensemble of single-output regression trees)"""
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset, depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            # Renumber breadth-first so siblings sit side by side: going right is then first_child + 1
+            left, right = tree.children_left.tolist(), tree.children_right.tolist()
+            order, first_child = [0], []
+            for node in order:
+                if left[node] == -1:
+                    first_child.append(-1)
+                else:
+                    first_child.append(len(order))
+                    order.extend((left[node], right[node]))
+            order = np.array(order)
+            first_child = np.array(first_child)
+            leaf = first_child == -1
+            # A leaf compares feature 0 against +inf, never goes right, and "descends" to itself
+            children.append(np.where(leaf, np.arange(len(order)), first_child) + offset)
+            features.append(np.where(leaf, 0, tree.feature[order]))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold[order]))
+            values.append(tree.value[order, 0, 0])
+            roots.append(offset)
+            offset += len(order)
+            depth = max(depth, tree.max_depth)
+
+        index_dtype = np.int32 if offset < 2 ** 31 else np.int64
+        return cls(
+            feature=np.concatenate(features).astype(index_dtype),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            first_child=np.concatenate(children).astype(index_dtype),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.array(roots, dtype=index_dtype),
+            depth=depth,
+            n_features=forest.n_features_in_,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.first_child, self.value))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Mean of the trees' leaf values for each row of X"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"expected rows of {self.n_features} features, got shape {X.shape}")
+        out = np.empty(len(X), dtype=np.float64)
+        chunk_rows = max(1, _CHUNK_CELLS // self.n_trees)
+        for start in range(0, len(X), chunk_rows):
+            out[start:start + chunk_rows] = self._predict_chunk(X[start:start + chunk_rows])
+        return out
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        flat = X.ravel()
+        row_base = (np.arange(len(X), dtype=self.feature.dtype) * X.shape[1])[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.depth):
+            go_right = flat[row_base + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.first_child[nodes] + go_right
+        return self.value[nodes].mean(axis=1)
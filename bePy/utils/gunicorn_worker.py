@@ -0,0 +1,43 @@
+import sys
+import time
+from gunicorn.workers.gthread import ThreadWorker
+
+
+class RecyclingThreadWorker(ThreadWorker):
+    """gthread worker that drains, rather than drops, connections when it is recycled.
+
+    Stock gthread leaves its loop as soon as max_requests is reached and
+    closes connections it has accepted but not read yet. This worker stops
+    accepting instead, answers everything it already holds (closing each
+    connection after its response, or once idle past keepalive) and exits
+    once none are left.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Take over the limit so the base class never stops with connections open
+        self.recycle_after, self.max_requests = self.max_requests, sys.maxsize
+        self.draining_since = None
+
+    def handle_request(self, req, conn):
+        if self.draining_since is None and self.nr + 1 >= self.recycle_after:
+            self.log.info("Recycling worker after %s requests; draining its connections", self.nr + 1)
+            self.draining_since = time.monotonic()
+        if self.draining_since is not None:
+            # Answer with 'Connection: close'. Connections already promised keep-alive keep their
+            # full idle timeout, so a client reusing one isn't cut off mid-request.
+            req.should_close = lambda: True
+        return super().handle_request(req, conn)
+
+    def murder_keepalived(self):
+        # Runs on the event loop thread once per iteration
+        super().murder_keepalived()
+        if self.draining_since is None:
+            return
+        with self._lock:
+            for sock in self.sockets:
+                self.poller.unregister(sock)
+                sock.close()  # Other workers keep accepting from the shared listener
+            self.sockets = []
+        if self.nr_conns <= 0 or time.monotonic() - self.draining_since > self.cfg.graceful_timeout:
+            self.alive = False
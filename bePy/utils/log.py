@@ -0,0 +1,59 @@
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+import sys
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+
+class _ForkSafeQueueHandler(QueueHandler):
+    """Hands records to a listener thread, so request threads never block on writing to stderr.
+
+    A fork copies the handler but not the listener thread, so the first
+    record logged in a new process starts that process's own listener.
+    """
+
+    def __init__(self, stream_handler: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.stream_handler = stream_handler
+        self.listener = None
+        self._listener_pid = None
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().enqueue(record)
+
+    def _start_listener(self):
+        with self.lock:  # Concurrent first records in a fresh process start one listener
+            if self._listener_pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()  # The parent's queue may hold records it will write itself
+            self.listener = QueueListener(self.queue, self.stream_handler, respect_handler_level=True)
+            self.listener.start()
+            self._listener_pid = os.getpid()
+
+    def drain(self):
+        """Write out queued records (at exit)"""
+        if self.listener is not None and self._listener_pid == os.getpid():
+            self.listener.stop()
+            self._listener_pid = None
+
+
+_handler = None
+
+
+def configure_logging(level: str = 'INFO'):
+    """Route the root logger through an asynchronous stderr handler; safe to call more than once"""
+    global _handler
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    if _handler is not None:
+        return
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _handler = _ForkSafeQueueHandler(stream_handler)
+    root.addHandler(_handler)
+    atexit.register(_handler.drain)
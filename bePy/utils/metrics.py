@@ -0,0 +1,266 @@
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from config import Config
+
+# Seconds; spans range from sub-millisecond feature extraction to multi-second crawls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_ARCHIVE = 'archived.json'  # Totals of worker processes that have exited
+
+logger = logging.getLogger(__name__)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        with self._lock:
+            return {json.dumps(labels): list(values) for labels, values in self._series.items()}
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, *labelvalues: str):
+        with self._lock:
+            values = self._series.get(labelvalues)
+            if values is None:
+                values = self._series[labelvalues] = [0.0]
+            values[0] += amount
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; each series holds per-bucket counts (the last is +Inf), then the sum"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues: str):
+        index = bisect_left(self.buckets, value)  # Buckets are upper bounds, inclusive
+        with self._lock:
+            values = self._series.get(labelvalues)
+            if values is None:
+                values = self._series[labelvalues] = [0.0] * (len(self.buckets) + 2)
+            values[index] += 1
+            values[-1] += value
+
+
+class MetricsRegistry:
+    """Process-local metrics, merged across server workers when rendered.
+
+    Each process keeps its series in memory and, given a ``directory``,
+    periodically writes a snapshot there. Rendering sums the live series of
+    the scraped process with every other process's latest snapshot, so
+    /api/metrics reports the whole server whichever worker answers. Workers
+    fold their totals into an archive file when they exit, keeping counts
+    monotonic across worker recycling without the directory growing.
+    """
+
+    def __init__(self, directory: str = None, flush_interval: float = 5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics: List[_Metric] = []
+        self._started_pid = None
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, List[float]]]:
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def reset_directory(self):
+        """Drop snapshots left by a previous server run; call once, before workers start"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+
+    def ensure_started(self):
+        """Start writing this process's snapshots (again after a fork)"""
+        with self._lock:
+            if not self.directory or self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+        os.makedirs(self.directory, exist_ok=True)
+        threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+    def flush(self):
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def retire(self):
+        """Fold this process's totals into the archive and drop its snapshot (at worker exit)"""
+        if not self.directory or self._started_pid != os.getpid():
+            return
+        own_path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(os.path.join(self.directory, 'archive.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_path = os.path.join(self.directory, _ARCHIVE)
+            merged = _merge([_read(archive_path) or {}, self.snapshot()])
+            with open(f"{archive_path}.tmp", 'w') as f:
+                json.dump(merged, f)
+            os.replace(f"{archive_path}.tmp", archive_path)
+            if os.path.exists(own_path):
+                os.remove(own_path)
+
+    def collect(self) -> Dict[str, Dict[str, List[float]]]:
+        """Live series of this process plus the latest snapshots of all others"""
+        snapshots = [self.snapshot()]
+        if self.directory and os.path.isdir(self.directory):
+            own = f"{os.getpid()}.json"
+            for name in os.listdir(self.directory):
+                if name.endswith('.json') and name != own:
+                    snapshot = _read(os.path.join(self.directory, name))
+                    if snapshot:
+                        snapshots.append(snapshot)
+        return _merge(snapshots)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        collected = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels_json, values in sorted(collected.get(metric.name, {}).items()):
+                labels = list(zip(metric.labelnames, json.loads(labels_json)))
+                if metric.kind == 'counter':
+                    lines.append(f"{metric.name}{_labels(labels)} {_number(values[0])}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(metric.buckets + (float('inf'),), values[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{metric.name}_bucket{_labels(labels + [('le', le)])} {_number(cumulative)}")
+                lines.append(f"{metric.name}_sum{_labels(labels)} {repr(values[-1])}")
+                lines.append(f"{metric.name}_count{_labels(labels)} {_number(cumulative)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _read(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _merge(snapshots: List[Dict]) -> Dict[str, Dict[str, List[float]]]:
+    merged = {}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, values in series.items():
+                current = target.get(labels)
+                target[labels] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+    return merged
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+# --- The app's metrics and request-scoped spans ---
+
+REGISTRY = MetricsRegistry(directory=Config.METRICS_DIR or None, flush_interval=Config.METRICS_FLUSH_INTERVAL)
+SPAN_SECONDS = REGISTRY.histogram(
+    'saasquatch_span_seconds', 'Time spent in instrumented sections of request handling and jobs', ['span'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'saasquatch_http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route', 'status'])
+ITEMS_TOTAL = REGISTRY.counter(
+    'saasquatch_span_items_total', 'Leads processed by instrumented sections', ['span'])
+
+_request = threading.local()
+
+
+def begin_request():
+    """Start collecting span timings for the request handled on this thread"""
+    _request.timings = {}
+
+
+def end_request() -> Dict[str, float]:
+    """Span timings (seconds) recorded on this thread since begin_request"""
+    timings = getattr(_request, 'timings', None) or {}
+    _request.timings = None
+    return timings
+
+
+class span:
+    """Time a section into saasquatch_span_seconds (and the current request's Server-Timing).
+
+    A plain class rather than a generator context manager: it wraps hot paths
+    and this keeps its own cost to a fraction.
+    """
+    __slots__ = ('name', 'items', 'started')
+
+    def __init__(self, name: str, items: int = None):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        SPAN_SECONDS.observe(elapsed, self.name)
+        if self.items is not None:
+            ITEMS_TOTAL.inc(self.items, self.name)
+        timings = getattr(_request, 'timings', None)
+        if timings is not None:
+            timings[self.name] = timings.get(self.name, 0.0) + elapsed
+
+
+def traced(name: str):
+    """Decorator form of span for whole functions"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,46 @@
+import cProfile
+import io
+import pstats
+import threading
+
+try:
+    from pyinstrument import Profiler as _SamplingProfiler
+except ImportError:  # Optional; cProfile is always available
+    _SamplingProfiler = None
+
+_active = threading.Lock()  # One profiled request at a time, so reports aren't skewed by each other
+
+
+class RequestProfiler:
+    """Profiles one request on the calling thread: pyinstrument's sampler if installed, else cProfile"""
+
+    def __init__(self):
+        self.engine = 'pyinstrument' if _SamplingProfiler is not None else 'cProfile'
+        self._profiler = None
+
+    @classmethod
+    def start(cls) -> 'RequestProfiler':
+        """A running profiler, or None if another request is being profiled"""
+        if not _active.acquire(blocking=False):
+            return None
+        profiler = cls()
+        if _SamplingProfiler is not None:
+            profiler._profiler = _SamplingProfiler(interval=0.0005)
+            profiler._profiler.start()
+        else:
+            profiler._profiler = cProfile.Profile()
+            profiler._profiler.enable()
+        return profiler
+
+    def stop(self, limit: int = 40) -> str:
+        """Stop profiling and render a plain-text report"""
+        try:
+            if _SamplingProfiler is not None:
+                self._profiler.stop()
+                return self._profiler.output_text(unicode=False, color=False)
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+            return out.getvalue()
+        finally:
+            _active.release()
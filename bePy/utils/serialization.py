@@ -0,0 +1,25 @@
+import msgspec
+from flask import Response
+from utils.metrics import span
+
+
+def _enc_hook(obj):
+    """Types msgspec doesn't encode natively"""
+    if hasattr(obj, 'tolist'):  # NumPy scalars and arrays
+        return obj.tolist()
+    raise NotImplementedError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+
+
+def dumps(payload) -> bytes:
+    """Encode a payload to JSON bytes; lead Structs are encoded directly, without per-lead dicts"""
+    return _encoder.encode(payload)
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Flask response for a payload that may contain lead Structs"""
+    with span('serialization'):
+        body = dumps(payload)
+    return Response(body, status=status, mimetype='application/json')
@@ -58,25 +58,43 @@ export interface EnrichResponse {
   count: number;
 }
 
+// Last response per search body, revalidated with If-None-Match so an unchanged result comes back as a 304
+const searchCache = new Map<string, { etag: string; data: SearchResponse }>();
+
 export async function searchLeads(filters: SearchFilters): Promise<SearchResponse> {
+  const body = JSON.stringify({
+    query: filters.query,
+    limit: filters.limit || 20,
+    location: filters.location || '',
+    use_mock: filters.use_mock !== false, 
+  });
+  const cached = searchCache.get(body);
   const response = await fetch(`${API_BASE_URL}/leads/search`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
+      ...(cached ? { 'If-None-Match': cached.etag } : {}),
     },
-    body: JSON.stringify({
-      query: filters.query,
-      limit: filters.limit || 20,
-      location: filters.location || '',
-      use_mock: filters.use_mock !== false, 
-    }),
+    body,
   });
 
+  if (response.status === 304 && cached) {
+    return cached.data;
+  }
   if (!response.ok) {
     throw new Error(`Search failed: ${response.statusText}`);
   }
 
-  return response.json();
+  const data: SearchResponse = await response.json();
+  const etag = response.headers.get('ETag');
+  if (etag) {
+    searchCache.delete(body);
+    searchCache.set(body, { etag, data });
+    if (searchCache.size > 50) {
+      searchCache.delete(searchCache.keys().next().value as string);
+    }
+  }
+  return data;
 }
 
 export async function enrichLeads(leads: BaseLead[], filters?: Partial<SearchFilters>): Promise<EnrichResponse> {